@@ -29,10 +29,18 @@ logging.getLogger().setLevel(logging.ERROR)
 logging.getLogger('tensorflow').setLevel(logging.ERROR)
 logging.getLogger('absl').setLevel(logging.ERROR)
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
+import asyncio
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException, Body
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from session_manager import session_manager
+from stream_manager import stream_manager
+from utils.outbound_channel import OutboundChannel
+from utils.tier2_cache import tier2_cache
+from utils.model_registry import model_registry
+from utils.inference_runtime import inference_runtime
+from utils.event_clip_recorder import CLIP_DIR, RECORDINGS_DIR, RECORDINGS_URL, clip_url
+from threading import Thread
 import warnings
 from datetime import datetime
 from typing import Dict, Any
@@ -53,7 +61,7 @@ def print_startup_banner():
     print("="*80)
     print("🔧 Initializing FastAPI server...")
     print("🤫 Verbose model logging suppressed for clean output")
-    print("🧠 Loading AI models...")
+    print("🧠 AI models load on demand (set MODEL_WARMUP to preload)...")
     print("█                                                                              █")
     print("█                           🧠 Two-Tier AI Architecture                        █")
     print("█                                                                              █")
@@ -65,14 +73,14 @@ def print_startup_banner():
     print("█▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄█")
     print("="*80 + "\n")
     
-    print("🚀 Initializing AI Models...")
+    print("🚀 Registering AI Models (loaded on first use)...")
     print("┌──────────────────────────────────────────────────────────────────────────────┐")
-    print("│                           🧠 Loading AI Components                           │")
+    print("│                           🧠 Registered AI Components                        │")
     print("├──────────────────────────────────────────────────────────────────────────────┤")
-    print("│ 🎯 MediaPipe Pose Detection    │ ✅ Loading pose_landmarker_heavy.task       │")
-    print("│ 🎨 OpenAI CLIP Vision Models   │ ✅ Loading clip-vit-base & large models     │")
-    print("│ 📷 BLIP Image Captioning       │ ✅ Loading Salesforce/blip-image-captioning │")
-    print("│ 🎤 OpenAI Whisper STT          │ ✅ Loading whisper tiny & large models      │")
+    print("│ 🎯 MediaPipe Pose Detection    │ ⏳ pose lite/full/heavy .task (on demand)   │")
+    print("│ 🎨 OpenAI CLIP Vision Models   │ ⏳ clip-vit-base & large (on demand)        │")
+    print("│ 📷 BLIP Image Captioning       │ ⏳ blip-image-captioning (on demand)        │")
+    print("│ 🎤 OpenAI Whisper STT          │ ⏳ whisper tiny & large (on demand)         │")
     print("│ 🧠 Groq LLM Reasoning          │ ✅ Connecting to llama-3.3-70b-versatile    │")
     print("└──────────────────────────────────────────────────────────────────────────────┘")
     print()
@@ -105,16 +113,25 @@ print("📁 Setting up directories and static file mounts...")
 
 # Create necessary directories
 os.makedirs("anomaly_frames", exist_ok=True)
-os.makedirs("recorded_videos", exist_ok=True)
+os.makedirs(RECORDINGS_DIR, exist_ok=True)
 os.makedirs("upload_results", exist_ok=True)
 os.makedirs("uploaded_videos", exist_ok=True)
 
 # Mount static files for anomaly frames and videos
 app.mount("/anomaly_frames", StaticFiles(directory="anomaly_frames"), name="anomaly_frames")
-app.mount("/recorded_videos", StaticFiles(directory="recorded_videos"), name="recorded_videos")
+app.mount(RECORDINGS_URL, StaticFiles(directory=RECORDINGS_DIR), name="recorded_videos")
+if clip_url(os.path.join(CLIP_DIR, "clip.mp4")) is None:
+    print(f"⚠️ CLIP_DIR '{CLIP_DIR}' is outside the {RECORDINGS_DIR} mount - event clips will not be viewable from the dashboards")
 app.mount("/upload_results", StaticFiles(directory="upload_results"), name="upload_results")
 
 print("✅ Directories and static mounts configured")
+
+# Optional background warm-up, e.g. MODEL_WARMUP=pose_landmarker,clip_base
+_warmup_models = [name.strip() for name in os.getenv("MODEL_WARMUP", "").split(",") if name.strip()]
+if _warmup_models:
+    print(f"🔥 Warming up models in background: {', '.join(_warmup_models)}")
+    Thread(target=model_registry.warm_up, args=(_warmup_models,), name="ModelWarmup", daemon=True).start()
+
 print_mode_selection()
 
 # ==================== DASHBOARD ROUTES ====================
@@ -161,6 +178,33 @@ async def force_stop_session():
         "status": session_manager.get_status()
     }
 
+# ==================== MODEL MANAGEMENT API ====================
+
+@app.get("/api/models")
+async def get_model_status() -> Dict[str, Any]:
+    """Load state and memory of every registered model, plus per-model inference latency"""
+    return {"models": model_registry.status(), "inference": inference_runtime.stats()}
+
+@app.post("/api/models/{model_name}/warmup")
+async def warm_up_model(model_name: str):
+    """Load a model ahead of its first use"""
+    if model_name not in model_registry.status():
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+    Thread(target=model_registry.warm_up, args=([model_name],), name=f"Warmup-{model_name}", daemon=True).start()
+    return {"message": f"Warm-up started for {model_name}", "models": model_registry.status()}
+
+@app.post("/api/models/{model_name}/unload")
+async def unload_model(model_name: str):
+    """Unload a model to free memory; it reloads on next use"""
+    if model_name not in model_registry.status():
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+    unloaded = model_registry.unload(model_name)
+    return {
+        "success": unloaded,
+        "message": f"{model_name} unloaded" if unloaded else f"{model_name} was not loaded",
+        "models": model_registry.status()
+    }
+
 # ==================== WEBSOCKET ENDPOINTS ====================
 
 @app.websocket("/ws/live")
@@ -232,6 +276,82 @@ async def websocket_upload_endpoint(websocket: WebSocket):
         if session_manager.current_mode == "upload":
             session_manager.force_stop_all()
 
+# ==================== MULTI-STREAM API ====================
+
+@app.get("/api/streams")
+async def list_streams() -> Dict[str, Any]:
+    """Status of every running stream plus the shared scheduler and Tier 2 stage"""
+    return stream_manager.get_stats()
+
+@app.post("/api/streams")
+async def add_stream(payload: Dict[str, Any] = Body(...)):
+    """
+    Start a named stream. Body: {"name", "source", "audio"?, "target_fps"?, "motion_gate"?, "clips"?, "tier2"?}
+    where source is a camera index, an rtsp:// / http:// URL or a video file path looped as a camera.
+    """
+    name = payload.get("name")
+    source = payload.get("source")
+    if not name or source is None:
+        raise HTTPException(status_code=400, detail="Both 'name' and 'source' are required")
+    options = {key: payload[key] for key in ("audio", "target_fps", "motion_gate", "clips", "tier2") if key in payload}
+    try:
+        # Opening a camera or network source can block, keep it off the event loop
+        await asyncio.to_thread(stream_manager.add_stream, name, source, **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"success": True, "stream": stream_manager.get(name).get_stats()}
+
+@app.delete("/api/streams/{name}")
+async def remove_stream(name: str):
+    """Stop a stream and release its capture, tracker and audio"""
+    removed = await asyncio.to_thread(stream_manager.remove_stream, name)
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"Unknown stream: {name}")
+    return {"success": True, "message": f"Stream '{name}' stopped"}
+
+@app.get("/api/streams/{name}/anomalies")
+async def get_stream_anomalies(name: str):
+    """Recent anomaly events of one stream"""
+    stream = stream_manager.get(name)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Unknown stream: {name}")
+    events = list(stream.anomaly_events)
+    return {"stream": name, "anomaly_events": events, "total_count": len(events)}
+
+@app.websocket("/ws/streams/{name}")
+async def websocket_stream_endpoint(websocket: WebSocket, name: str):
+    """Subscribe to one stream's Tier 1 updates and anomaly events; any number of clients per stream"""
+    await websocket.accept()
+    stream = stream_manager.get(name)
+    if stream is None:
+        await websocket.close(code=1000, reason=f"Unknown stream: {name}")
+        return
+    
+    channel = OutboundChannel(websocket, asyncio.get_running_loop()).start()
+    stream.subscribe(channel)
+    try:
+        while stream.running and not channel.closed:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        print(f"WebSocket unsubscribed from stream '{name}'")
+    except Exception as e:
+        print(f"WebSocket error: {e}")
+    finally:
+        stream.unsubscribe(channel)
+        channel.close()
+
+@app.delete("/api/tier2/cache")
+async def clear_tier2_cache(persisted: bool = False):
+    """Drop cached Tier 2 results (and the SQLite copy with ?persisted=true)"""
+    tier2_cache.clear(persisted=persisted)
+    return {"success": True, "tier2_cache": tier2_cache.get_stats()}
+
+@app.on_event("shutdown")
+def stop_streams():
+    stream_manager.stop_all()
+
 # ==================== FILE UPLOAD API ====================
 
 @app.post("/api/upload")
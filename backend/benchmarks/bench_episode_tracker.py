@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tier 2 calls per frame vs per episode on a synthetic Tier 1 timeline: incidents of a few seconds
+at the analysis rate, with Tier 1 flickering between suspected and normal inside each incident
+(as it does on real footage), a few isolated false positives and escalations (a pose anomaly
+appearing mid-incident). Reports suspected frames, episodes, Tier 2 calls and key frames sent.
+
+Run from the backend directory:
+    python -m benchmarks.bench_episode_tracker --minutes 30 --incidents 12 --fps 3
+"""
+
+import argparse
+import random
+
+from utils.episode_tracker import EpisodeTracker
+
+
+def tier1_result(suspected, scene_prob, pose_anomaly):
+    return {
+        "status": "Suspected Anomaly" if suspected else "Normal",
+        "signals": {"pose_anomaly": pose_anomaly, "scene_probability": scene_prob}
+    }
+
+
+def timeline(args, rng):
+    """(timestamp, tier1_result) for every analysed frame"""
+    total = int(args.minutes * 60 * args.fps)
+    incidents = sorted(rng.sample(range(total), args.incidents))
+    active = {}
+    for start in incidents:
+        length = int(rng.uniform(args.min_seconds, args.max_seconds) * args.fps)
+        pose_from = start + rng.randint(0, length) if rng.random() < 0.5 else None
+        for index in range(start, min(total, start + length)):
+            active[index] = pose_from is not None and index >= pose_from
+    for index in range(total):
+        if index in active:
+            suspected = rng.random() > args.flicker
+            yield index / args.fps, tier1_result(suspected, rng.uniform(0.4, 0.65), active[index] and suspected)
+        else:
+            false_positive = rng.random() < args.false_positive_rate
+            yield index / args.fps, tier1_result(false_positive, rng.uniform(0.46, 0.5) if false_positive else rng.uniform(0, 0.2), False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--fps", type=float, default=3, help="Analysis rate")
+    parser.add_argument("--incidents", type=int, default=12)
+    parser.add_argument("--min-seconds", type=float, default=5)
+    parser.add_argument("--max-seconds", type=float, default=40)
+    parser.add_argument("--flicker", type=float, default=0.25, help="Share of normal Tier 1 results inside an incident")
+    parser.add_argument("--false-positive-rate", type=float, default=0.002)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tracker = EpisodeTracker("bench")
+    key_frames = 0
+    for frame_count, (timestamp, result) in enumerate(timeline(args, rng)):
+        for event, episode in tracker.update(timestamp, result, frame=frame_count, frame_count=frame_count):
+            if event == "analyze":
+                key_frames += len(episode.frames())
+    for event, episode in tracker.flush():
+        if event == "analyze":
+            key_frames += len(episode.frames())
+
+    stats = tracker.get_stats()
+    suspected = stats["suspected_frames"]
+    print(f"📊 {args.minutes:.0f} min at {args.fps:.0f} FPS analysis, {args.incidents} incidents")
+    print(f"   per-frame Tier 2 : {suspected} calls")
+    print(f"   per-episode      : {stats['tier2_requests']} calls ({stats['episodes']} episodes, "
+          f"{stats['escalations']} escalations), {key_frames} key frames")
+    if stats["tier2_requests"]:
+        print(f"   reduction        : {suspected / stats['tier2_requests']:.1f}x fewer LLM calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Decode throughput benchmark: read-every-frame sampling vs FrameSampler on a synthetic local video.
+
+Run from the backend directory:
+    python -m benchmarks.bench_frame_sampler --frames 900 --strides 3,10,30,150
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from utils.frame_sampler import FrameSampler
+
+
+def write_synthetic_video(path, frames, width, height, fps):
+    """Moving gradient + noise so the encoder produces realistic P-frames"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    rng = np.random.default_rng(0)
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(frames):
+        frame = np.dstack([np.roll(base, i * 4, axis=1), np.roll(base, i * 2, axis=0), base])
+        frame = cv2.add(frame, rng.integers(0, 16, frame.shape, dtype=np.uint8))
+        writer.write(frame)
+    writer.release()
+
+
+def read_every_frame(path, stride):
+    """Legacy pattern: cap.read() everything, keep every stride-th frame"""
+    cap = cv2.VideoCapture(path)
+    kept = 0
+    frame_count = 0
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_count % stride == 0:
+            kept += 1
+        frame_count += 1
+    cap.release()
+    return kept, frame_count
+
+
+def sample_frames(path, stride, seek_threshold):
+    sampler = FrameSampler(path, stride=stride, seek_threshold=seek_threshold)
+    kept = sum(1 for _ in sampler)
+    sampler.release()
+    return kept, sampler.stats()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=900, help="Length of the synthetic video in frames")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--strides", default="3,10,30,150", help="Comma separated sampling strides")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.mp4")
+        print(f"📼 Writing synthetic video: {args.frames} frames at {args.width}x{args.height}")
+        write_synthetic_video(path, args.frames, args.width, args.height, args.fps)
+
+        print("📊 Decode throughput (source frames covered per second)")
+        for stride in (int(s) for s in args.strides.split(",")):
+            (legacy_kept, total), legacy_s = timed(read_every_frame, path, stride)
+            (grab_kept, _), grab_s = timed(sample_frames, path, stride, float("inf"))
+            (seek_kept, seek_stats), seek_s = timed(sample_frames, path, stride, 1)
+            assert legacy_kept == grab_kept == seek_kept, "samplers disagree on sampled frame count"
+
+            print(f"   stride {stride:>4}: read() {total / legacy_s:7.1f} fps | "
+                  f"grab() {total / grab_s:7.1f} fps ({legacy_s / grab_s:.2f}x) | "
+                  f"seek {total / seek_s:7.1f} fps ({legacy_s / seek_s:.2f}x, {seek_stats['seeks']} seeks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Inference runtime benchmark: latency and memory of CLIP/BLIP under autograd vs
+torch.inference_mode, and of the fp32 / bf16 / dynamic-int8 CPU variants.
+
+Run from the backend directory:
+    python -m benchmarks.bench_inference_runtime --frames 20 --threads 4
+"""
+
+import argparse
+import gc
+import os
+import time
+
+import numpy as np
+import torch
+from PIL import Image
+
+from utils.inference_runtime import SUPPORTED_PRECISIONS, inference_runtime, match_input_dtype
+from utils.model_registry import _rss_bytes, _tensor_bytes
+from utils.scene_processing import SCENE_PROMPTS, _load_blip, _load_clip
+
+CLIP_IDS = {
+    "clip_base": "openai/clip-vit-base-patch32",
+    "clip_large": "openai/clip-vit-large-patch14"
+}
+
+
+def mb(num_bytes):
+    return num_bytes / (1024 * 1024) if num_bytes is not None else float("nan")
+
+
+def clip_forward(processor, model, image):
+    inputs = match_input_dtype(processor(text=SCENE_PROMPTS, images=image, return_tensors="pt", padding=True), model)
+    return model(**inputs).logits_per_image.softmax(dim=1)
+
+
+def blip_forward(processor, model, image):
+    inputs = match_input_dtype(processor(images=image, return_tensors="pt"), model)
+    return model.generate(**inputs)
+
+
+def measure(fn, images, use_runtime, model_name):
+    """Average ms per frame and peak RSS growth over the run"""
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    for image in images:
+        if use_runtime:
+            inference_runtime.run(model_name, fn, image)
+        else:
+            fn(image)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(images)
+    rss_after = _rss_bytes()
+    growth = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    return elapsed_ms, growth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20, help="Number of synthetic frames per measurement")
+    parser.add_argument("--models", default="clip_base,blip", help="Comma separated: clip_base, clip_large, blip")
+    parser.add_argument("--precisions", default=",".join(SUPPORTED_PRECISIONS))
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 keeps the configured default)")
+    args = parser.parse_args()
+
+    if args.threads:
+        for name in args.models.split(","):
+            os.environ[f"INFERENCE_THREADS_{name.upper()}"] = str(args.threads)
+
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)) for _ in range(args.frames)]
+
+    print("📊 Inference runtime benchmark")
+    print(f"   Frames: {args.frames} synthetic 640x480 | torch threads: {torch.get_num_threads()}")
+    for model_name in args.models.split(","):
+        for precision in args.precisions.split(","):
+            rss_before_load = _rss_bytes()
+            if model_name == "blip":
+                processor, model = _load_blip(precision)
+                fn = lambda image: blip_forward(processor, model, image)
+            else:
+                processor, model = _load_clip(CLIP_IDS[model_name], precision)
+                fn = lambda image: clip_forward(processor, model, image)
+            rss_after_load = _rss_bytes()
+            load_growth = rss_after_load - rss_before_load if rss_before_load is not None and rss_after_load is not None else None
+
+            # Warm-up so lazy kernel selection does not skew the first measurement
+            inference_runtime.run(model_name, fn, images[0])
+
+            autograd_ms, autograd_growth = measure(fn, images, False, model_name)
+            runtime_ms, runtime_growth = measure(fn, images, True, model_name)
+
+            print(f"   {model_name:<10} {precision:<4} | weights {mb(_tensor_bytes(model)):7.1f} MB "
+                  f"(RSS +{mb(load_growth):.0f} MB) | autograd {autograd_ms:7.1f} ms/frame "
+                  f"(RSS +{mb(autograd_growth):.0f} MB) | inference_mode {runtime_ms:7.1f} ms/frame "
+                  f"(RSS +{mb(runtime_growth):.0f} MB)")
+
+            del processor, model, fn
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
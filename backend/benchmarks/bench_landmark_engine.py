@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Landmark engine micro-benchmark. Synthetic MediaPipe-like poses are scored by the original
+per-landmark implementation (kept here as the timing reference) and by the vectorized engine.
+Decision equivalence is covered by tests/test_landmark_engine.py.
+
+Run from the backend directory:
+    python -m benchmarks.bench_landmark_engine --poses 5000
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.landmark_engine import LandmarkEngine, compute_features, is_aggressive, is_fall, landmarks_to_array
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def reference_aggressive(landmarks, previous_landmarks):
+    """Original detect_aggressive_movements logic (debug prints removed)"""
+    def point(lms, i):
+        return (lms[i].x, lms[i].y)
+
+    def dist(a, b):
+        return np.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+    left_wrist_speed = dist(point(landmarks, 15), point(previous_landmarks, 15))
+    right_wrist_speed = dist(point(landmarks, 16), point(previous_landmarks, 16))
+    head_movement = dist(point(landmarks, 0), point(previous_landmarks, 0))
+    torso_change = abs(dist(point(landmarks, 11), point(landmarks, 23)) -
+                       dist(point(previous_landmarks, 11), point(previous_landmarks, 23)))
+
+    if left_wrist_speed > 0.15 or right_wrist_speed > 0.15:
+        return True
+    if head_movement > 0.08:
+        return True
+    if torso_change > 0.05:
+        return True
+
+    ls, rs, lw, rw = (point(landmarks, i) for i in (11, 12, 15, 16))
+    left_arm_extended = lw[0] < ls[0] - 0.2 or lw[0] > ls[0] + 0.2
+    right_arm_extended = rw[0] < rs[0] - 0.2 or rw[0] > rs[0] + 0.2
+    if left_arm_extended or right_arm_extended:
+        if lw[1] < ls[1] - 0.1 or rw[1] < rs[1] - 0.1:
+            return True
+    return False
+
+
+def reference_ratio(landmarks, width, height):
+    """Original list-comprehension bounding-box ratio"""
+    xs = [lm.x * width for lm in landmarks]
+    ys = [lm.y * height for lm in landmarks]
+    return (max(ys) - min(ys)) / (max(xs) - min(xs) + 1e-6)
+
+
+def synthetic_sequence(rng, count):
+    """Random walk of poses with occasional jumps, falls and raised arms, as landmark objects"""
+    pose = rng.uniform(0.3, 0.7, (33, 3)).astype(np.float32)
+    poses = []
+    for _ in range(count):
+        pose = pose + rng.normal(0, 0.03, pose.shape).astype(np.float32)
+        if rng.random() < 0.1:
+            pose[rng.integers(0, 33)] += rng.normal(0, 0.2, 3).astype(np.float32)
+        if rng.random() < 0.05:
+            pose[:, 1] = 0.5 + (pose[:, 1] - 0.5) * 0.2  # flatten: lying down
+        pose = np.clip(pose, 0.0, 1.0)
+        poses.append(pose.copy())
+    # MediaPipe hands out float attributes; round-trip through float32 so both paths see equal values
+    return [[SimpleNamespace(x=float(p[0]), y=float(p[1]), z=float(p[2])) for p in pose] for pose in poses]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--poses", type=int, default=5000, help="Length of the synthetic pose sequence")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sequence = synthetic_sequence(np.random.default_rng(0), args.poses)
+
+    def reference():
+        for i in range(1, len(sequence)):
+            reference_aggressive(sequence[i], sequence[i - 1])
+            reference_ratio(sequence[i], WIDTH, HEIGHT)
+
+    def engine_streaming():
+        engine = LandmarkEngine()
+        for landmarks in sequence:
+            features = engine.push(landmarks_to_array(landmarks), WIDTH, HEIGHT)
+            is_fall(features) or is_aggressive(features)
+
+    stack = np.stack([landmarks_to_array(landmarks) for landmarks in sequence])
+
+    def engine_batch():
+        features = compute_features(stack[1:], stack[:-1], WIDTH, HEIGHT)
+        is_fall(features) | is_aggressive(features)
+
+    ref_s = timed(reference, args.repeat)
+    stream_s = timed(engine_streaming, args.repeat)
+    batch_s = timed(engine_batch, args.repeat)
+    per_pose = 1e6 / args.poses
+    print("📊 Per-pose cost")
+    print(f"   reference (dicts + per-distance sqrt):   {ref_s * per_pose:8.2f} µs")
+    print(f"   engine, streaming (incl. conversion):    {stream_s * per_pose:8.2f} µs ({ref_s / stream_s:.1f}x)")
+    print(f"   engine, batched over the whole sequence: {batch_s * per_pose:8.2f} µs ({ref_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tier 2 LLM layer against the local stub server: bursts of suspected frames from several
+streams, answered by
+  sequential  - one blocking call at a time (the old per-frame Groq call)
+  pooled      - concurrent calls over pooled keep-alive connections
+  coalesced   - pooled, with each stream's requests inside the window merged into one prompt
+Reports wall time, LLM calls made and per-request latency.
+
+Run from the backend directory:
+    python -m benchmarks.bench_llm_client --streams 3 --burst 10 --interval-ms 100 --latency-ms 800
+"""
+
+import argparse
+import time
+from concurrent.futures import wait
+from threading import Thread
+
+from benchmarks.llm_stub_server import start_llm_stub
+from utils.fusion_logic import build_tier2_prompt
+from utils.llm_client import AsyncLLMClient
+
+
+def evidence(stream, index):
+    return {
+        "audio_transcript": "help" if index % 4 == 0 else "",
+        "captions": [f"a person lying on the floor ({stream}, frame {index})"],
+        "visual_anomaly_max": 0.55 + 0.01 * index,
+        "tier1_details": "Pose anomaly: True, Scene probability: 0.52"
+    }
+
+
+def run(client, args, sequential=False, coalesce=False):
+    """Emit args.burst requests per stream, args.interval_ms apart, from one thread per stream"""
+    latencies = []
+    futures = []
+
+    def emit(stream):
+        for index in range(args.burst):
+            start = time.perf_counter()
+            if sequential:
+                client.complete(build_tier2_prompt([evidence(stream, index)]))
+                latencies.append(time.perf_counter() - start)
+            else:
+                key = stream if coalesce else None
+                future = client.submit_coalesced(key, evidence(stream, index), build_tier2_prompt)
+                future.add_done_callback(lambda f, start=start: latencies.append(time.perf_counter() - start))
+                futures.append(future)
+            time.sleep(args.interval_ms / 1000)
+
+    start = time.perf_counter()
+    threads = [Thread(target=emit, args=(f"cam{i}",)) for i in range(args.streams)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wait(futures)
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=10, help="Suspected frames per stream")
+    parser.add_argument("--interval-ms", type=float, default=100, help="Gap between a stream's suspected frames")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Stub LLM latency")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Stub 503 rate (exercises retries)")
+    parser.add_argument("--coalesce-ms", type=float, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url, stub_stats = start_llm_stub(port=0, latency_ms=args.latency_ms, fail_rate=args.fail_rate)
+    total = args.streams * args.burst
+    print(f"📊 {total} Tier 2 requests ({args.streams} streams x {args.burst}, every {args.interval_ms:.0f} ms), "
+          f"stub latency {args.latency_ms:.0f} ms")
+    print(f"{'mode':>12} {'wall s':>8} {'LLM calls':>10} {'p50 s':>7} {'p95 s':>7} {'retries':>8}")
+
+    modes = [
+        ("sequential", dict(max_concurrency=1, coalesce_ms=0), dict(sequential=True)),
+        ("pooled", dict(max_concurrency=args.concurrency, coalesce_ms=0), dict()),
+        ("coalesced", dict(max_concurrency=args.concurrency, coalesce_ms=args.coalesce_ms), dict(coalesce=True)),
+    ]
+    try:
+        for name, client_options, run_options in modes:
+            client = AsyncLLMClient(base_url=base_url, api_key="stub", max_pending=total, **client_options)
+            before = stub_stats.snapshot()["requests"]
+            wall, latencies = run(client, args, **run_options)
+            calls = stub_stats.snapshot()["requests"] - before
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"{name:>12} {wall:>8.2f} {calls:>10} {p50:>7.2f} {p95:>7.2f} {client.get_stats()['retries']:>8}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Local Tier 2 engine and LLM circuit breaker:
+  engine    - per-call latency of the rule-based engine on synthetic evidence (p50 / p99)
+  outage    - time to a Tier 2 verdict while the LLM stub answers every call with 503,
+              with the circuit breaker disabled (every request waits out its retries) and
+              enabled (requests after the first failures go straight to the local engine)
+
+Run from the backend directory:
+    python -m benchmarks.bench_local_tier2 --calls 10000 --requests 12 --latency-ms 200
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.llm_stub_server import start_llm_stub
+from utils import fusion_logic
+from utils.llm_client import AsyncLLMClient, CircuitBreaker
+from utils.local_tier2 import local_tier2_engine
+from utils.tier1_signals import Tier1Signals
+
+CAPTIONS = [
+    "a person lying on the floor next to a chair",
+    "two men fighting in a parking lot",
+    "a woman sitting on a couch reading a book",
+    "a man walking down a hallway",
+    "a person collapsed near the stairs",
+]
+TRANSCRIPTS = ["", "", "help me please", "call 911 it hurts", "what time is dinner"]
+
+
+def synthetic_evidence(rng, index):
+    signals = Tier1Signals(rng.random() > 0.6, rng.random() * 0.7)
+    return {
+        "audio_transcript": rng.choice(TRANSCRIPTS),
+        "captions": [rng.choice(CAPTIONS), f"frame {index}"],
+        "visual_anomaly_max": rng.random() * 0.6,
+        "tier1_details": f"Pose anomaly: {signals.pose_anomaly}, Scene probability: {signals.scene_prob:.2f}",
+        "tier1_signals": signals
+    }
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def bench_engine(calls):
+    rng = random.Random(0)
+    evidence = [synthetic_evidence(rng, i) for i in range(calls)]
+    timings = []
+    for item in evidence:
+        start = time.perf_counter()
+        local_tier2_engine.analyze(**item)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"⚙️ local engine: {calls} calls, p50 {percentile(timings, 0.5):.3f} ms, "
+          f"p99 {percentile(timings, 0.99):.3f} ms, max {timings[-1]:.3f} ms")
+
+
+def bench_outage(args, base_url, breaker_failures):
+    """Sequential suspected frames during an LLM outage; returns per-verdict seconds"""
+    client = AsyncLLMClient(base_url=base_url, api_key="stub", max_retries=args.retries, backoff=0.1, coalesce_ms=0)
+    # A threshold above the request count never opens, which is the same as no breaker
+    client.breaker = CircuitBreaker(failure_threshold=breaker_failures, reset_seconds=60)
+    fusion_logic.llm_client = client
+    fusion_logic.tier2_cache.enabled = False
+    rng = random.Random(1)
+    timings = []
+    for index in range(args.requests):
+        item = synthetic_evidence(rng, index)
+        start = time.perf_counter()
+        fusion_logic.tier2_fusion(item["audio_transcript"], item["captions"], item["visual_anomaly_max"], item["tier1_details"],
+                                  tier1_signals=item["tier1_signals"])
+        timings.append(time.perf_counter() - start)
+    return timings, client.breaker.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10000, help="Local engine calls")
+    parser.add_argument("--requests", type=int, default=12, help="Tier 2 requests during the outage")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Stub latency before each 503")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--breaker-failures", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_engine(args.calls)
+
+    server, base_url, _ = start_llm_stub(port=0, latency_ms=args.latency_ms, fail_rate=1.0)
+    try:
+        results = {}
+        for name, threshold in (("no breaker", args.requests + 1), ("breaker", args.breaker_failures)):
+            results[name] = bench_outage(args, base_url, threshold)
+    finally:
+        server.shutdown()
+
+    print(f"\n📊 {args.requests} Tier 2 requests while the LLM returns 503 ({args.retries} retries, "
+          f"{args.latency_ms:.0f} ms per attempt)")
+    print(f"{'mode':>12} {'total s':>8} {'p50 s':>7} {'max s':>7} {'short-circuited':>16}")
+    for name, (timings, breaker) in results.items():
+        ordered = sorted(timings)
+        print(f"{name:>12} {sum(timings):>8.2f} {percentile(ordered, 0.5):>7.3f} {ordered[-1]:>7.3f} "
+              f"{breaker['short_circuited']:>16}")
+
+
+if __name__ == "__main__":
+    main()
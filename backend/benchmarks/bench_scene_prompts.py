@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Scene scoring benchmark: per-frame CLIP latency with and without cached prompt embeddings.
+
+Run from the backend directory:
+    python -m benchmarks.bench_scene_prompts --frames 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+from PIL import Image
+
+from utils.scene_processing import SCENE_PROMPTS, clip_scene_probs, prompt_registry
+
+
+def legacy_scene_probs(model_name, image):
+    """Original path: text and image towers both run on every frame"""
+    processor, model = prompt_registry.get_model(model_name)
+    inputs = processor(text=SCENE_PROMPTS, images=image, return_tensors="pt", padding=True)
+    with torch.no_grad():
+        outputs = model(**inputs)
+    return outputs.logits_per_image.softmax(dim=1)
+
+
+def time_per_frame(fn, images):
+    start = time.perf_counter()
+    for image in images:
+        fn(image)
+    return (time.perf_counter() - start) / len(images) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=30, help="Number of synthetic frames to score")
+    parser.add_argument("--models", default="clip_base,clip_large", help="Comma separated model names")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)) for _ in range(args.frames)]
+
+    print("📊 Scene prompt embedding benchmark")
+    print(f"   Frames: {args.frames} synthetic 640x480")
+    for model_name in args.models.split(","):
+        # Warm both paths so one-off allocation does not skew the numbers
+        legacy_scene_probs(model_name, images[0])
+        clip_scene_probs(model_name, images[0])
+
+        legacy_ms = time_per_frame(lambda image: legacy_scene_probs(model_name, image), images)
+        cached_ms = time_per_frame(lambda image: clip_scene_probs(model_name, image), images)
+        max_diff = (legacy_scene_probs(model_name, images[0]) - clip_scene_probs(model_name, images[0])).abs().max().item()
+
+        print(f"   {model_name}: before {legacy_ms:.1f} ms/frame | after {cached_ms:.1f} ms/frame | "
+              f"speedup {legacy_ms / cached_ms:.2f}x | max prob diff {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
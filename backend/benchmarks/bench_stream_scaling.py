@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Multi-stream scaling: aggregate Tier 1 analysis FPS as the number of concurrent streams grows.
+Each stream plays the same video as a looped fake camera (or, with --network, pulls it from the
+local MJPEG stand-in server); all streams share the loaded models and the fair Tier 1 scheduler.
+Tier 2, audio, event clips and the motion gate are off so only Tier 1 capacity is measured.
+
+Run from the backend directory:
+    python -m benchmarks.bench_stream_scaling path/to/video.mp4 --streams 1,2,4,8 --seconds 20
+"""
+
+import argparse
+import time
+
+from benchmarks.stream_stub_server import start_stub_server
+from stream_manager import StreamManager, STREAM_TIER1_SLOTS
+from utils.model_registry import model_registry
+
+
+def measure(video_source, count, args):
+    manager = StreamManager(max_streams=count, tier1_slots=args.slots)
+    try:
+        for i in range(count):
+            manager.add_stream(
+                f"bench{i}", video_source, tier2=False, audio="none", clips=False,
+                motion_gate=False, target_fps=args.target_fps
+            )
+        time.sleep(args.warmup)
+        before = {name: s["tier1_runs"] for name, s in manager.get_stats()["streams"].items()}
+        start = time.perf_counter()
+        time.sleep(args.seconds)
+        elapsed = time.perf_counter() - start
+        stats = manager.get_stats()
+    finally:
+        manager.stop_all()
+
+    per_stream = [(s["tier1_runs"] - before[name]) / elapsed for name, s in stats["streams"].items()]
+    waits = [s["avg_wait_ms"] for s in stats["scheduler"]["streams"].values()]
+    tier1_ms = [s["avg_tier1_ms"] for s in stats["streams"].values()]
+    return {
+        "aggregate": sum(per_stream),
+        "min": min(per_stream),
+        "max": max(per_stream),
+        "tier1_ms": sum(tier1_ms) / len(tier1_ms),
+        "wait_ms": sum(waits) / len(waits) if waits else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="Video file used as every stream's source")
+    parser.add_argument("--streams", default="1,2,4,8", help="Comma separated stream counts")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Measurement window per stream count")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds to run before measuring")
+    parser.add_argument("--target-fps", type=float, default=10.0, help="Per-stream analysis target rate")
+    parser.add_argument("--slots", type=int, default=STREAM_TIER1_SLOTS, help="Concurrent Tier 1 runs")
+    parser.add_argument("--network", action="store_true", help="Pull streams from the local MJPEG stand-in")
+    args = parser.parse_args()
+
+    model_registry.warm_up(["clip_base"])
+    source = args.video
+    server = None
+    if args.network:
+        server, source = start_stub_server(args.video, port=0)
+        print(f"📡 Stand-in server at {source}")
+
+    print(f"📊 Tier 1 analysis FPS ({args.slots} slot(s), target {args.target_fps} FPS per stream)")
+    print(f"{'streams':>8} {'aggregate':>10} {'per-stream min/max':>20} {'tier1 ms':>9} {'wait ms':>8}")
+    try:
+        for count in [int(n) for n in args.streams.split(",")]:
+            r = measure(source, count, args)
+            print(f"{count:>8} {r['aggregate']:>10.2f} {r['min']:>9.2f} / {r['max']:<8.2f} "
+                  f"{r['tier1_ms']:>9.1f} {r['wait_ms']:>8.1f}")
+    finally:
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Batch Tier 1 wall time: the original three-pass pipeline (moviepy audio extraction, then
+separate process_pose and process_scene_tier1 decodes) vs the single-pass run_tier1.
+
+Run from the backend directory:
+    python -m benchmarks.bench_tier1_batch path/to/video.mp4 --runs 2
+"""
+
+import argparse
+import time
+
+from tier1.tier1_pipeline import run_tier1
+from utils.audio_processing import chunk_and_transcribe_tiny, extract_audio
+from utils.fusion_logic import tier1_fusion
+from utils.model_registry import model_registry
+from utils.pose_processing import process_pose
+from utils.scene_processing import process_scene_tier1
+
+
+def run_tier1_three_pass(video_path):
+    """The pre-refactor run_tier1: three separate decodes of the same file"""
+    audio_path = extract_audio(video_path)
+    transcripts = chunk_and_transcribe_tiny(audio_path)
+    num_anomalies, total_frames, _, _ = process_pose(video_path)
+    pose_summary = f"Pose anomalies (fall/crawl) detected in {num_anomalies} out of {total_frames} frames."
+    audio_summary = "Audio transcripts: " + " | ".join(transcripts) if transcripts else "No audio."
+    max_anomaly_prob = process_scene_tier1(video_path)
+    scene_summary = f"Highest scene anomaly probability: {max_anomaly_prob:.2f}"
+    status, details = tier1_fusion(pose_summary, audio_summary, scene_summary)
+    return {"status": status, "details": details}
+
+
+def best_of(fn, video_path, runs):
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(video_path)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="Video file with an audio track")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per variant (best time is reported)")
+    args = parser.parse_args()
+
+    # Shared models load once up front so neither variant pays for them
+    model_registry.warm_up(["clip_base", "whisper_tiny"])
+
+    legacy_s, legacy = best_of(run_tier1_three_pass, args.video, args.runs)
+    single_s, single = best_of(run_tier1, args.video, args.runs)
+
+    print(f"📊 Batch Tier 1 on {args.video}")
+    print(f"   three-pass:  {legacy_s:7.2f} s -> {legacy['status']}")
+    print(f"   single-pass: {single_s:7.2f} s -> {single['status']} ({legacy_s / single_s:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
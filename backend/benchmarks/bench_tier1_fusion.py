@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tier 1 fusion cost per frame on synthetic component outputs:
+  strings  - format pose/scene summaries, then tier1_fusion parses them back (the old path)
+  numeric  - fuse_tier1 on Tier1Signals, one frame at a time
+  batch    - fuse_tier1_batch over TIER1_BATCH_SIZE frames at once
+plus to_dict() (the display edge) separately. Every variant's statuses must agree.
+
+Run from the backend directory:
+    python -m benchmarks.bench_tier1_fusion --frames 20000 --batch 8
+"""
+
+import argparse
+import random
+import time
+
+from utils.fusion_logic import fuse_tier1, fuse_tier1_batch, tier1_fusion
+from utils.tier1_signals import Tier1Signals
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    signals = [Tier1Signals(rng.random() < 0.1, rng.random() * 0.6, ["help"] if rng.random() < 0.05 else [], True,
+                            "ok" if rng.random() < 0.05 else "none") for _ in range(args.frames)]
+
+    def strings():
+        return [tier1_fusion(f"Pose anomaly detected: {s.pose_anomaly}", s.audio_summary(),
+                             f"Scene anomaly probability: {s.scene_prob:.2f}")[0] for s in signals]
+
+    def numeric():
+        return [fuse_tier1(s).status for s in signals]
+
+    def batch():
+        statuses = []
+        for i in range(0, len(signals), args.batch):
+            statuses.extend(result.status for result in fuse_tier1_batch(signals[i:i + args.batch]))
+        return statuses
+
+    # Quantize like the summary strings do, so all three see identical inputs
+    for s in signals:
+        s.scene_prob = round(s.scene_prob, 2)
+
+    results = {name: timed(fn) for name, fn in (("strings", strings), ("numeric", numeric), ("batch", batch))}
+    edge_us, _ = timed(lambda: [fuse_tier1(s).to_dict() for s in signals])
+    reference = results["strings"][1]
+
+    print(f"📊 Tier 1 fusion over {args.frames} frames (batch size {args.batch})")
+    for name, (elapsed_us, statuses) in results.items():
+        match = "✅" if statuses == reference else "❌ MISMATCH"
+        print(f"   {name:>8}: {elapsed_us / args.frames:6.2f} us/frame {match}")
+    print(f"   numeric + to_dict: {edge_us / args.frames:6.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
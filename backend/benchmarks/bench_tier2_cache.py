@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tier 2 cache on a synthetic incident: consecutive anomaly frames of one fall with jittered
+scores, repeated captions and transcript. Runs Tier 2 fusion against the local LLM stub with
+the cache off and on, then a second pass over the same frames with a SQLite-backed cache
+(as a batch re-run would), and reports LLM calls and wall time for each.
+
+Run from the backend directory:
+    python -m benchmarks.bench_tier2_cache --frames 40 --latency-ms 300
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.llm_stub_server import start_llm_stub
+from utils import fusion_logic
+from utils.llm_client import AsyncLLMClient
+from utils.tier2_cache import Tier2Cache, tier2_fingerprint
+
+
+def incident(frames, seed=0):
+    """Evidence of one incident: a few caption variants, slowly drifting scores"""
+    rng = random.Random(seed)
+    captions = [["a person lying on the floor"], ["a man lying on the floor next to a chair"]]
+    evidence = []
+    for i in range(frames):
+        score = 0.55 + 0.04 * (i // 10) + rng.uniform(-0.01, 0.01)
+        evidence.append((
+            "help me" if i >= frames // 2 else "",
+            captions[(i // 5) % 2],
+            score,
+            f"Pose anomaly: True, Scene probability: {score - 0.05 + rng.uniform(-0.01, 0.01):.2f}"
+        ))
+    return evidence
+
+
+def run(evidence, cache):
+    fusion_logic.tier2_cache = cache
+    start = time.perf_counter()
+    for audio, captions, visual, details in evidence:
+        fusion_logic.tier2_fusion(audio, captions, visual, details)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    server, base_url, stub_stats = start_llm_stub(port=0, latency_ms=args.latency_ms)
+    fusion_logic.llm_client = AsyncLLMClient(base_url=base_url, api_key="stub", coalesce_ms=0)
+    evidence = incident(args.frames)
+    keys = {tier2_fingerprint(*item) for item in evidence}
+    print(f"📊 {args.frames} anomaly frames, {len(keys)} distinct fingerprints")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "tier2_cache.sqlite")
+        runs = [
+            ("no cache", Tier2Cache(enabled=False)),
+            ("memory cache", Tier2Cache(path="")),
+            ("sqlite, first run", Tier2Cache(path=db_path)),
+            ("sqlite, re-run", Tier2Cache(path=db_path)),
+        ]
+        print(f"{'run':>18} {'LLM calls':>10} {'wall s':>8} {'hit rate':>9}")
+        try:
+            for name, cache in runs:
+                before = stub_stats.snapshot()["requests"]
+                wall = run(evidence, cache)
+                calls = stub_stats.snapshot()["requests"] - before
+                print(f"{name:>18} {calls:>10} {wall:>8.2f} {cache.get_stats()['hit_rate']:>9.0%}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
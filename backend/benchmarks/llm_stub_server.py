@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq chat-completions API. Answers POST /v1/chat/completions with a
+valid Tier 2 JSON verdict after a configurable latency, and can inject 429 / 503 failures so
+timeouts, retries and fallbacks can be exercised without network access or API quota.
+
+Run from the backend directory:
+    python -m benchmarks.llm_stub_server --port 8600 --latency-ms 800
+    # then: LLM_BASE_URL=http://127.0.0.1:8600/v1 GROQ_API_KEY=stub python app.py
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+VERDICT = {
+    "visual_score": 0.7,
+    "audio_score": 0.2,
+    "text_alignment_score": 0.6,
+    "multimodal_agreement": 0.65,
+    "reasoning_summary": "Stub verdict: the pose and scene indicators are consistent with a fall; no verbal distress was heard.",
+    "threat_severity_index": 0.62
+}
+
+
+class StubStats:
+    def __init__(self):
+        self.lock = Lock()
+        self.requests = 0
+        self.frames = 0  # Evidence frames seen across all prompts (coalesced prompts carry several)
+        self.failures = 0
+
+    def snapshot(self):
+        with self.lock:
+            return {"requests": self.requests, "frames": self.frames, "failures": self.failures}
+
+
+def make_handler(stats, latency_ms, fail_rate, rate_limit_rate):
+    class ChatHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients reuse connections
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._reply(404, {"error": {"message": "not found"}})
+                return
+            prompt = json.loads(body)["messages"][-1]["content"]
+            with stats.lock:
+                stats.requests += 1
+                stats.frames += max(1, prompt.count("\nFrame "))
+
+            time.sleep(latency_ms / 1000 * random.uniform(0.8, 1.2))
+            roll = random.random()
+            if roll < rate_limit_rate:
+                with stats.lock:
+                    stats.failures += 1
+                self._reply(429, {"error": {"message": "Rate limit reached", "code": "rate_limit_exceeded"}},
+                            {"retry-after": "1"})
+                return
+            if roll < rate_limit_rate + fail_rate:
+                with stats.lock:
+                    stats.failures += 1
+                self._reply(503, {"error": {"message": "stub overloaded"}})
+                return
+
+            self._reply(200, {
+                "id": "stub",
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(VERDICT)}, "finish_reason": "stop"}]
+            })
+
+        def _reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ChatHandler
+
+
+def start_llm_stub(port=8600, latency_ms=800, fail_rate=0.0, rate_limit_rate=0.0):
+    """Serve the stub in a background thread; returns (server, base URL, stats)"""
+    stats = StubStats()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(stats, latency_ms, fail_rate, rate_limit_rate))
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, name="LLMStubServer", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1", stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    args = parser.parse_args()
+
+    server, url, stats = start_llm_stub(args.port, args.latency_ms, args.fail_rate, args.rate_limit_rate)
+    print(f"🤖 LLM stub listening at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"📊 {stats.snapshot()}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a network camera: serves a video file, looped and paced at its frame rate,
+as an MJPEG stream over HTTP. Every client gets its own playback. OpenCV opens it through the
+same FFmpeg network path it uses for RTSP, so streams can be tested without a camera or an RTSP server.
+
+Run from the backend directory:
+    python -m benchmarks.stream_stub_server path/to/video.mp4 --port 8554
+    # source for /api/streams: http://127.0.0.1:8554/stream.mjpg
+"""
+
+import argparse
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import cv2
+
+BOUNDARY = "frame"
+
+
+def make_handler(video_path, jpeg_quality):
+    class MJPEGHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/stream.mjpg":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+            self.end_headers()
+
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30
+            next_time = time.perf_counter()
+            try:
+                while True:
+                    ret, frame = cap.read()
+                    if not ret:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+                    if not ok:
+                        continue
+                    payload = jpeg.tobytes()
+                    self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(payload)}\r\n\r\n".encode())
+                    self.wfile.write(payload)
+                    self.wfile.write(b"\r\n")
+                    next_time += 1.0 / fps
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                cap.release()
+
+        def log_message(self, format, *args):
+            pass
+
+    return MJPEGHandler
+
+
+def start_stub_server(video_path, port=8554, jpeg_quality=80):
+    """Serve video_path in a background thread; returns (server, stream URL)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(video_path, jpeg_quality))
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, name="StreamStubServer", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/stream.mjpg"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="Video file to serve")
+    parser.add_argument("--port", type=int, default=8554)
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.video, args.port, args.quality)
+    print(f"📡 Serving {args.video} at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
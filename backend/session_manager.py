@@ -3,14 +3,25 @@ import threading
 import time
 import cv2
 import os
-import queue
 from datetime import datetime
 from threading import Thread, Lock
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Optional, Dict, Any
-from utils.audio_processing import AudioStream
-from tier1.tier1_pipeline import run_tier1_continuous
-from tier2.tier2_pipeline import run_tier2_continuous
+from utils.audio_processing import AudioStream, StreamingTranscriber, voice_gate
+from utils.pose_processing import pose_tracker_pool
+from utils.motion_gate import MotionGate
+from utils.adaptive_sampler import AdaptiveSampler, ANALYSIS_TARGET_FPS, sampling_interval
+from utils.frame_ring_buffer import FrameRingBuffer
+from utils.video_recorder import VideoRecorder
+from utils.event_clip_recorder import EventClipRecorder, CONTINUOUS_RECORDING, clip_url
+from utils.frame_sampler import FrameSampler
+from utils.outbound_channel import OutboundChannel
+from tier1.tier1_pipeline import run_tier1_continuous, run_tier1_batch, TIER1_BATCH_SIZE
+from tier2.tier2_worker import Tier2WorkQueue
+from utils.tier2_cache import tier2_cache
+from utils.llm_client import llm_client
+from utils.local_tier2 import local_tier2_engine
+from utils.episode_tracker import EpisodeTracker
 import numpy as np
 
 
@@ -30,8 +41,9 @@ class SessionManager:
         self.resources = {
             'video_cap': None,
             'video_writer': None,
+            'clip_recorder': None,
             'audio_stream': None,
-            'frame_queue': None
+            'frame_buffer': None
         }
         
         # Control flags
@@ -44,6 +56,30 @@ class SessionManager:
         
         # Upload-specific
         self.upload_session_dir = None
+        self._upload_anomaly_count = 0
+        
+        # Tier 2 stage for the active session
+        self.tier2_queue: Optional[Tier2WorkQueue] = None
+        
+        # Outbound WebSocket channel for the active session (worker threads -> server loop)
+        self.channel: Optional[OutboundChannel] = None
+        
+        # Incremental Whisper transcription for the live session
+        self.transcriber: Optional[StreamingTranscriber] = None
+        
+        # Pose state (landmarker, timestamps, cooldown) of the active session's stream
+        self.pose_stream_id: Optional[str] = None
+        
+        # Motion pre-filter: static frames reuse the previous Tier 1 result
+        self.motion_gate: Optional[MotionGate] = None
+        self._last_upload_tier1 = None
+        
+        # Analysis-rate scheduler of the active session
+        self.adaptive_sampler: Optional[AdaptiveSampler] = None
+        
+        # Suspected frames are merged into episodes: one anomaly event and one Tier 2 call each
+        self.episode_tracker: Optional[EpisodeTracker] = None
+        self._episode_records = {}  # episode_id -> anomaly event of the active session
         
     def get_status(self) -> Dict[str, Any]:
         """Get current session status"""
@@ -53,7 +89,21 @@ class SessionManager:
                 "active": self.running,
                 "websocket_connected": self.active_websocket is not None,
                 "threads_count": len(self.processing_threads),
-                "resources_active": any(self.resources.values())
+                "resources_active": any(self.resources.values()),
+                "tier2_queue": self.tier2_queue.get_stats() if self.tier2_queue else None,
+                "tier2_cache": tier2_cache.get_stats(),
+                "llm_client": llm_client.get_stats(),
+                "local_tier2": local_tier2_engine.get_stats(),
+                "outbound_channel": self.channel.get_stats() if self.channel else None,
+                "transcriber": self.transcriber.get_stats() if self.transcriber else None,
+                "audio_gate": voice_gate.get_stats(),
+                "pose_trackers": pose_tracker_pool.get_stats(),
+                "motion_gate": self.motion_gate.get_stats() if self.motion_gate else None,
+                "analysis_rate": self.adaptive_sampler.get_stats() if self.adaptive_sampler else None,
+                "episodes": self.episode_tracker.get_stats() if self.episode_tracker else None,
+                "frame_buffer": self.resources['frame_buffer'].get_stats() if self.resources.get('frame_buffer') else None,
+                "recording": self.resources['video_writer'].get_stats() if self.resources.get('video_writer') else None,
+                "event_clips": self.resources['clip_recorder'].get_stats() if self.resources.get('clip_recorder') else None
             }
     
     def graceful_stop_live(self) -> bool:
@@ -70,7 +120,17 @@ class SessionManager:
             self.running = False
             self.current_mode = None
             self.active_websocket = None
+            if self.channel:
+                self.channel.close()
+                self.channel = None
             
+            # Wake the recording and analysis consumers so they exit before the writer is released
+            if self.resources.get('frame_buffer'):
+                self.resources['frame_buffer'].close()
+            for thread in self.processing_threads:
+                if thread.name == "FrameRecorder" and thread is not threading.current_thread():
+                    thread.join(timeout=2.0)
+
             # 2. Release video resources gracefully
             if self.resources.get('video_capture'):
                 try:
@@ -91,6 +151,15 @@ class SessionManager:
                     print(f"❌ Error releasing video writer: {e}")
                     success = False
             
+            if self.resources.get('clip_recorder'):
+                try:
+                    self.resources['clip_recorder'].release()
+                    self.resources['clip_recorder'] = None
+                    print("🎞️ Released event clip recorder")
+                except Exception as e:
+                    print(f"❌ Error releasing event clip recorder: {e}")
+                    success = False
+            
             # 4. Stop audio stream gracefully
             if self.resources.get('audio_stream'):
                 try:
@@ -102,14 +171,10 @@ class SessionManager:
                     print(f"❌ Error stopping audio stream: {e}")
                     success = False
             
-            # 5. Clear frame queue
-            try:
-                while not self.frame_queue.empty():
-                    self.frame_queue.get_nowait()
-                print("🗂️ Cleared frame queue")
-            except Exception as e:
-                print(f"❌ Error clearing frame queue: {e}")
-                success = False
+            # 5. Drop the frame ring buffer
+            if self.resources.get('frame_buffer'):
+                self.resources['frame_buffer'] = None
+                print("🗂️ Released frame buffer")
         
         # 6. Wait for threads to finish naturally (outside lock to avoid deadlock)
         for thread in self.processing_threads[:]:  # Copy list to avoid modification during iteration
@@ -142,7 +207,14 @@ class SessionManager:
             
             # 1. Set stop flag
             self.running = False
-            
+
+            # Let the recorder write the frames already captured (and any clip post-roll) before the writers are released
+            if self.resources['frame_buffer']:
+                self.resources['frame_buffer'].close()
+            for thread in self.processing_threads:
+                if thread.name == "FrameRecorder" and thread is not threading.current_thread():
+                    thread.join(timeout=2.0)
+
             # 2. Force terminate all threads
             for thread in self.processing_threads:
                 if thread.is_alive():
@@ -166,20 +238,20 @@ class SessionManager:
                     self.resources['video_writer'] = None
                     print("💾 Released video writer")
                     
+                if self.resources['clip_recorder']:
+                    self.resources['clip_recorder'].release()
+                    self.resources['clip_recorder'] = None
+                    print("🎞️ Released event clip recorder")
+                    
                 if self.resources['audio_stream']:
                     self.resources['audio_stream'].stop()
                     self.resources['audio_stream'] = None
                     print("🎤 Stopped audio stream")
                     
-                if self.resources['frame_queue']:
-                    # Clear queue
-                    while not self.resources['frame_queue'].empty():
-                        try:
-                            self.resources['frame_queue'].get_nowait()
-                        except:
-                            break
-                    self.resources['frame_queue'] = None
-                    print("🗂️ Cleared frame queue")
+                if self.resources['frame_buffer']:
+                    self.resources['frame_buffer'].close()
+                    self.resources['frame_buffer'] = None
+                    print("🗂️ Released frame buffer")
                     
             except Exception as e:
                 print(f"❌ Error releasing resources: {e}")
@@ -189,6 +261,9 @@ class SessionManager:
             self.processing_threads.clear()
             self.current_mode = None
             self.active_websocket = None
+            if self.channel:
+                self.channel.close()
+                self.channel = None
             self.session_data.clear()
             self.upload_session_dir = None
             
@@ -227,6 +302,7 @@ class SessionManager:
             with self.lock:
                 self.current_mode = "live"
                 self.active_websocket = websocket
+                self.channel = OutboundChannel(websocket, asyncio.get_running_loop()).start()
                 self.running = True
                 # Don't clear anomaly_events - preserve previous detections
                 # self.anomaly_events = []  # REMOVED: This was causing anomalies to be lost
@@ -240,7 +316,7 @@ class SessionManager:
             live_thread.start()
             
             print("✅ Samsung Demo live mode started successfully")
-            print("🔍 Tier 1 optimized analysis: Every 10th frame")
+            print(f"🔍 Tier 1 adaptive analysis: target {ANALYSIS_TARGET_FPS:g} FPS (every {sampling_interval(30)} frames at 30 FPS to start)")
             print("🧠 Tier 2 smart reasoning: Real-time capable")
             print("⚡ Samsung Performance: Optimized for live demonstration")
             print("="*80 + "\n")
@@ -276,6 +352,7 @@ class SessionManager:
             with self.lock:
                 self.current_mode = "upload"
                 self.active_websocket = websocket
+                self.channel = OutboundChannel(websocket, asyncio.get_running_loop()).start()
                 self.running = True
                 
                 # Create upload session directory
@@ -304,7 +381,7 @@ class SessionManager:
             upload_thread.start()
             
             print("✅ Samsung Demo upload mode started successfully")
-            print("🔍 Tier 1 optimized analysis: Every 10th frame")
+            print(f"🔍 Tier 1 adaptive analysis: target {ANALYSIS_TARGET_FPS:g} FPS (every {sampling_interval(30)} frames at 30 FPS to start)")
             print("🧠 Tier 2 smart reasoning: 80% fewer false positives")
             print("⚡ Samsung Performance: 5-10x faster than baseline")
             print("="*80 + "\n")
@@ -321,43 +398,70 @@ class SessionManager:
             # Initialize camera
             video_cap = cv2.VideoCapture(0)
             if not self._setup_camera(video_cap):
-                asyncio.run(websocket.send_json({"error": "Could not open camera"}))
+                self._send({"error": "Could not open camera"})
                 return
             
             self.resources['video_cap'] = video_cap
             
-            # Setup video recording
+            # Setup recording: anomaly clips from an in-memory pre-roll, plus optional continuous
+            # recording; both encode on their own threads
             width = int(video_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             height = int(video_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             fps = video_cap.get(cv2.CAP_PROP_FPS) or 30
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_filename = f"recorded_videos/session_{timestamp}.mp4"
-            
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            video_writer = cv2.VideoWriter(video_filename, fourcc, fps, (width, height))
-            self.resources['video_writer'] = video_writer
+            clip_recorder = EventClipRecorder(fps, f"session_{timestamp}").start()
+            self.resources['clip_recorder'] = clip_recorder
+            video_recorder = None
+            if CONTINUOUS_RECORDING:
+                video_recorder = VideoRecorder(f"recorded_videos/session_{timestamp}", fps, (width, height)).start()
+                self.resources['video_writer'] = video_recorder
             
             # Start audio stream
             audio_stream = AudioStream()
             audio_stream.start()
             self.resources['audio_stream'] = audio_stream
             
-            # Setup frame capture
-            frame_queue = queue.Queue(maxsize=10)
-            self.resources['frame_queue'] = frame_queue
+            # Transcribe overlapping windows in the background instead of re-running Whisper per frame
+            self.transcriber = StreamingTranscriber(audio_stream).start()
             
-            frame_thread = Thread(target=self._capture_frames, args=(video_cap, frame_queue), name="FrameCapture")
-            self.processing_threads.append(frame_thread)
+            # Setup frame capture: one ring buffer feeds lossless recording and latest-frame analysis
+            frame_buffer = FrameRingBuffer()
+            self.resources['frame_buffer'] = frame_buffer
+            
+            frame_thread = Thread(target=self._capture_frames, args=(video_cap, frame_buffer), name="FrameCapture")
+            record_thread = Thread(target=self._record_frames, args=(frame_buffer, video_recorder, clip_recorder), name="FrameRecorder")
+            self.processing_threads.extend([frame_thread, record_thread])
             frame_thread.start()
+            record_thread.start()
+            
+            # Tier 2 runs as its own stage so slow reasoning never stalls the frame loop
+            self.tier2_queue = Tier2WorkQueue(name="LiveTier2").start()
+            
+            # The live camera gets its own pose tracker
+            self.pose_stream_id = "live"
             
             # Main processing loop
-            self._live_processing_loop(websocket, frame_queue, video_writer, audio_stream, fps, video_filename)
+            self._live_processing_loop(websocket, frame_buffer, audio_stream, fps, video_recorder, clip_recorder)
             
         except Exception as e:
             print(f"❌ Live processing worker error: {e}")
-            asyncio.run(websocket.send_json({"error": f"Live processing error: {str(e)}"}))
+            self._send({"error": f"Live processing error: {str(e)}"})
         finally:
+            if self.transcriber:
+                self.transcriber.stop()
+                self.transcriber = None
+            # An episode still open when the camera stops gets its Tier 2 analysis before the queue shuts down
+            flushed = []
+            if self.episode_tracker and self.tier2_queue:
+                flushed = self.episode_tracker.flush()
+                audio_stream = self.resources['audio_stream']
+                analyzing = any(event == "analyze" for event, _ in flushed)
+                audio_chunk = audio_stream.get_chunk() if analyzing and audio_stream and audio_stream.running else None
+                self._handle_episode_events(flushed, audio_chunk)
+            if self.tier2_queue:
+                self.tier2_queue.stop(drain=bool(flushed))
+            self._release_pose_tracker()
             self._cleanup_live_resources()
     
     def _upload_processing_worker(self, websocket: WebSocket, video_file_path: str):
@@ -366,7 +470,7 @@ class SessionManager:
             # Open video file
             video_cap = cv2.VideoCapture(video_file_path)
             if not video_cap.isOpened():
-                asyncio.run(websocket.send_json({"error": "Could not open video file"}))
+                self._send({"error": "Could not open video file"})
                 return
             
             self.resources['video_cap'] = video_cap
@@ -376,79 +480,63 @@ class SessionManager:
             fps = video_cap.get(cv2.CAP_PROP_FPS) or 30
             
             # Send initial progress
-            asyncio.run(websocket.send_json({
+            self._send({
                 "type": "started",
                 "total_frames": total_frames,
                 "fps": fps,
                 "session_dir": self.upload_session_dir
-            }))
-            
-            # Samsung Demo: Smart frame sampling for optimal performance
-            # Process every 10th frame for 2x speed improvement while maintaining accuracy
-            frame_skip = 10  # Samsung optimized: 3x fewer frames processed
+            })
+            
+            # Offline video: block Tier 1 rather than drop Tier 2 jobs when the stage is busy
+            self.tier2_queue = Tier2WorkQueue(policy="block", name="UploadTier2").start()
+            
+            # Pose timestamps follow the video's media time on this upload's own tracker
+            self.pose_stream_id = f"upload:{os.path.basename(video_file_path)}"
+            self.motion_gate = MotionGate()
+            self._last_upload_tier1 = None
+            self.episode_tracker = EpisodeTracker(self.pose_stream_id)
+            self._episode_records = {}
+            
+            # Adaptive sampling: starts at the target analysis rate (every 10th frame at 30 FPS)
+            # and adjusts the stride after every batch
+            self.adaptive_sampler = AdaptiveSampler(fps)
+            frame_skip = self.adaptive_sampler.interval
             frame_count = 0
             processed_count = 0
-            anomaly_count = 0
+            self._upload_anomaly_count = 0
+            pending_frames = []  # (frame_count, timestamp, frame, analyze) awaiting a batched Tier 1 pass
             
-            print(f"🎯 Samsung Demo Mode: Processing every {frame_skip} frames for optimal upload performance")
+            print(f"🎯 Samsung Demo Mode: Processing every {frame_skip} frames to start (adaptive) for optimal upload performance")
+            print(f"📦 Tier 1 batch size: {TIER1_BATCH_SIZE} frames per CLIP pass")
             
-            while self.running and video_cap.isOpened():
-                ret, frame = video_cap.read()
-                if not ret:
+            # Samsung Demo: Process every frame_skip-th frame; skipped frames are grabbed, never decoded to BGR
+            sampler = FrameSampler(video_cap, stride=frame_skip, start=frame_skip - 1)
+            for frame_index, _, frame in sampler:
+                if not self.running:
                     break
                 
-                frame_count += 1
+                frame_count = frame_index + 1
+                processed_count += 1
+                analyze = self.motion_gate.should_analyze(frame, frame_count / fps)
+                pending_frames.append((frame_count, frame_count / fps, frame, analyze))
                 
-                # Samsung Demo: Process every 10th frame for optimal performance
-                if frame_count % frame_skip == 0:
-                    processed_count += 1
-                    current_timestamp = frame_count / fps
-                    
-                    # Run Tier 1 processing (no audio for upload)
-                    try:
-                        tier1_result = run_tier1_continuous(frame, None)
-                        
-                        # Send progress update
-                        progress_data = {
-                            "type": "progress",
-                            "frame_count": frame_count,
-                            "processed_count": processed_count,
-                            "total_frames": total_frames,
-                            "progress_percent": (frame_count / total_frames) * 100,
-                            "timestamp": current_timestamp,
-                            "status": tier1_result["status"]
-                        }
-                        asyncio.run(websocket.send_json(progress_data))
-                        
-                        # If anomaly detected, save frame and run Tier 2
-                        if tier1_result["status"] == "Suspected Anomaly":
-                            anomaly_count += 1
-                            
-                            # Save anomaly frame
-                            frame_filename = f"{self.upload_session_dir}/anomaly_frames/anomaly_{frame_count}.jpg"
-                            cv2.imwrite(frame_filename, frame)
-                            
-                            # Run Tier 2 analysis
-                            tier2_result = run_tier2_continuous(frame, None, tier1_result)
-                            
-                            # Send anomaly data
-                            anomaly_data = {
-                                "type": "anomaly",
-                                "frame_count": frame_count,
-                                "timestamp": current_timestamp,
-                                "frame_file": frame_filename,
-                                "tier1_result": tier1_result,
-                                "tier2_result": tier2_result,
-                                "anomaly_index": anomaly_count
-                            }
-                            asyncio.run(websocket.send_json(anomaly_data))
-                            
-                            # Store anomaly
-                            self.anomaly_events.append(anomaly_data)
-                            
-                    except Exception as e:
-                        print(f"❌ Error processing frame {frame_count}: {e}")
-                        continue
+                if len(pending_frames) >= TIER1_BATCH_SIZE:
+                    self._process_upload_batch(websocket, pending_frames, processed_count - len(pending_frames), total_frames)
+                    pending_frames = []
+                    sampler.stride = self.adaptive_sampler.interval
+            
+            # Flush the final partial batch
+            if self.running and pending_frames:
+                self._process_upload_batch(websocket, pending_frames, processed_count - len(pending_frames), total_frames)
+            # An episode still open at the end of the video gets its Tier 2 analysis now
+            if self.running:
+                self._handle_episode_events(self.episode_tracker.flush(), None)
+            anomaly_count = self._upload_anomaly_count
+            
+            # Wait for outstanding Tier 2 analyses so the report is complete
+            if self.running and self.tier2_queue.pending():
+                print(f"⏳ Waiting for {self.tier2_queue.pending()} Tier 2 analyses to finish...")
+                self.tier2_queue.join()
             
             # Send completion data
             completion_data = {
@@ -459,14 +547,143 @@ class SessionManager:
                 "session_dir": self.upload_session_dir,
                 "anomaly_events": self.anomaly_events
             }
-            asyncio.run(websocket.send_json(completion_data))
+            self._send(completion_data)
             
         except Exception as e:
             print(f"❌ Upload processing worker error: {e}")
-            asyncio.run(websocket.send_json({"error": f"Upload processing error: {str(e)}"}))
+            self._send({"error": f"Upload processing error: {str(e)}"})
         finally:
+            if self.tier2_queue:
+                self.tier2_queue.stop()
+            self._release_pose_tracker()
             self._cleanup_upload_resources()
     
+    def _process_upload_batch(self, websocket, pending_frames, processed_before, total_frames):
+        """
+        Run one batched Tier 1 pass over the frames the motion gate let through and emit
+        per-frame progress/anomaly messages in order; static frames reuse the latest result.
+        """
+        analyzed = [(timestamp, frame) for _, timestamp, frame, analyze in pending_frames if analyze]
+        start = time.perf_counter()
+        try:
+            fresh_results = iter(run_tier1_batch(
+                [frame for _, frame in analyzed],
+                pose_tracker=pose_tracker_pool.acquire(self.pose_stream_id),
+                timestamps_ms=[timestamp * 1000 for timestamp, _ in analyzed]
+            ))
+            if analyzed:
+                self.motion_gate.record_analysis((time.perf_counter() - start) * 1000 / len(analyzed))
+        except Exception as e:
+            print(f"❌ Error processing frames {pending_frames[0][0]}-{pending_frames[-1][0]}: {e}")
+            return
+        
+        # Wall time per sampled frame (gated ones included) drives the adaptive analysis rate
+        frame_latency = (time.perf_counter() - start) / len(pending_frames)
+        
+        for offset, (frame_count, current_timestamp, frame, analyze) in enumerate(pending_frames):
+            try:
+                if analyze:
+                    tier1_result = next(fresh_results)
+                    tier1_result["motion_gated"] = False
+                    self._last_upload_tier1 = tier1_result
+                elif self._last_upload_tier1 is not None:
+                    tier1_result = self._reuse_tier1_result(self._last_upload_tier1)
+                else:
+                    continue
+                
+                self.adaptive_sampler.record(
+                    current_timestamp, frame_latency,
+                    suspected=analyze and tier1_result["status"] == "Suspected Anomaly",
+                    motion_score=self.motion_gate.last_score if analyze else 0.0
+                )
+                
+                # Send progress update
+                progress_data = {
+                    "type": "progress",
+                    "frame_count": frame_count,
+                    "processed_count": processed_before + offset + 1,
+                    "total_frames": total_frames,
+                    "progress_percent": (frame_count / total_frames) * 100,
+                    "timestamp": current_timestamp,
+                    "status": tier1_result["status"]
+                }
+                self._send(progress_data)
+                
+                # Suspected frames join the current episode; a new episode saves its onset frame
+                events = self.episode_tracker.update(current_timestamp, tier1_result, frame if analyze else None, frame_count)
+                for event, episode in events:
+                    if event == "opened":
+                        self._upload_anomaly_count += 1
+                        frame_filename = f"{self.upload_session_dir}/anomaly_frames/anomaly_{frame_count}.jpg"
+                        cv2.imwrite(frame_filename, frame)
+                        self._open_episode_record(episode, {
+                            "type": "anomaly",
+                            "frame_count": frame_count,
+                            "timestamp": current_timestamp,
+                            "frame_file": frame_filename,
+                            "tier1_result": tier1_result,
+                            "anomaly_index": self._upload_anomaly_count
+                        })
+                self._handle_episode_events(events, None)
+                
+            except Exception as e:
+                print(f"❌ Error processing frame {frame_count}: {e}")
+                continue
+    
+    def _reuse_tier1_result(self, previous):
+        """Copy of the previous Tier 1 result for a frame the motion gate judged static"""
+        result = dict(previous)
+        result["motion_gated"] = True
+        return result
+    
+    def _release_pose_tracker(self):
+        """Close the session stream's pose tracker and landmarker"""
+        if self.pose_stream_id:
+            pose_tracker_pool.release(self.pose_stream_id)
+            self.pose_stream_id = None
+    
+    def _send(self, message):
+        """Queue a message for the session's WebSocket; safe to call from worker threads"""
+        channel = self.channel
+        if channel:
+            channel.send(message)
+    
+    def _open_episode_record(self, episode, anomaly_data):
+        """
+        Record and send the anomaly event of a new episode right away with tier2_status "pending";
+        it is re-sent (same anomaly_index) when its Tier 2 analysis completes
+        """
+        anomaly_data["episode"] = episode.to_dict()
+        anomaly_data["tier2_result"] = None
+        anomaly_data["tier2_status"] = "pending"
+        self._episode_records[episode.episode_id] = anomaly_data
+        self.anomaly_events.append(anomaly_data)
+        self._send(dict(anomaly_data))  # Snapshot: the record keeps changing while the message is queued
+    
+    def _handle_episode_events(self, events, audio_chunk):
+        """Queue Tier 2 on the episode's key frames for "analyze" events, finalize the record on "closed" """
+        for event, episode in events:
+            anomaly_data = self._episode_records.get(episode.episode_id)
+            if anomaly_data is None:
+                continue
+            anomaly_data["episode"] = episode.to_dict()
+            if event == "analyze":
+                self._submit_tier2(anomaly_data, episode, audio_chunk)
+            elif event == "closed":
+                del self._episode_records[episode.episode_id]
+    
+    def _submit_tier2(self, anomaly_data, episode, audio_chunk):
+        """Attach the episode's Tier 2 result to its anomaly event when the Tier 2 stage finishes (re-sent on escalation)"""
+        anomaly_data["tier1_result"] = episode.tier1_summary()
+        anomaly_data["tier2_status"] = "pending"
+        
+        def on_complete(tier2_result):
+            anomaly_data["tier2_result"] = tier2_result
+            anomaly_data["tier2_status"] = "skipped" if tier2_result.get("skipped") else "complete"
+            self._send(dict(anomaly_data))
+        
+        self.tier2_queue.submit(episode.frames(), audio_chunk, anomaly_data["tier1_result"], on_complete, stream_id=self.pose_stream_id)
+    
     def _setup_camera(self, video_cap) -> bool:
         """Setup camera with optimal settings"""
         for attempt in range(3):
@@ -485,48 +702,96 @@ class SessionManager:
             time.sleep(1)
         return False
     
-    def _capture_frames(self, video_cap, frame_queue):
-        """Frame capture thread"""
-        while self.running:
-            ret, frame = video_cap.read()
-            if not ret:
-                break
-            if not frame_queue.full():
-                frame_queue.put(frame)
+    def _capture_frames(self, video_cap, frame_buffer):
+        """Frame capture thread: every frame goes into the ring buffer, nothing is discarded here"""
+        try:
+            while self.running:
+                ret, frame = video_cap.read()
+                if not ret:
+                    break
+                frame_buffer.write(frame)
+        finally:
+            frame_buffer.close()
+    
+    def _record_frames(self, frame_buffer, video_recorder, clip_recorder):
+        """Recording consumer: every captured frame, in order, goes to the clip pre-roll and the optional encoder stage"""
+        cursor = 0
+        while True:
+            frames, cursor = frame_buffer.read_since(cursor, timeout=0.5)
+            recorded = 0
+            for seq, frame in frames:
+                clip_recorder.push(seq, frame)
+                recorded += video_recorder.write(frame) if video_recorder else 1
+            frame_buffer.count("recorded", recorded)
+            if frame_buffer.closed and not frames:
+                return
     
-    def _live_processing_loop(self, websocket, frame_queue, video_writer, audio_stream, fps, video_filename):
+    def _live_processing_loop(self, websocket, frame_buffer, audio_stream, fps, video_recorder, clip_recorder):
         """Main live processing loop (simplified from app.py)"""
-        frame_count = 0
-        frame_interval = 10  # Samsung Demo: Process every 10th frame for optimal performance
+        # Adaptive sampling: starts at the target analysis rate (every 10th frame at 30 FPS),
+        # backs off when Tier 1 falls behind and speeds up around suspected events
+        self.adaptive_sampler = AdaptiveSampler(fps)
         
-        print(f"🎯 Samsung Demo Mode: Live processing every {frame_interval} frames for real-time performance")
+        print(f"🎯 Samsung Demo Mode: Live processing every {self.adaptive_sampler.interval} frames to start (adaptive) for real-time performance")
         
+        # Live pose timestamps come from the wall clock at analysis time
+        pose_tracker = pose_tracker_pool.acquire(self.pose_stream_id)
+        self.motion_gate = MotionGate()
+        self.episode_tracker = EpisodeTracker(self.pose_stream_id)
+        self._episode_records = {}
+        last_tier1 = None
+        last_transcript = None
+        
+        last_seq = -1
         while self.running:
-            if frame_queue.empty():
-                time.sleep(0.01)
+            # Latest-frame consumer: wait (no polling) for a newer frame, skipping any analysis had no time for
+            seq = frame_buffer.wait_newer(last_seq, timeout=0.5)
+            if seq == last_seq:
+                if frame_buffer.closed:
+                    break
                 continue
+            last_seq = seq
+            frame_count = seq + 1
             
-            frame = frame_queue.get()
-            frame_count += 1
-            
-            # Record frame
-            if video_writer.isOpened():
-                video_writer.write(frame)
-            
-            # Samsung Demo: Process every 10th frame (3 FPS analysis rate for optimal performance)
-            if frame_count % frame_interval != 0:
+            # Samsung Demo: analyse frames at the scheduler's current rate (3 FPS by default)
+            if not self.adaptive_sampler.should_sample(frame_count):
+                continue
+            frame = frame_buffer.get(seq)
+            if frame is None:
                 continue
+            frame_buffer.count("analyzed")
             
             current_timestamp = frame_count / fps
-            audio_chunk = audio_stream.get_chunk()
             
             try:
-                # Run Tier 1 continuously
-                tier1_result = run_tier1_continuous(frame, audio_chunk)
+                iteration_start = time.perf_counter()
+                
+                # Full Tier 1 only on motion, new speech or heartbeat; static frames reuse the last result
+                transcript = self.transcriber.get_transcript()
+                analyze = self.motion_gate.should_analyze(
+                    frame, current_timestamp, force=last_tier1 is None or transcript != last_transcript
+                )
+                if analyze:
+                    # Run Tier 1 continuously on the rolling transcript (no per-frame Whisper call)
+                    start = time.perf_counter()
+                    tier1_result = run_tier1_continuous(frame, None, audio_transcript=transcript, pose_tracker=pose_tracker)
+                    self.motion_gate.record_analysis((time.perf_counter() - start) * 1000)
+                    tier1_result["motion_gated"] = False
+                    last_tier1 = tier1_result
+                    last_transcript = transcript
+                else:
+                    tier1_result = self._reuse_tier1_result(last_tier1)
+                
+                self.adaptive_sampler.record(
+                    current_timestamp, time.perf_counter() - iteration_start,
+                    suspected=analyze and tier1_result["status"] == "Suspected Anomaly",
+                    motion_score=self.motion_gate.last_score if analyze else 0.0
+                )
+                
                 tier1_result.update({
                     "frame_count": frame_count,
                     "timestamp": current_timestamp,
-                    "video_file": video_filename
+                    "video_file": video_recorder.current_file if video_recorder else None
                 })
                 
                 # Always send Tier 1 result for continuous monitoring
@@ -538,34 +803,38 @@ class SessionManager:
                     "details": tier1_result["details"],
                     "tier1_result": tier1_result
                 }
-                asyncio.run(websocket.send_json(tier1_message))
+                self._send(tier1_message)
                 
-                # If anomaly detected, run Tier 2 and send combined anomaly event
-                if tier1_result["status"] == "Suspected Anomaly":
-                    anomaly_frame_filename = f"anomaly_frames/anomaly_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{frame_count}.jpg"
-                    cv2.imwrite(anomaly_frame_filename, frame)
-                    
-                    # Run Tier 2 analysis
-                    tier2_result = run_tier2_continuous(frame, audio_chunk, tier1_result)
-                    
-                    # Send combined anomaly data (matching upload mode format)
-                    anomaly_data = {
-                        "type": "anomaly",
-                        "frame_count": frame_count,
-                        "timestamp": current_timestamp,
-                        "frame_file": anomaly_frame_filename,
-                        "tier1_result": tier1_result,
-                        "tier2_result": tier2_result,
-                        "anomaly_index": len(self.anomaly_events) + 1
-                    }
-                    asyncio.run(websocket.send_json(anomaly_data))
-                    self.anomaly_events.append(anomaly_data)
+                # Pre-roll + post-roll clip around the event, extended by every suspected frame of the
+                # episode; the path is valid once the post-roll is captured
+                clip_filename = None
+                if analyze and tier1_result["status"] == "Suspected Anomaly":
+                    clip_filename = clip_recorder.trigger(seq)
+                
+                # Consecutive suspected frames form one episode: one anomaly event (matching upload
+                # mode format), sent with its combined Tier 2 analysis once that completes
+                events = self.episode_tracker.update(current_timestamp, tier1_result, frame if analyze else None, frame_count)
+                for event, episode in events:
+                    if event == "opened":
+                        anomaly_frame_filename = f"anomaly_frames/anomaly_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{frame_count}.jpg"
+                        cv2.imwrite(anomaly_frame_filename, frame)
+                        self._open_episode_record(episode, {
+                            "type": "anomaly",
+                            "frame_count": frame_count,
+                            "timestamp": current_timestamp,
+                            "frame_file": anomaly_frame_filename,
+                            "clip_file": clip_filename,
+                            "clip_url": clip_url(clip_filename),
+                            "tier1_result": tier1_result,
+                            "anomaly_index": len(self.anomaly_events) + 1
+                        })
+                # Tier 2 still runs Whisper large on the raw audio around the anomaly
+                analyzing = any(event == "analyze" for event, _ in events)
+                self._handle_episode_events(events, audio_stream.get_chunk() if analyzing else None)
                     
             except Exception as e:
                 print(f"❌ Live processing error: {e}")
                 continue
-            
-            time.sleep(1 / fps)
     
     def _cleanup_live_resources(self):
         """Clean up live session resources"""
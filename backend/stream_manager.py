@@ -0,0 +1,494 @@
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Thread, Lock, Condition
+from typing import Optional, Dict, Any
+
+import cv2
+
+from utils.audio_processing import AudioStream, FileAudioStream, StreamingTranscriber
+from utils.pose_processing import pose_tracker_pool
+from utils.motion_gate import MotionGate
+from utils.adaptive_sampler import AdaptiveSampler, ANALYSIS_TARGET_FPS
+from utils.frame_ring_buffer import FrameRingBuffer
+from utils.event_clip_recorder import EventClipRecorder, clip_url
+from utils.episode_tracker import EpisodeTracker
+from tier1.tier1_pipeline import run_tier1_continuous
+from tier2.tier2_worker import Tier2WorkQueue
+
+# Multi-stream configuration
+STREAM_MAX_STREAMS = int(os.getenv("STREAM_MAX_STREAMS", "8"))
+STREAM_TIER1_SLOTS = int(os.getenv("STREAM_TIER1_SLOTS", "2"))  # Tier 1 runs sharing the models at once
+STREAM_EVENT_HISTORY = int(os.getenv("STREAM_EVENT_HISTORY", "200"))  # Anomaly records kept per stream
+
+AUDIO_MODES = ("mic", "file", "none")
+
+
+def parse_source(source):
+    """(kind, target) of a stream source: a camera index, a network URL or a file looped as a camera"""
+    text = str(source).strip()
+    if text.isdigit():
+        return "camera", int(text)
+    if re.match(r"^(rtsp|rtsps|rtmp|http|https)://", text, re.IGNORECASE):
+        return "network", text
+    if os.path.isfile(text):
+        return "file", text
+    raise ValueError(f"Unknown stream source '{source}' (expected camera index, URL or video file)")
+
+
+class LoopingCapture:
+    """Video file served as a fake camera: frames are paced at the file's frame rate and the file rewinds at the end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30
+        self.loops = 0
+        self._next_time = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def read(self):
+        now = time.perf_counter()
+        if self._next_time is None or now - self._next_time > 1.0:
+            # First frame, or we fell far behind: resynchronise instead of bursting
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time += 1.0 / self.fps
+
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+def open_capture(kind, target):
+    """Open the OpenCV capture for a parsed source"""
+    if kind == "file":
+        return LoopingCapture(target)
+    if kind == "network":
+        cap = cv2.VideoCapture(target, cv2.CAP_FFMPEG)
+    else:
+        cap = cv2.VideoCapture(target)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class FairScheduler:
+    """
+    Admission control for Tier 1 across streams. At most `slots` Tier 1 runs use the shared
+    models at once; streams waiting for a slot are served first come, first served, and since
+    every stream has at most one run waiting this is round-robin: a busy stream cannot starve
+    the others, and each stream's adaptive sampler backs off as the wait grows.
+    """
+
+    def __init__(self, slots=STREAM_TIER1_SLOTS):
+        self.slots = max(1, slots)
+        self._active = 0
+        self._waiting = deque()
+        self._condition = Condition()
+        self.stats = {}  # stream name -> {"runs", "wait_ms"}
+
+    @contextmanager
+    def slot(self, stream_name):
+        ticket = object()
+        start = time.perf_counter()
+        with self._condition:
+            self._waiting.append(ticket)
+            while self._active >= self.slots or self._waiting[0] is not ticket:
+                self._condition.wait()
+            self._waiting.popleft()
+            self._active += 1
+            stats = self.stats.setdefault(stream_name, {"runs": 0, "wait_ms": 0.0})
+            stats["runs"] += 1
+            stats["wait_ms"] += (time.perf_counter() - start) * 1000
+            # The next ticket may fit in a slot that is still free
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def get_stats(self):
+        with self._condition:
+            return {
+                "slots": self.slots,
+                "active": self._active,
+                "waiting": len(self._waiting),
+                "streams": {
+                    name: {"runs": s["runs"], "avg_wait_ms": round(s["wait_ms"] / s["runs"], 1) if s["runs"] else 0.0}
+                    for name, s in self.stats.items()
+                }
+            }
+
+
+class LiveStream:
+    """
+    One named live source with its own capture, frame ring, pose tracker, motion gate, analysis
+    rate, audio source, event clips and WebSocket subscribers. Tier 1 runs through the manager's
+    fair scheduler on the shared models; Tier 2 goes to the manager's shared Tier 2 stage.
+    """
+
+    def __init__(self, name, source, scheduler, tier2_queue=None, audio=None,
+                 target_fps=ANALYSIS_TARGET_FPS, motion_gate=True, clips=True):
+        self.name = name
+        self.source = str(source)
+        self.kind, self.target = parse_source(source)
+        self.audio_mode = audio or ("file" if self.kind == "file" else "none")
+        if self.audio_mode not in AUDIO_MODES:
+            raise ValueError(f"Unknown audio mode '{audio}' (expected one of {', '.join(AUDIO_MODES)})")
+        self.scheduler = scheduler
+        self.tier2_queue = tier2_queue
+        self.target_fps = target_fps
+        self.use_motion_gate = motion_gate
+        self.use_clips = clips
+
+        self.pose_stream_id = f"stream:{name}"
+        self.capture = None
+        self.fps = 30
+        self.frame_buffer = FrameRingBuffer()
+        self.audio_stream = None
+        self.transcriber: Optional[StreamingTranscriber] = None
+        self.clip_recorder: Optional[EventClipRecorder] = None
+        self.motion_gate: Optional[MotionGate] = None
+        self.adaptive_sampler: Optional[AdaptiveSampler] = None
+        self.anomaly_events = deque(maxlen=STREAM_EVENT_HISTORY)
+        self.episode_tracker = EpisodeTracker(self.pose_stream_id)
+        self._episode_records = {}  # episode_id -> anomaly record of the open episode
+        self.subscribers = []
+        self.running = False
+        self.started_at = None
+        self._threads = []
+        self._lock = Lock()
+        self.stats = {"tier1_runs": 0, "tier1_ms": 0.0, "anomalies": 0}
+
+    def start(self):
+        self.capture = open_capture(self.kind, self.target)
+        if not self.capture.isOpened():
+            raise RuntimeError(f"Could not open source '{self.source}'")
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30
+
+        if self.audio_mode != "none":
+            self.audio_stream = AudioStream() if self.audio_mode == "mic" else FileAudioStream(self.target)
+            self.audio_stream.start()
+            if self.audio_stream.running:
+                self.transcriber = StreamingTranscriber(self.audio_stream).start()
+
+        session_name = f"{re.sub(r'[^A-Za-z0-9_-]', '_', self.name)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if self.use_clips:
+            self.clip_recorder = EventClipRecorder(self.fps, session_name).start()
+        self.motion_gate = MotionGate(enabled=self.use_motion_gate)
+        self.adaptive_sampler = AdaptiveSampler(self.fps, target_fps=self.target_fps)
+
+        self.running = True
+        self.started_at = time.time()
+        targets = [(self._capture_frames, "Capture"), (self._analysis_loop, "Analysis")]
+        if self.clip_recorder:
+            targets.append((self._record_frames, "Clips"))
+        for target, role in targets:
+            thread = Thread(target=target, name=f"Stream[{self.name}]{role}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        print(f"📡 Stream '{self.name}' started: {self.kind} source {self.source} @ {self.fps:.0f} FPS, audio {self.audio_mode}")
+        return self
+
+    def subscribe(self, channel):
+        with self._lock:
+            self.subscribers.append(channel)
+
+    def unsubscribe(self, channel):
+        with self._lock:
+            if channel in self.subscribers:
+                self.subscribers.remove(channel)
+
+    def _publish(self, message):
+        """Fan a message out to every subscriber of this stream"""
+        message["stream"] = self.name
+        with self._lock:
+            self.subscribers = [channel for channel in self.subscribers if not channel.closed]
+            channels = list(self.subscribers)
+        for channel in channels:
+            channel.send(message)
+
+    def _capture_frames(self):
+        try:
+            while self.running:
+                ret, frame = self.capture.read()
+                if not ret:
+                    print(f"📡 Stream '{self.name}' source ended")
+                    break
+                self.frame_buffer.write(frame)
+        finally:
+            self.frame_buffer.close()
+
+    def _record_frames(self):
+        cursor = 0
+        while True:
+            frames, cursor = self.frame_buffer.read_since(cursor, timeout=0.5)
+            for seq, frame in frames:
+                self.clip_recorder.push(seq, frame)
+            self.frame_buffer.count("recorded", len(frames))
+            if self.frame_buffer.closed and not frames:
+                return
+
+    def _analysis_loop(self):
+        pose_tracker = pose_tracker_pool.acquire(self.pose_stream_id)
+        last_tier1 = None
+        last_transcript = None
+        last_seq = -1
+
+        while self.running:
+            seq = self.frame_buffer.wait_newer(last_seq, timeout=0.5)
+            if seq == last_seq:
+                if self.frame_buffer.closed:
+                    break
+                continue
+            last_seq = seq
+            frame_count = seq + 1
+            if not self.adaptive_sampler.should_sample(frame_count):
+                continue
+            frame = self.frame_buffer.get(seq)
+            if frame is None:
+                continue
+            self.frame_buffer.count("analyzed")
+            current_timestamp = frame_count / self.fps
+
+            try:
+                iteration_start = time.perf_counter()
+                transcript = self.transcriber.get_transcript() if self.transcriber else None
+                analyze = self.motion_gate.should_analyze(
+                    frame, current_timestamp, force=last_tier1 is None or transcript != last_transcript
+                )
+                if analyze:
+                    # Shared models: wait for this stream's turn
+                    with self.scheduler.slot(self.name):
+                        start = time.perf_counter()
+                        tier1_result = run_tier1_continuous(frame, None, audio_transcript=transcript, pose_tracker=pose_tracker)
+                        tier1_ms = (time.perf_counter() - start) * 1000
+                    self.motion_gate.record_analysis(tier1_ms)
+                    with self._lock:
+                        self.stats["tier1_runs"] += 1
+                        self.stats["tier1_ms"] += tier1_ms
+                    tier1_result["motion_gated"] = False
+                    last_tier1 = tier1_result
+                    last_transcript = transcript
+                else:
+                    tier1_result = dict(last_tier1)
+                    tier1_result["motion_gated"] = True
+
+                # Latency includes the slot wait, so every stream backs off as contention grows
+                suspected = analyze and tier1_result["status"] == "Suspected Anomaly"
+                self.adaptive_sampler.record(
+                    current_timestamp, time.perf_counter() - iteration_start, suspected=suspected,
+                    motion_score=self.motion_gate.last_score if analyze else 0.0
+                )
+                tier1_result.update({"frame_count": frame_count, "timestamp": current_timestamp})
+
+                self._publish({
+                    "type": "tier1_update",
+                    "frame_count": frame_count,
+                    "timestamp": current_timestamp,
+                    "status": tier1_result["status"],
+                    "details": tier1_result["details"],
+                    "tier1_result": tier1_result
+                })
+
+                clip_file = self.clip_recorder.trigger(seq) if suspected and self.clip_recorder else None
+                events = self.episode_tracker.update(current_timestamp, tier1_result, frame if analyze else None, frame_count)
+                if events:
+                    self._record_episodes(events, frame_count, current_timestamp, tier1_result, clip_file)
+            except Exception as e:
+                print(f"❌ Stream '{self.name}' processing error: {e}")
+                continue
+
+    def _record_episodes(self, events, frame_count, current_timestamp, tier1_result, clip_file):
+        """One anomaly record per episode; Tier 2 runs on its key frames when the tracker says so"""
+        for event, episode in events:
+            if event == "opened":
+                anomaly_data = {
+                    "type": "anomaly",
+                    "frame_count": frame_count,
+                    "timestamp": current_timestamp,
+                    "clip_file": clip_file,
+                    "clip_url": clip_url(clip_file),
+                    "tier1_result": tier1_result,
+                    "anomaly_index": self.stats["anomalies"] + 1,
+                    "episode": episode.to_dict(),
+                    "tier2_result": None,
+                    "tier2_status": "pending" if self.tier2_queue else "disabled"
+                }
+                with self._lock:
+                    self.stats["anomalies"] += 1
+                    self.anomaly_events.append(anomaly_data)
+                self._episode_records[episode.episode_id] = anomaly_data
+                # The alert goes out now; the Tier 2 result is re-published under the same anomaly_index
+                self._publish(dict(anomaly_data))
+                continue
+
+            anomaly_data = self._episode_records.get(episode.episode_id)
+            if anomaly_data is None:
+                continue
+            anomaly_data["episode"] = episode.to_dict()
+            if event == "closed":
+                del self._episode_records[episode.episode_id]
+                if self.tier2_queue is None:
+                    self._publish(dict(anomaly_data))
+            elif self.tier2_queue is not None:
+                self._submit_tier2(anomaly_data, episode)
+
+    def _submit_tier2(self, anomaly_data, episode):
+        anomaly_data["tier1_result"] = episode.tier1_summary()
+        anomaly_data["tier2_status"] = "pending"
+
+        def on_complete(tier2_result):
+            anomaly_data["tier2_result"] = tier2_result
+            anomaly_data["tier2_status"] = "skipped" if tier2_result.get("skipped") else "complete"
+            self._publish(dict(anomaly_data))
+
+        audio_chunk = self.audio_stream.get_chunk() if self.audio_stream and self.audio_stream.running else None
+        self.tier2_queue.submit(episode.frames(), audio_chunk, anomaly_data["tier1_result"], on_complete, stream_id=self.name)
+
+    def stop(self):
+        self.running = False
+        self.frame_buffer.close()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads.clear()
+        if self.capture is not None:
+            self.capture.release()
+        # Close the open episode so it still gets its Tier 2 analysis (flush never emits "opened")
+        flushed = self.episode_tracker.flush()
+        if flushed:
+            self._record_episodes(flushed, None, None, None, None)
+        if self.transcriber:
+            self.transcriber.stop()
+        if self.audio_stream and self.audio_stream.running:
+            self.audio_stream.stop()
+        if self.clip_recorder:
+            self.clip_recorder.release()
+        pose_tracker_pool.release(self.pose_stream_id)
+        with self._lock:
+            for channel in self.subscribers:
+                channel.close()
+            self.subscribers.clear()
+        print(f"📡 Stream '{self.name}' stopped")
+
+    def analysis_fps(self):
+        """Full Tier 1 runs per second of wall time since the stream started"""
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return self.stats["tier1_runs"] / elapsed if elapsed > 0 else 0.0
+
+    def get_stats(self):
+        with self._lock:
+            runs = self.stats["tier1_runs"]
+            stats = {
+                "name": self.name,
+                "source": self.source,
+                "kind": self.kind,
+                "audio": self.audio_mode,
+                "running": self.running,
+                "fps": self.fps,
+                "subscribers": len(self.subscribers),
+                "tier1_runs": runs,
+                "avg_tier1_ms": round(self.stats["tier1_ms"] / runs, 1) if runs else 0.0,
+                "anomalies": self.stats["anomalies"]
+            }
+        stats.update({
+            "analysis_fps": round(self.analysis_fps(), 2),
+            "frame_buffer": self.frame_buffer.get_stats(),
+            "analysis_rate": self.adaptive_sampler.get_stats() if self.adaptive_sampler else None,
+            "motion_gate": self.motion_gate.get_stats() if self.motion_gate else None,
+            "transcriber": self.transcriber.get_stats() if self.transcriber else None,
+            "event_clips": self.clip_recorder.get_stats() if self.clip_recorder else None,
+            "episodes": self.episode_tracker.get_stats()
+        })
+        return stats
+
+
+class StreamManager:
+    """
+    Runs many named live streams in one process. Streams share the loaded models (model
+    registry, idle pose landmarkers), one fair Tier 1 scheduler and one Tier 2 stage.
+    """
+
+    def __init__(self, max_streams=STREAM_MAX_STREAMS, tier1_slots=STREAM_TIER1_SLOTS):
+        self.max_streams = max_streams
+        self.scheduler = FairScheduler(tier1_slots)
+        self.streams: Dict[str, LiveStream] = {}
+        self.tier2_queue: Optional[Tier2WorkQueue] = None
+        self.lock = Lock()
+
+    def add_stream(self, name, source, tier2=True, **options) -> LiveStream:
+        """Create and start a stream; options are passed to LiveStream (audio, target_fps, motion_gate, clips)"""
+        with self.lock:
+            if name in self.streams:
+                raise ValueError(f"Stream '{name}' already exists")
+            if len(self.streams) >= self.max_streams:
+                raise RuntimeError(f"Stream limit reached ({self.max_streams})")
+            if tier2 and self.tier2_queue is None:
+                self.tier2_queue = Tier2WorkQueue(name="StreamTier2").start()
+            stream = LiveStream(name, source, self.scheduler, self.tier2_queue if tier2 else None, **options)
+            self.streams[name] = stream
+        try:
+            return stream.start()
+        except Exception:
+            with self.lock:
+                self.streams.pop(name, None)
+            stream.stop()
+            raise
+
+    def get(self, name) -> Optional[LiveStream]:
+        with self.lock:
+            return self.streams.get(name)
+
+    def remove_stream(self, name) -> bool:
+        with self.lock:
+            stream = self.streams.pop(name, None)
+        if stream is None:
+            return False
+        stream.stop()
+        return True
+
+    def stop_all(self):
+        with self.lock:
+            names = list(self.streams)
+        for name in names:
+            self.remove_stream(name)
+        with self.lock:
+            if self.tier2_queue:
+                self.tier2_queue.stop()
+                self.tier2_queue = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            streams = list(self.streams.values())
+        return {
+            "streams": {stream.name: stream.get_stats() for stream in streams},
+            "count": len(streams),
+            "max_streams": self.max_streams,
+            "aggregate_analysis_fps": round(sum(stream.analysis_fps() for stream in streams), 2),
+            "scheduler": self.scheduler.get_stats(),
+            "tier2_queue": self.tier2_queue.get_stats() if self.tier2_queue else None
+        }
+
+
+# Global stream manager instance
+stream_manager = StreamManager()
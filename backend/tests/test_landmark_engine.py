@@ -0,0 +1,192 @@
+"""
+Pins the vectorized LandmarkEngine decisions (fall/crawl and aggressive movement) to the original
+per-landmark rules: detect_aggressive_movements before vectorization and the list-comprehension
+bounding-box ratio, on fixed landmark fixtures and a seeded synthetic sequence.
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.landmark_engine import (
+    FALL_RATIO_BATCH, FALL_RATIO_STREAMING, LandmarkEngine, compute_features, is_aggressive, is_fall,
+    landmarks_to_array
+)
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def reference_aggressive(landmarks, previous_landmarks):
+    """Original detect_aggressive_movements logic (debug prints removed)"""
+    def point(lms, i):
+        return (lms[i].x, lms[i].y)
+
+    def dist(a, b):
+        return np.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+    left_wrist_speed = dist(point(landmarks, 15), point(previous_landmarks, 15))
+    right_wrist_speed = dist(point(landmarks, 16), point(previous_landmarks, 16))
+    head_movement = dist(point(landmarks, 0), point(previous_landmarks, 0))
+    torso_change = abs(dist(point(landmarks, 11), point(landmarks, 23)) -
+                       dist(point(previous_landmarks, 11), point(previous_landmarks, 23)))
+
+    if left_wrist_speed > 0.15 or right_wrist_speed > 0.15:
+        return True
+    if head_movement > 0.08:
+        return True
+    if torso_change > 0.05:
+        return True
+
+    ls, rs, lw, rw = (point(landmarks, i) for i in (11, 12, 15, 16))
+    left_arm_extended = lw[0] < ls[0] - 0.2 or lw[0] > ls[0] + 0.2
+    right_arm_extended = rw[0] < rs[0] - 0.2 or rw[0] > rs[0] + 0.2
+    if left_arm_extended or right_arm_extended:
+        if lw[1] < ls[1] - 0.1 or rw[1] < rs[1] - 0.1:
+            return True
+    return False
+
+
+def reference_ratio(landmarks, width, height):
+    """Original list-comprehension bounding-box ratio"""
+    xs = [lm.x * width for lm in landmarks]
+    ys = [lm.y * height for lm in landmarks]
+    return (max(ys) - min(ys)) / (max(xs) - min(xs) + 1e-6)
+
+
+def to_landmarks(pose):
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in pose]
+
+
+def standing_pose():
+    """Upright person centred in the frame: arms down, tall narrow bounding box"""
+    pose = np.zeros((33, 3), dtype=np.float32)
+    pose[:, 0] = 0.5
+    pose[:, 1] = np.linspace(0.1, 0.9, 33)
+    pose[0] = (0.5, 0.1, 0.0)     # nose
+    pose[11] = (0.45, 0.25, 0.0)  # left shoulder
+    pose[12] = (0.55, 0.25, 0.0)  # right shoulder
+    pose[15] = (0.43, 0.5, 0.0)   # left wrist
+    pose[16] = (0.57, 0.5, 0.0)   # right wrist
+    pose[23] = (0.47, 0.55, 0.0)  # left hip
+    pose[24] = (0.53, 0.55, 0.0)  # right hip
+    return pose
+
+
+def boxed_pose(box_width, box_height):
+    """Standing pose rescaled into a box of the given normalized size around the frame centre"""
+    pose = standing_pose()
+    for axis, size in ((0, box_width), (1, box_height)):
+        low, high = pose[:, axis].min(), pose[:, axis].max()
+        pose[:, axis] = 0.5 - size / 2 + (pose[:, axis] - low) / (high - low) * size
+    return pose
+
+
+def moved(pose, **offsets):
+    """Copy of pose with landmarks shifted, e.g. moved(pose, i15=(0.2, 0.0))"""
+    pose = pose.copy()
+    for name, (dx, dy) in offsets.items():
+        pose[int(name[1:]), :2] += (dx, dy)
+    return pose
+
+
+def synthetic_sequence(rng, count):
+    """Random walk of poses with occasional jumps, falls and raised arms"""
+    pose = rng.uniform(0.3, 0.7, (33, 3)).astype(np.float32)
+    poses = []
+    for _ in range(count):
+        pose = pose + rng.normal(0, 0.03, pose.shape).astype(np.float32)
+        if rng.random() < 0.1:
+            pose[rng.integers(0, 33)] += rng.normal(0, 0.2, 3).astype(np.float32)
+        if rng.random() < 0.05:
+            pose[:, 1] = 0.5 + (pose[:, 1] - 0.5) * 0.2  # flatten: lying down
+        pose = np.clip(pose, 0.0, 1.0)
+        poses.append(to_landmarks(pose))
+    return poses
+
+
+FALL_CASES = [
+    # name, (box width, box height), expected (streaming fall, batch fall)
+    ("standing", (0.14, 0.8), (False, False)),
+    ("lying", (0.8, 0.14), (True, True)),
+    ("crawling", (0.5, 0.4), (False, True)),  # ratio 0.45: only the batch threshold calls it a fall
+    ("crouched", (0.3, 0.5), (False, False)),
+]
+
+
+@pytest.mark.parametrize("name, box, expected", FALL_CASES, ids=[case[0] for case in FALL_CASES])
+def test_fall_matches_bbox_rule(name, box, expected):
+    landmarks = to_landmarks(boxed_pose(*box))
+    ratio = reference_ratio(landmarks, WIDTH, HEIGHT)
+    assert (ratio < FALL_RATIO_STREAMING, ratio < FALL_RATIO_BATCH) == expected
+
+    features = LandmarkEngine().push(landmarks_to_array(landmarks), WIDTH, HEIGHT)
+    assert features["bbox_ratio"] == pytest.approx(ratio, rel=1e-4)
+    assert (bool(is_fall(features)), bool(is_fall(features, FALL_RATIO_BATCH))) == expected
+
+
+MOVEMENT_CASES = [
+    # name, current pose built from the standing pose, expected aggressive decision
+    ("still", standing_pose(), False),
+    ("jitter", moved(standing_pose(), i0=(0.01, 0.01), i15=(0.02, 0.0), i16=(0.0, 0.02)), False),
+    ("punch_left", moved(standing_pose(), i15=(-0.2, 0.0)), True),
+    ("punch_right", moved(standing_pose(), i16=(0.0, -0.18)), True),
+    ("head_drop", moved(standing_pose(), i0=(0.0, 0.1)), True),
+    ("bending", moved(standing_pose(), i11=(0.0, 0.08)), True),
+    ("extended_not_raised", moved(standing_pose(), i15=(-0.14, 0.0)), False),
+]
+
+
+@pytest.mark.parametrize("name, current, expected", MOVEMENT_CASES, ids=[case[0] for case in MOVEMENT_CASES])
+def test_aggressive_matches_reference(name, current, expected):
+    previous = to_landmarks(standing_pose())
+    landmarks = to_landmarks(current)
+    assert reference_aggressive(landmarks, previous) == expected
+
+    engine = LandmarkEngine()
+    first = engine.push(landmarks_to_array(previous), WIDTH, HEIGHT)
+    assert not is_aggressive(first)  # No previous pose: movement tests never fire
+    features = engine.push(landmarks_to_array(landmarks), WIDTH, HEIGHT)
+    assert bool(is_aggressive(features)) == expected
+
+
+def test_raised_extended_arm_without_speed():
+    # Reached over several frames so no single step is fast: only the raised-arm rule fires
+    previous = moved(standing_pose(), i15=(-0.25, -0.4))
+    current = moved(previous, i15=(-0.01, 0.0))
+    assert reference_aggressive(to_landmarks(current), to_landmarks(previous))
+
+    features = compute_features(current, previous, WIDTH, HEIGHT)
+    assert features["arm_extended"] and features["arm_raised"]
+    assert bool(is_aggressive(features))
+
+
+def test_synthetic_sequence_matches_reference():
+    sequence = synthetic_sequence(np.random.default_rng(0), 500)
+    engine = LandmarkEngine()
+    fired = 0
+    for i, landmarks in enumerate(sequence):
+        features = engine.push(landmarks_to_array(landmarks), WIDTH, HEIGHT)
+
+        ratio = reference_ratio(landmarks, WIDTH, HEIGHT)
+        assert (bool(is_fall(features)), bool(is_fall(features, FALL_RATIO_BATCH))) == \
+            (ratio < FALL_RATIO_STREAMING, ratio < FALL_RATIO_BATCH), f"fall mismatch at pose {i}"
+        expected_move = bool(i and reference_aggressive(landmarks, sequence[i - 1]))
+        assert bool(is_aggressive(features)) == expected_move, f"movement mismatch at pose {i}"
+        fired += expected_move
+    assert fired > 0
+
+
+def test_batched_features_match_streaming():
+    sequence = synthetic_sequence(np.random.default_rng(1), 50)
+    stack = np.stack([landmarks_to_array(landmarks) for landmarks in sequence])
+    batched = compute_features(stack[1:], stack[:-1], WIDTH, HEIGHT)
+
+    engine = LandmarkEngine()
+    engine.push(stack[0], WIDTH, HEIGHT)
+    streamed = np.stack([engine.push(pose, WIDTH, HEIGHT) for pose in stack[1:]])
+    np.testing.assert_array_equal(is_aggressive(batched), is_aggressive(streamed))
+    np.testing.assert_array_equal(is_fall(batched, FALL_RATIO_BATCH), is_fall(streamed, FALL_RATIO_BATCH))
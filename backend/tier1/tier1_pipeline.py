@@ -1,10 +1,19 @@
-from utils.audio_processing import chunk_and_transcribe_tiny, extract_audio
-from utils.pose_processing import process_pose_frame, process_pose
-from utils.scene_processing import process_scene_frame, process_scene_tier1
-from utils.fusion_logic import tier1_fusion
+from utils.audio_processing import chunk_and_transcribe_tiny, load_audio_samples, transcribe_voiced_windows
+from utils.frame_sampler import FrameSampler
+from utils.landmark_engine import FALL_RATIO_BATCH, is_fall
+from utils.pose_processing import process_pose_frame, pose_tracker_pool
+from utils.scene_processing import process_scene_frame, process_scene_frames, process_scene_tier1_frames
+from utils.fusion_logic import tier1_fusion, fuse_tier1, fuse_tier1_batch
+from utils.tier1_signals import Tier1Signals
+import os
+import time
 import cv2
 import numpy as np
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of sampled frames scored per CLIP forward pass in upload/batch modes
+TIER1_BATCH_SIZE = max(1, int(os.getenv("TIER1_BATCH_SIZE", "8")))
 
 # Global variables for smoothing/easing
 _anomaly_history = deque(maxlen=5)  # Keep last 5 results for smoothing
@@ -16,80 +25,154 @@ def smooth_anomaly_detection(current_status, current_scene_prob, current_pose_an
     # Just pass through the original decision - no complex smoothing
     return current_status
 
-def run_tier1_continuous(frame, audio_chunk_path):
+def _transcribe_audio_chunk(audio_chunk, audio_transcript=None):
+    """
+    Return (transcripts, audio_status) for an optional audio chunk. A ready transcript from the
+    streaming transcriber is used as-is, without running Whisper again.
+    """
+    audio_transcripts = []
+    try:
+        if audio_transcript is not None:
+            audio_transcripts = [audio_transcript] if audio_transcript else []
+        elif audio_chunk is not None:
+            audio_transcripts = chunk_and_transcribe_tiny(audio_chunk) or []
+        else:
+            return [], "unavailable"
+    except Exception as e:
+        return [], "failed"
+    return audio_transcripts, "ok" if audio_transcripts else "none"
+
+def _smooth(result):
+    """Apply smoothing to a fused Tier1Result, keeping the fused status as its initial status"""
+    smoothed_status = smooth_anomaly_detection(result.status, result.signals.scene_prob, result.signals.pose_anomaly)
+    if smoothed_status != result.status:
+        result.initial_status, result.status = result.status, smoothed_status
+    return result
+
+def run_tier1_continuous(frame, audio_chunk, audio_transcript=None, pose_tracker=None, timestamp_ms=None):
     try:
-        # Pose processing
-        pose_anomaly = process_pose_frame(frame)
-        pose_summary = f"Pose anomaly detected: {bool(pose_anomaly)}"
+        start = time.perf_counter()
+        
+        # Pose processing (per-stream tracker; the default stream's if none is given)
+        pose_tracker = pose_tracker or pose_tracker_pool.acquire()
+        pose_anomaly = process_pose_frame(frame, pose_tracker, timestamp_ms)
+        pose_model = pose_tracker.last_model
 
         # Audio processing
-        audio_transcripts = []
-        try:
-            if audio_chunk_path:
-                transcripts = chunk_and_transcribe_tiny(audio_chunk_path)
-                audio_transcripts = transcripts if transcripts else []
-                audio_summary = "Audio transcripts: " + " | ".join(transcripts) if transcripts else "No audio."
-            else:
-                audio_summary = "No audio available."
-        except Exception as e:
-            audio_summary = "Audio processing failed."
+        audio_transcripts, audio_status = _transcribe_audio_chunk(audio_chunk, audio_transcript)
+        audio_available = audio_chunk is not None or audio_transcript is not None
 
         # Scene processing
         anomaly_prob = process_scene_frame(frame)
-        scene_summary = f"Scene anomaly probability: {anomaly_prob:.2f}"
 
-        # Tier 1 fusion
-        initial_status, fusion_details = tier1_fusion(pose_summary, audio_summary, scene_summary)
+        # Numeric fusion; the strings for display are generated once, by to_dict
+        signals = Tier1Signals(pose_anomaly, anomaly_prob, audio_transcripts, audio_available, audio_status, pose_model)
+        result = _smooth(fuse_tier1(signals))
         
-        # Apply smoothing
-        smoothed_status = smooth_anomaly_detection(initial_status, anomaly_prob, pose_anomaly)
+        # Latency and outcome drive the stream's pose model choice for the next frames
+        pose_tracker.record_tier1((time.perf_counter() - start) * 1000, result.suspected)
+        return result.to_dict()
         
-        # Add smoothing info if status changed
-        if smoothed_status != initial_status:
-            fusion_details += f" [Smoothed from {initial_status} to {smoothed_status}]"
+    except Exception as e:
+        print(f"Error in run_tier1_continuous: {e}")
+        import traceback
+        print(f"Traceback: {traceback.format_exc()}")
+        raise e
+
+def run_tier1_batch(frames, audio_chunks=None, pose_tracker=None, timestamps_ms=None):
+    """
+    Batched run_tier1_continuous for offline video: pose runs frame by frame on the stream's
+    tracker (it tracks motion between frames), scene scoring runs one CLIP forward pass over
+    all frames. Returns one Tier 1 result per frame, in input order.
+    """
+    if not frames:
+        return []
+    if audio_chunks is None:
+        audio_chunks = [None] * len(frames)
+    if timestamps_ms is None:
+        timestamps_ms = [None] * len(frames)
+    try:
+        start = time.perf_counter()
+        pose_tracker = pose_tracker or pose_tracker_pool.acquire()
+        pose_anomalies = []
+        pose_models = []
+        for frame, timestamp_ms in zip(frames, timestamps_ms):
+            pose_anomalies.append(process_pose_frame(frame, pose_tracker, timestamp_ms))
+            pose_models.append(pose_tracker.last_model)
+        audio_results = [_transcribe_audio_chunk(audio_chunk) for audio_chunk in audio_chunks]
+        anomaly_probs = process_scene_frames(frames)
+
+        # One vectorized fusion over the whole batch
+        signals_list = [
+            Tier1Signals(pose_anomaly, anomaly_prob, audio_transcripts, audio_chunk is not None, audio_status, pose_model)
+            for pose_anomaly, audio_chunk, (audio_transcripts, audio_status), anomaly_prob, pose_model
+            in zip(pose_anomalies, audio_chunks, audio_results, anomaly_probs, pose_models)
+        ]
+        results = [_smooth(result) for result in fuse_tier1_batch(signals_list)]
         
-        # Return enhanced JSON with component details
-        # Construct enhanced response with detailed components
-        return {
-            "status": smoothed_status,
-            "details": fusion_details,
-            "tier1_components": {
-                "pose_analysis": {
-                    "anomaly_detected": bool(pose_anomaly),
-                    "summary": pose_summary
-                },
-                "audio_analysis": {
-                    "transcripts": audio_transcripts,
-                    "available": bool(audio_chunk_path),
-                    "summary": audio_summary,
-                    "transcript_text": " | ".join(audio_transcripts) if audio_transcripts else ""
-                },
-                "scene_analysis": {
-                    "anomaly_probability": anomaly_prob,
-                    "summary": scene_summary
-                },
-                "fusion_logic": {
-                    "initial_status": initial_status,
-                    "final_status": smoothed_status,
-                    "smoothing_applied": smoothed_status != initial_status
-                }
-            }
-        }
+        # Per-frame share of the batch latency drives the pose model choice for the next batch
+        suspected = any(result.suspected for result in results)
+        pose_tracker.record_tier1((time.perf_counter() - start) * 1000 / len(frames), suspected)
+        return [result.to_dict() for result in results]
         
     except Exception as e:
-        print(f"Error in run_tier1_continuous: {e}")
+        print(f"Error in run_tier1_batch: {e}")
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
         raise e
 
 def run_tier1(video_path):
-    # Keep original batch function
-    audio_path = extract_audio(video_path)
-    transcripts = chunk_and_transcribe_tiny(audio_path)
-    num_anomalies, total_frames, _, _ = process_pose(video_path)
+    """
+    Single-pass batch Tier 1: the video is decoded once and every sampled frame fans out to
+    pose (pooled landmarker) and batched CLIP scene scoring, while the audio track is demuxed
+    by ffmpeg on a parallel thread. Same sampling (one frame per second) and summaries as the
+    original three-pass version (moviepy audio, process_pose, process_scene_tier1).
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="Tier1Batch") as executor:
+        # Audio demux runs while frames decode; scene batches run while pose moves on
+        audio_future = executor.submit(load_audio_samples, video_path)
+        scene_futures = deque()
+        anomaly_probs = []
+
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_interval = int(fps) if fps > 0 else 1
+        stream_id = f"tier1:{video_path}"
+        tracker = pose_tracker_pool.acquire(stream_id)
+        num_anomalies = 0
+        total_frames = 0
+        pending_frames = []
+
+        try:
+            for frame_count, _, frame in FrameSampler(cap, stride=frame_interval):
+                timestamp_ms = int(1000 * frame_count / fps) if fps > 0 else frame_count
+                features = tracker.detect(frame, timestamp_ms)
+                if features is not None and is_fall(features, FALL_RATIO_BATCH):
+                    num_anomalies += 1
+                total_frames += 1
+
+                pending_frames.append(frame)
+                if len(pending_frames) >= TIER1_BATCH_SIZE:
+                    # Keep at most two scene batches in flight so decoded frames don't pile up
+                    if len(scene_futures) >= 2:
+                        anomaly_probs.extend(scene_futures.popleft().result())
+                    scene_futures.append(executor.submit(process_scene_tier1_frames, pending_frames))
+                    pending_frames = []
+
+            if pending_frames:
+                scene_futures.append(executor.submit(process_scene_tier1_frames, pending_frames))
+        finally:
+            pose_tracker_pool.release(stream_id)
+            cap.release()
+
+        for future in scene_futures:
+            anomaly_probs.extend(future.result())
+        audio_samples = audio_future.result()
+
+    transcripts = transcribe_voiced_windows(audio_samples)
     pose_summary = f"Pose anomalies (fall/crawl) detected in {num_anomalies} out of {total_frames} frames."
     audio_summary = "Audio transcripts: " + " | ".join(transcripts) if transcripts else "No audio."
-    max_anomaly_prob = process_scene_tier1(video_path)
+    max_anomaly_prob = max(anomaly_probs) if anomaly_probs else 0.0
     scene_summary = f"Highest scene anomaly probability: {max_anomaly_prob:.2f}"
     status, details = tier1_fusion(pose_summary, audio_summary, scene_summary)
-    return {"status": status, "details": details}
\ No newline at end of file
+    return {"status": status, "details": details}
@@ -1,122 +1,150 @@
+from concurrent.futures import Future
 from utils.audio_processing import transcribe_large
-from utils.scene_processing import process_scene_tier2_frame
-from utils.fusion_logic import tier2_fusion
+from utils.scene_processing import process_scene_tier2_frame, process_scene_tier2_frames
+from utils.fusion_logic import submit_tier2_fusion
 from utils.pose_processing import process_pose_frame
+from utils.tier1_signals import Tier1Signals
 
-def run_tier2_continuous(frame, audio_chunk_path, tier1_result):
+def _tier2_transcript(audio_chunk, tier1_signals):
+    full_transcript = ""
     try:
-        # Extract audio transcript from Tier 1 result instead of re-processing
-        full_transcript = ""
-        try:
-            # First try to get from tier1_components (structured data)
-            if tier1_result.get("tier1_components"):
-                audio_comp = tier1_result["tier1_components"].get("audio_analysis", {})
-                full_transcript = audio_comp.get("transcript_text", "")
-                
-            # If no structured data, extract from details string
-            if not full_transcript:
-                tier1_details = tier1_result.get("details", "")
-                if "Audio transcripts:" in tier1_details:
-                    # Extract the audio part
-                    audio_part = tier1_details.split("Audio transcripts:")[1]
-                    if "|" in audio_part:
-                        # Take everything between "Audio transcripts:" and next section
-                        next_section = audio_part.find("Scene anomaly")
-                        if next_section != -1:
-                            audio_part = audio_part[:next_section]
-                    full_transcript = audio_part.strip()
-                
-            # If still no transcript and we have audio chunk, try direct processing as fallback
-            if not full_transcript and audio_chunk_path:
-                full_transcript = transcribe_large(audio_chunk_path)
-                
-        except Exception as e:
-            print(f"Tier 2 audio processing error: {e}")
-            full_transcript = ""
+        # Tier 1 already transcribed this frame's audio
+        full_transcript = tier1_signals.transcript_text
+            
+        # If no transcript and we have audio chunk, try direct processing as fallback
+        if not full_transcript and audio_chunk is not None:
+            full_transcript = transcribe_large(audio_chunk)
             
-        # Debug: Print what we found for audio transcript
-        print(f"🎤 Tier 2 Audio Debug: transcript='{full_transcript}', chunk_available={bool(audio_chunk_path)}")
+    except Exception as e:
+        print(f"Tier 2 audio processing error: {e}")
+        full_transcript = ""
+    return full_transcript
 
-        # Visual processing with advanced scene analysis
-        captions = ["Scene analysis failed"]
-        visual_anomaly_max = 0.3
-        try:
+def gather_tier2_evidence(frame, audio_chunk, tier1_result):
+    """
+    Model-side Tier 2 work (transcript, BLIP captions, CLIP-L score) that precedes the LLM call.
+    frame may be a list of an episode's key frames, scored in one batched pass.
+    """
+    tier1_signals = Tier1Signals.from_result(tier1_result)
+    full_transcript = _tier2_transcript(audio_chunk, tier1_signals)
+        
+    # Debug: Print what we found for audio transcript
+    print(f"🎤 Tier 2 Audio Debug: transcript='{full_transcript}', chunk_available={audio_chunk is not None}")
+
+    # Visual processing with advanced scene analysis
+    captions = ["Scene analysis failed"]
+    visual_anomaly_max = 0.3
+    try:
+        if isinstance(frame, list):
+            captions, visual_anomaly_max = process_scene_tier2_frames(frame)
+        else:
             captions, visual_anomaly_max = process_scene_tier2_frame(frame)
-        except Exception as e:
-            print(f"Tier 2 visual processing error: {e}")
+    except Exception as e:
+        print(f"Tier 2 visual processing error: {e}")
 
-        # Tier 2 fusion with AI reasoning
-        timestamps = [0.0]
-        try:
-            fusion_result = tier2_fusion(full_transcript, captions, visual_anomaly_max, tier1_result["details"])
-            fusion_result["frame_id"] = "A0F"
-            fusion_result["timestamps"] = timestamps
-            
-            # Add component breakdown to result
-            fusion_result["tier2_components"] = {
-                "audio_analysis": {
-                    "full_transcript": full_transcript,
-                    "available": bool(audio_chunk_path),
-                    "length": len(full_transcript) if full_transcript else 0
-                },
-                "visual_analysis": {
-                    "captions": captions,
-                    "visual_anomaly_score": visual_anomaly_max,
-                    "description": " | ".join(captions) if captions else "No description"
-                },
-                "ai_reasoning": {
-                    "visual_score": fusion_result.get("visual_score", 0),
-                    "audio_score": fusion_result.get("audio_score", 0),
-                    "text_alignment_score": fusion_result.get("text_alignment_score", 0),
-                    "multimodal_agreement": fusion_result.get("multimodal_agreement", 0),
-                    "threat_severity": fusion_result.get("threat_severity_index", 0),
-                    "reasoning": fusion_result.get("reasoning_summary", "No reasoning available")
-                }
-            }
-            
-            return fusion_result
-            
-        except Exception as e:
-            print(f"Tier 2 fusion error: {e}")
-            # Return fallback with component details
-            return {
-                "visual_score": 0.4,
-                "audio_score": 0.4,
-                "text_alignment_score": 0.4,
-                "multimodal_agreement": 0.4,
-                "reasoning_summary": f"Tier 2 analysis error: {str(e)}",
-                "threat_severity_index": 0.4,
-                "frame_id": "A0F",
-                "timestamps": timestamps,
-                "tier2_components": {
-                    "audio_analysis": {
-                        "full_transcript": full_transcript,
-                        "available": bool(audio_chunk_path),
-                        "length": len(full_transcript) if full_transcript else 0
-                    },
-                    "visual_analysis": {
-                        "captions": captions,
-                        "visual_anomaly_score": visual_anomaly_max,
-                        "description": " | ".join(captions) if captions else "No description"
-                    },
-                    "ai_reasoning": {
-                        "error": str(e)
-                    }
-                }
+    return {
+        "full_transcript": full_transcript,
+        "audio_available": audio_chunk is not None,
+        "captions": captions,
+        "visual_anomaly_max": visual_anomaly_max,
+        "tier1_details": tier1_result["details"],
+        "tier1_signals": tier1_signals
+    }
+
+def _tier2_inputs(evidence):
+    full_transcript = evidence["full_transcript"]
+    captions = evidence["captions"]
+    return {
+        "audio_analysis": {
+            "full_transcript": full_transcript,
+            "available": evidence["audio_available"],
+            "length": len(full_transcript) if full_transcript else 0
+        },
+        "visual_analysis": {
+            "captions": captions,
+            "visual_anomaly_score": evidence["visual_anomaly_max"],
+            "description": " | ".join(captions) if captions else "No description"
+        }
+    }
+
+def _tier2_result(fusion_result, evidence):
+    fusion_result["frame_id"] = "A0F"
+    fusion_result["timestamps"] = [0.0]
+    
+    # Add component breakdown to result
+    fusion_result["tier2_components"] = {
+        **_tier2_inputs(evidence),
+        "ai_reasoning": {
+            "visual_score": fusion_result.get("visual_score", 0),
+            "audio_score": fusion_result.get("audio_score", 0),
+            "text_alignment_score": fusion_result.get("text_alignment_score", 0),
+            "multimodal_agreement": fusion_result.get("multimodal_agreement", 0),
+            "threat_severity": fusion_result.get("threat_severity_index", 0),
+            "reasoning": fusion_result.get("reasoning_summary", "No reasoning available")
+        }
+    }
+    return fusion_result
+
+def _tier2_error_result(evidence, error):
+    print(f"Tier 2 fusion error: {error}")
+    # Return fallback with component details
+    return {
+        "visual_score": 0.4,
+        "audio_score": 0.4,
+        "text_alignment_score": 0.4,
+        "multimodal_agreement": 0.4,
+        "reasoning_summary": f"Tier 2 analysis error: {str(error)}",
+        "threat_severity_index": 0.4,
+        "frame_id": "A0F",
+        "timestamps": [0.0],
+        "tier2_components": {
+            **_tier2_inputs(evidence),
+            "ai_reasoning": {
+                "error": str(error)
             }
-            
+        }
+    }
+
+def _tier2_critical_result(error):
+    print(f"Critical error in run_tier2_continuous: {error}")
+    import traceback
+    print(f"Traceback: {''.join(traceback.format_exception(type(error), error, error.__traceback__))}")
+    # Return minimal safe response
+    return {
+        "visual_score": 0.3,
+        "audio_score": 0.3,
+        "text_alignment_score": 0.3,
+        "multimodal_agreement": 0.3,
+        "reasoning_summary": f"Critical Tier 2 error: {str(error)}",
+        "threat_severity_index": 0.3,
+        "frame_id": "ERR",
+        "timestamps": [0.0]
+    }
+
+def submit_tier2_continuous(frame, audio_chunk, tier1_result, stream_id=None):
+    """
+    Run the model side of Tier 2 now and hand the LLM call off; returns a Future resolving to
+    the Tier 2 result. The calling worker is free for the next job while the LLM answers.
+    """
+    result = Future()
+    try:
+        evidence = gather_tier2_evidence(frame, audio_chunk, tier1_result)
+        fusion_future = submit_tier2_fusion(
+            evidence["full_transcript"], evidence["captions"], evidence["visual_anomaly_max"],
+            evidence["tier1_details"], stream_id, tier1_signals=evidence["tier1_signals"]
+        )
     except Exception as e:
-        print(f"Critical error in run_tier2_continuous: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
-        # Return minimal safe response
-        return {
-            "visual_score": 0.3,
-            "audio_score": 0.3,
-            "text_alignment_score": 0.3,
-            "multimodal_agreement": 0.3,
-            "reasoning_summary": f"Critical Tier 2 error: {str(e)}",
-            "threat_severity_index": 0.3,
-            "frame_id": "ERR",
-            "timestamps": [0.0]
-        }
\ No newline at end of file
+        result.set_result(_tier2_critical_result(e))
+        return result
+
+    def on_fusion(future):
+        try:
+            result.set_result(_tier2_result(future.result(), evidence))
+        except Exception as e:
+            result.set_result(_tier2_error_result(evidence, e))
+
+    fusion_future.add_done_callback(on_fusion)
+    return result
+
+def run_tier2_continuous(frame, audio_chunk, tier1_result, stream_id=None):
+    return submit_tier2_continuous(frame, audio_chunk, tier1_result, stream_id).result()
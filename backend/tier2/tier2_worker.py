@@ -0,0 +1,191 @@
+import os
+import queue
+import time
+from threading import Thread, Lock, BoundedSemaphore
+from tier2.tier2_pipeline import submit_tier2_continuous
+
+# Tier 2 stage configuration
+TIER2_QUEUE_SIZE = int(os.getenv("TIER2_QUEUE_SIZE", "4"))
+TIER2_WORKERS = int(os.getenv("TIER2_WORKERS", "1"))
+TIER2_BACKPRESSURE = os.getenv("TIER2_BACKPRESSURE", "drop_oldest")
+TIER2_MAX_IN_FLIGHT = int(os.getenv("TIER2_MAX_IN_FLIGHT", "8"))  # LLM calls awaiting an answer per stage
+
+BACKPRESSURE_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+def tier2_skipped_result(reason):
+    """Placeholder Tier 2 result for jobs that were dropped under backpressure"""
+    return {
+        "visual_score": 0.0,
+        "audio_score": 0.0,
+        "text_alignment_score": 0.0,
+        "multimodal_agreement": 0.0,
+        "reasoning_summary": f"Tier 2 skipped: {reason}",
+        "threat_severity_index": 0.0,
+        "frame_id": "SKIP",
+        "timestamps": [0.0],
+        "skipped": True
+    }
+
+
+class Tier2WorkQueue:
+    """
+    Bounded Tier 2 stage that runs the model side of Tier 2 (BLIP, CLIP-L, Whisper) on its own
+    worker threads, so it never stalls the Tier 1 frame loop. The LLM call is handed to the
+    async LLM client and the worker moves on, so several calls of one stream can be coalesced;
+    at most max_in_flight calls wait for an answer before workers block.
+    Each job's on_complete(tier2_result) callback runs on a Tier 2 worker or LLM client thread.
+    """
+
+    def __init__(self, max_pending=TIER2_QUEUE_SIZE, workers=TIER2_WORKERS, policy=TIER2_BACKPRESSURE, name="Tier2",
+                 max_in_flight=TIER2_MAX_IN_FLIGHT):
+        if policy not in BACKPRESSURE_POLICIES:
+            print(f"⚠️ Unknown Tier 2 backpressure policy '{policy}', using drop_oldest")
+            policy = "drop_oldest"
+        self.policy = policy
+        self.name = name
+        self.num_workers = max(1, workers)
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._in_flight = BoundedSemaphore(max(1, max_in_flight))
+        self._threads = []
+        self._running = False
+        self._lock = Lock()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "total_latency": 0.0
+        }
+
+    def start(self):
+        self._running = True
+        for i in range(self.num_workers):
+            thread = Thread(target=self._worker, name=f"{self.name}Worker-{i}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        print(f"🧠 Tier 2 stage started: {self.num_workers} worker(s), queue size {self._queue.maxsize}, policy {self.policy}")
+        return self
+
+    def submit(self, frame, audio_chunk, tier1_result, on_complete, stream_id=None):
+        """
+        Queue a Tier 2 job; returns False if the job itself was dropped. frame may be a list of an
+        episode's key frames; stream_id enables LLM coalescing
+        """
+        job = (time.time(), frame, audio_chunk, tier1_result, on_complete, stream_id)
+        with self._lock:
+            self.stats["submitted"] += 1
+
+        if self.policy == "block":
+            self._queue.put(job)
+            return True
+
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == "drop_newest":
+            self._drop(job, "Tier 2 queue full")
+            return False
+
+        # drop_oldest: make room by discarding the stalest pending job
+        try:
+            oldest = self._queue.get_nowait()
+            self._queue.task_done()
+            self._drop(oldest, "superseded by newer anomaly")
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            self._drop(job, "Tier 2 queue full")
+            return False
+
+    def _drop(self, job, reason):
+        with self._lock:
+            self.stats["dropped"] += 1
+        print(f"⚠️ Tier 2 job dropped ({reason})")
+        self._complete(job[4], tier2_skipped_result(reason))
+
+    def _complete(self, on_complete, tier2_result):
+        try:
+            on_complete(tier2_result)
+        except Exception as e:
+            print(f"❌ Tier 2 completion callback error: {e}")
+
+    def _worker(self):
+        while self._running:
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            submitted_at, frame, audio_chunk, tier1_result, on_complete, stream_id = job
+            self._in_flight.acquire()
+            try:
+                future = submit_tier2_continuous(frame, audio_chunk, tier1_result, stream_id)
+            except Exception as e:
+                self._fail(on_complete, e)
+                continue
+            future.add_done_callback(lambda f, submitted_at=submitted_at, on_complete=on_complete:
+                                     self._finish(f, submitted_at, on_complete))
+
+    def _finish(self, future, submitted_at, on_complete):
+        try:
+            tier2_result = future.result()
+        except Exception as e:
+            self._fail(on_complete, e)
+            return
+        with self._lock:
+            self.stats["completed"] += 1
+            self.stats["total_latency"] += time.time() - submitted_at
+        self._in_flight.release()
+        self._complete(on_complete, tier2_result)
+        self._queue.task_done()
+
+    def _fail(self, on_complete, error):
+        with self._lock:
+            self.stats["failed"] += 1
+        print(f"❌ Tier 2 worker error: {error}")
+        self._in_flight.release()
+        self._complete(on_complete, tier2_skipped_result(f"error: {error}"))
+        self._queue.task_done()
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    def join(self, timeout=None):
+        """Wait until every queued job has completed; returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, drain=False, timeout=10.0):
+        """Stop the workers, optionally waiting for pending jobs first"""
+        if drain:
+            self.join(timeout)
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads.clear()
+
+    def get_stats(self):
+        with self._lock:
+            completed = self.stats["completed"]
+            return {
+                "submitted": self.stats["submitted"],
+                "completed": completed,
+                "dropped": self.stats["dropped"],
+                "failed": self.stats["failed"],
+                "pending": self.pending(),
+                "avg_latency": round(self.stats["total_latency"] / completed, 2) if completed else 0.0,
+                "policy": self.policy
+            }
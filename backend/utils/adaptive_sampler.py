@@ -0,0 +1,96 @@
+import os
+from collections import deque
+from threading import Lock
+
+# Analysis rate configuration (analysed frames per second of video)
+ANALYSIS_TARGET_FPS = float(os.getenv("ANALYSIS_TARGET_FPS", "3"))
+ANALYSIS_MIN_FPS = float(os.getenv("ANALYSIS_MIN_FPS", "0.5"))
+ANALYSIS_MAX_FPS = float(os.getenv("ANALYSIS_MAX_FPS", "10"))
+ANALYSIS_BOOST_SECONDS = float(os.getenv("ANALYSIS_BOOST_SECONDS", "3"))
+MOTION_SPIKE_SCORE = float(os.getenv("MOTION_SPIKE_SCORE", "0.1"))  # Motion gate score that boosts the rate
+
+
+def sampling_interval(fps, analysis_fps=ANALYSIS_TARGET_FPS):
+    """Source frames between two analysed frames for a given analysis rate"""
+    return max(1, int(round(fps / analysis_fps))) if fps > 0 else 1
+
+
+class AdaptiveSampler:
+    """
+    Analysis-rate scheduler shared by live and upload processing. Starts at the target
+    analysis FPS, backs off when smoothed Tier 1 latency means the loop cannot keep up with
+    real time, and raises the rate for a few seconds after a suspected anomaly or a motion
+    spike (never above what the measured latency can sustain).
+    """
+
+    def __init__(self, fps, target_fps=ANALYSIS_TARGET_FPS, min_fps=ANALYSIS_MIN_FPS,
+                 max_fps=ANALYSIS_MAX_FPS, boost_seconds=ANALYSIS_BOOST_SECONDS):
+        self.fps = fps if fps > 0 else 30
+        self.target_fps = target_fps
+        self.min_fps = min_fps
+        self.max_fps = min(max_fps, self.fps)
+        self.boost_seconds = boost_seconds
+        self.rate = min(target_fps, self.max_fps)
+        self.latency = None  # Smoothed seconds per analysed frame
+        self._boost_until = -1.0
+        self._last_sampled = None
+        self._recent = deque(maxlen=30)  # Stream timestamps of recently analysed frames
+        self._lock = Lock()
+        self.stats = {"analyzed": 0, "backoffs": 0, "boosts": 0}
+
+    @property
+    def interval(self):
+        """Current number of source frames between analysed frames"""
+        return sampling_interval(self.fps, self.rate)
+
+    def should_sample(self, frame_count):
+        """True if this source frame is due for analysis at the current rate"""
+        with self._lock:
+            if self._last_sampled is None or frame_count - self._last_sampled >= self.interval:
+                self._last_sampled = frame_count
+                return True
+            return False
+
+    def record(self, timestamp, latency_seconds, suspected=False, motion_score=0.0):
+        """Report one analysed frame (stream time, Tier 1 wall time, outcome) and adapt the rate"""
+        with self._lock:
+            self.stats["analyzed"] += 1
+            self._recent.append(timestamp)
+            self.latency = latency_seconds if self.latency is None else 0.7 * self.latency + 0.3 * latency_seconds
+            capacity = 1.0 / max(self.latency, 1e-3)  # Analysed frames per second the pipeline can sustain
+
+            if suspected or motion_score >= MOTION_SPIKE_SCORE:
+                if timestamp >= self._boost_until:
+                    self.stats["boosts"] += 1
+                self._boost_until = timestamp + self.boost_seconds
+
+            if timestamp < self._boost_until:
+                desired = self.max_fps
+            else:
+                desired = self.target_fps
+
+            # Keep a 10% margin so the loop does not fall behind real time
+            rate = max(self.min_fps, min(desired, self.max_fps, capacity * 0.9))
+            if rate < self.rate and rate < desired:
+                self.stats["backoffs"] += 1
+            self.rate = rate
+
+    def effective_fps(self):
+        """Analysed frames per second of stream time over the recent window"""
+        with self._lock:
+            if len(self._recent) < 2 or self._recent[-1] <= self._recent[0]:
+                return 0.0
+            return (len(self._recent) - 1) / (self._recent[-1] - self._recent[0])
+
+    def get_stats(self):
+        effective = self.effective_fps()
+        with self._lock:
+            return {
+                **self.stats,
+                "target_fps": self.target_fps,
+                "current_fps": round(self.rate, 2),
+                "effective_fps": round(effective, 2),
+                "interval": self.interval,
+                "boosted": bool(self._recent) and self._recent[-1] < self._boost_until,
+                "avg_latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None
+            }
@@ -5,21 +5,47 @@ from pydub import AudioSegment
 import pyaudio
 import wave
 import time
+import re
+import numpy as np
 from collections import deque
-from threading import Thread
-from tempfile import NamedTemporaryFile
+from datetime import datetime
+from threading import Thread, Condition, Lock
+from utils.model_registry import model_registry
+from utils.inference_runtime import inference_runtime
 
 # Suppress verbose logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 
-print("🎤 Loading OpenAI Whisper Speech Recognition...")
-print("   ├─ 📦 Loading Whisper Tiny model (fast)...")
-whisper_tiny = whisper.load_model("tiny")
-print("   │  ✅ Whisper Tiny loaded")
-print("   └─ 📦 Loading Whisper Large model (accurate)...")
-whisper_large = whisper.load_model("large")
-print("      ✅ Whisper Large loaded")
-print("🎤 Speech Recognition Ready!\n")
+# Set to a directory to also dump every live audio chunk as a WAV file (debugging only)
+AUDIO_DEBUG_DIR = os.getenv("AUDIO_DEBUG_DIR", "")
+
+# Streaming transcription: each hop of new audio is transcribed once, with a little
+# overlap from the previous hop so words cut at the boundary are not lost
+TRANSCRIBE_HOP_SECONDS = float(os.getenv("TRANSCRIBE_HOP_SECONDS", "1.5"))
+TRANSCRIBE_OVERLAP_SECONDS = float(os.getenv("TRANSCRIBE_OVERLAP_SECONDS", "0.5"))
+TRANSCRIPT_WINDOW_SECONDS = float(os.getenv("TRANSCRIPT_WINDOW_SECONDS", "6"))
+
+# Voice-activity gate in front of Whisper: only speech or loud-event windows are transcribed
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+VAD_BACKEND = os.getenv("VAD_BACKEND", "energy")  # energy | webrtc
+VAD_ENERGY_DB = float(os.getenv("VAD_ENERGY_DB", "-45"))  # frame RMS (dBFS) that may hold speech
+VAD_LOUD_DB = float(os.getenv("VAD_LOUD_DB", "-20"))  # frame RMS (dBFS) always forwarded (screams, crashes)
+VAD_MAX_ZCR = float(os.getenv("VAD_MAX_ZCR", "0.35"))  # higher zero-crossing rates are noise/hiss
+VAD_MIN_VOICED_RATIO = float(os.getenv("VAD_MIN_VOICED_RATIO", "0.1"))
+VAD_FRAME_MS = 30
+VAD_BATCH_WINDOW_SECONDS = float(os.getenv("VAD_BATCH_WINDOW_SECONDS", "2"))  # gate window for whole-file batch audio
+
+# Whisper models load on first use - Tier 2's large model is only paid for when Tier 2 fires
+model_registry.register(
+    "whisper_tiny",
+    lambda: whisper.load_model("tiny"),
+    description="Whisper tiny - Tier 1 speech recognition"
+)
+model_registry.register(
+    "whisper_large",
+    lambda: whisper.load_model("large"),
+    description="Whisper large - Tier 2 speech recognition"
+)
 
 class AudioStream:
     def __init__(self):
@@ -29,7 +55,10 @@ class AudioStream:
         self.channels = 1
         self.rate = 16000  # Whisper compatible
         self.stream = None
-        self.buffer = deque(maxlen=32)  # ~2 sec at 1024 chunk (32 chunks ~2 sec)
+        self.chunk_window = 32  # ~2 sec at 1024 chunk (32 chunks ~2 sec)
+        self.buffer = deque(maxlen=self.chunk_window * 5)  # ~10 sec history for the streaming transcriber
+        self.captured_chunks = 0  # Total chunks ever captured; index of the next chunk
+        self.new_audio = Condition()
         self.running = False
 
     def start(self):
@@ -45,47 +74,320 @@ class AudioStream:
         while self.running:
             try:
                 data = self.stream.read(self.chunk)
-                self.buffer.append(data)
+                # Convert once at capture time: int16 PCM -> float32 in [-1, 1], what Whisper expects
+                samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+                with self.new_audio:
+                    self.buffer.append(samples)
+                    self.captured_chunks += 1
+                    self.new_audio.notify_all()
             except Exception as e:
                 print(f"Audio capture error: {e}")
                 break
 
     def get_chunk(self):
-        if len(self.buffer) < self.buffer.maxlen:
-            return None
-        try:
-            # Concatenate buffer to audio bytes
-            audio_bytes = b''.join(self.buffer)
-            with NamedTemporaryFile(delete=False, suffix=".wav", prefix="audio_") as temp_audio:
-                temp_path = temp_audio.name
-            
-            # Write audio file with proper error handling
-            wf = wave.open(temp_path, 'wb')
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(self.p.get_sample_size(self.format))
-            wf.setframerate(self.rate)
-            wf.writeframes(audio_bytes)
-            wf.close()
-            
-            # Small delay to ensure file is fully written
-            time.sleep(0.01)
-            
-            # Verify file exists and has content before returning
-            if os.path.exists(temp_path) and os.path.getsize(temp_path) > 44:  # WAV header is 44 bytes
-                return temp_path
-            else:
-                print(f"Audio file creation failed: {temp_path}")
+        """Return the last ~2 s of audio as a float32 16 kHz mono array, or None until the buffer fills"""
+        with self.new_audio:
+            if len(self.buffer) < self.chunk_window:
                 return None
+            recent = list(self.buffer)[-self.chunk_window:]
+        try:
+            samples = np.concatenate(recent)
+            if AUDIO_DEBUG_DIR:
+                self._write_debug_wav(samples)
+            return samples
         except Exception as e:
             print(f"Audio processing error: {e}")
             return None
 
+    def _write_debug_wav(self, samples):
+        os.makedirs(AUDIO_DEBUG_DIR, exist_ok=True)
+        path = os.path.join(AUDIO_DEBUG_DIR, f"audio_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav")
+        wf = wave.open(path, 'wb')
+        wf.setnchannels(self.channels)
+        wf.setsampwidth(2)  # int16 PCM
+        wf.setframerate(self.rate)
+        wf.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+        wf.close()
+
+    def read_since(self, chunk_index, timeout=None):
+        """
+        Wait for audio captured after chunk_index and return (samples, next_index).
+        Chunks that already fell out of the history buffer are skipped.
+        """
+        with self.new_audio:
+            if self.captured_chunks <= chunk_index and self.running:
+                self.new_audio.wait(timeout)
+            available = min(self.captured_chunks - chunk_index, len(self.buffer))
+            if available <= 0:
+                return None, self.captured_chunks
+            recent = list(self.buffer)[-available:]
+            next_index = self.captured_chunks
+        return np.concatenate(recent), next_index
+
     def stop(self):
         self.running = False
+        with self.new_audio:
+            self.new_audio.notify_all()
         self.stream.stop_stream()
         self.stream.close()
         self.p.terminate()
 
+class FileAudioStream(AudioStream):
+    """
+    AudioStream stand-in that plays a media file's audio track in real time, looping at the
+    end, so a file served as a fake camera has matching audio for the streaming transcriber.
+    """
+
+    def __init__(self, media_path, loop=True):
+        self.media_path = media_path
+        self.loop = loop
+        self.chunk = 1024
+        self.channels = 1
+        self.rate = 16000
+        self.chunk_window = 32
+        self.buffer = deque(maxlen=self.chunk_window * 5)
+        self.captured_chunks = 0
+        self.new_audio = Condition()
+        self.running = False
+        self.samples = None
+
+    def start(self):
+        self.samples = load_audio_samples(self.media_path)
+        if self.samples is None or self.samples.size < self.chunk:
+            return
+        self.running = True
+        Thread(target=self._capture, name="FileAudioStream", daemon=True).start()
+
+    def _capture(self):
+        position = 0
+        chunk_seconds = self.chunk / self.rate
+        next_time = time.perf_counter()
+        while self.running:
+            if position + self.chunk > self.samples.size:
+                if not self.loop:
+                    break
+                position = 0
+            samples = self.samples[position:position + self.chunk]
+            position += self.chunk
+            with self.new_audio:
+                self.buffer.append(samples)
+                self.captured_chunks += 1
+                self.new_audio.notify_all()
+            # Pace playback like a microphone would deliver it
+            next_time += chunk_seconds
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.perf_counter()
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        with self.new_audio:
+            self.new_audio.notify_all()
+
+def _normalize_words(text):
+    return [re.sub(r"[^\w']", "", word.lower()) for word in text.split()]
+
+def merge_overlapping_text(previous_words, new_text, max_overlap=12):
+    """
+    Return the words of new_text that are not already at the end of previous_words.
+    Consecutive windows share TRANSCRIBE_OVERLAP_SECONDS of audio, so the head of a new
+    segment usually repeats the tail of the last one; the longest matching run is removed.
+    """
+    new_words = new_text.split()
+    if not previous_words or not new_words:
+        return new_words
+    previous_norm = _normalize_words(" ".join(previous_words[-max_overlap:]))
+    new_norm = _normalize_words(new_text)
+    for size in range(min(len(previous_norm), len(new_norm), max_overlap), 0, -1):
+        if previous_norm[-size:] == new_norm[:size]:
+            return new_words[size:]
+    return new_words
+
+class StreamingTranscriber:
+    """
+    Incremental Whisper tiny transcription of an AudioStream. A background thread transcribes
+    each new hop of audio exactly once and stitches segments into a rolling transcript that
+    Tier 1 and Tier 2 read without triggering inference, so Whisper compute scales with audio
+    duration rather than with the video analysis rate.
+    """
+
+    def __init__(self, audio_stream, hop_seconds=TRANSCRIBE_HOP_SECONDS,
+                 overlap_seconds=TRANSCRIBE_OVERLAP_SECONDS, window_seconds=TRANSCRIPT_WINDOW_SECONDS):
+        self.audio_stream = audio_stream
+        self.rate = audio_stream.rate
+        self.hop_samples = int(hop_seconds * self.rate)
+        self.overlap_samples = int(overlap_seconds * self.rate)
+        self.window_seconds = window_seconds
+        self.segments = deque()  # (end_time, words)
+        self.running = False
+        self._thread = None
+        self.stats = {"hops": 0, "audio_seconds": 0.0, "compute_seconds": 0.0}
+
+    def start(self):
+        self.running = True
+        self._thread = Thread(target=self._run, name="StreamingTranscriber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        chunk_index = self.audio_stream.captured_chunks
+        pending = []
+        pending_samples = 0
+        tail = np.zeros(0, dtype=np.float32)
+
+        while self.running and self.audio_stream.running:
+            samples, chunk_index = self.audio_stream.read_since(chunk_index, timeout=0.5)
+            if samples is None:
+                continue
+            pending.append(samples)
+            pending_samples += samples.size
+            if pending_samples < self.hop_samples:
+                continue
+
+            hop = np.concatenate(pending)
+            pending, pending_samples = [], 0
+            window = np.concatenate([tail, hop]) if tail.size else hop
+            tail = hop[-self.overlap_samples:] if self.overlap_samples else tail
+            self._transcribe_window(window, hop.size)
+
+    def _transcribe_window(self, window, hop_size):
+        start = time.time()
+        transcripts = chunk_and_transcribe_tiny(window)
+        self.stats["hops"] += 1
+        self.stats["audio_seconds"] += hop_size / self.rate
+        self.stats["compute_seconds"] += time.time() - start
+        if not transcripts:
+            return
+
+        previous_words = [word for _, words in list(self.segments)[-3:] for word in words]
+        new_words = merge_overlapping_text(previous_words, transcripts[0])
+        if new_words:
+            self.segments.append((time.time(), new_words))
+        self._expire()
+
+    def _expire(self):
+        cutoff = time.time() - self.window_seconds
+        while self.segments and self.segments[0][0] < cutoff:
+            self.segments.popleft()
+
+    def get_transcript(self, seconds=None):
+        """Rolling transcript of the last `seconds` (default window); never runs inference"""
+        cutoff = time.time() - (self.window_seconds if seconds is None else seconds)
+        return " ".join(" ".join(words) for end_time, words in list(self.segments) if end_time >= cutoff)
+
+    def get_stats(self):
+        audio_seconds = self.stats["audio_seconds"]
+        return {
+            **self.stats,
+            "real_time_factor": round(self.stats["compute_seconds"] / audio_seconds, 3) if audio_seconds else 0.0
+        }
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+def _webrtc_vad(aggressiveness=2):
+    """Optional webrtcvad backend as a gate vad callable; None when the package is missing"""
+    try:
+        import webrtcvad
+    except ImportError:
+        print("⚠️ webrtcvad not installed, falling back to the energy VAD")
+        return None
+    detector = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(samples, rate):
+        frame_len = int(rate * VAD_FRAME_MS / 1000)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        frames = [pcm[i:i + frame_len].tobytes() for i in range(0, pcm.size - frame_len + 1, frame_len)]
+        voiced = sum(detector.is_speech(frame, rate) for frame in frames)
+        return voiced / max(1, len(frames))
+
+    return is_speech
+
+class VoiceActivityGate:
+    """
+    Cheap pre-stage that decides whether an audio window is worth sending to Whisper.
+    Each window is split into 30 ms frames and scored with vectorized RMS energy and
+    zero-crossing rate: frames that are loud enough with a speech-like ZCR count as voiced,
+    and any frame above VAD_LOUD_DB counts as a loud event. An optional `vad(samples, rate)`
+    callable (e.g. webrtcvad) replaces the ZCR speech test and returns a bool or voiced ratio.
+    """
+
+    def __init__(self, energy_db=VAD_ENERGY_DB, loud_db=VAD_LOUD_DB, max_zcr=VAD_MAX_ZCR,
+                 min_voiced_ratio=VAD_MIN_VOICED_RATIO, rate=16000, vad=None, enabled=VAD_ENABLED):
+        self.energy = 10 ** (energy_db / 20)
+        self.loud = 10 ** (loud_db / 20)
+        self.max_zcr = max_zcr
+        self.min_voiced_ratio = min_voiced_ratio
+        self.rate = rate
+        self.frame_len = int(rate * VAD_FRAME_MS / 1000)
+        self.vad = vad
+        self.enabled = enabled
+        self._lock = Lock()
+        self.stats = {"windows": 0, "forwarded": 0, "speech": 0, "loud": 0, "skipped_seconds": 0.0, "gate_ms": 0.0}
+
+    def score(self, samples):
+        """Frame-level features of one float32 window"""
+        n_frames = samples.size // self.frame_len
+        if n_frames == 0:
+            return {"rms_db": -120.0, "voiced_ratio": 0.0, "zcr": 0.0, "speech": False, "loud": False}
+
+        frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_len - 1)
+
+        energetic = rms >= self.energy
+        if self.vad is not None:
+            voiced_ratio = float(self.vad(samples, self.rate)) if energetic.any() else 0.0
+        else:
+            voiced_ratio = float(np.count_nonzero(energetic & (zcr <= self.max_zcr))) / n_frames
+        loud = bool(np.any(rms >= self.loud))
+
+        return {
+            "rms_db": round(float(20 * np.log10(max(float(rms.max()), 1e-6))), 1),
+            "voiced_ratio": round(voiced_ratio, 3),
+            "zcr": round(float(zcr.mean()), 3),
+            "speech": voiced_ratio >= self.min_voiced_ratio,
+            "loud": loud
+        }
+
+    def should_transcribe(self, samples):
+        """True if the window holds speech or a loud event; updates the hit-rate metrics"""
+        if not self.enabled:
+            return True
+        start = time.perf_counter()
+        features = self.score(samples)
+        forward = features["speech"] or features["loud"]
+        with self._lock:
+            self.stats["windows"] += 1
+            self.stats["gate_ms"] += (time.perf_counter() - start) * 1000
+            self.stats["speech"] += features["speech"]
+            self.stats["loud"] += features["loud"]
+            if forward:
+                self.stats["forwarded"] += 1
+            else:
+                self.stats["skipped_seconds"] += samples.size / self.rate
+        return forward
+
+    def get_stats(self):
+        with self._lock:
+            windows = self.stats["windows"]
+            return {
+                **self.stats,
+                "skipped_seconds": round(self.stats["skipped_seconds"], 1),
+                "gate_ms": round(self.stats["gate_ms"], 1),
+                "hit_rate": round(self.stats["forwarded"] / windows, 3) if windows else 0.0,
+                "backend": "custom" if self.vad is not None else "energy"
+            }
+
+# Global gate shared by the live transcriber and Tier 2
+voice_gate = VoiceActivityGate(vad=_webrtc_vad() if VAD_BACKEND == "webrtc" else None)
+
 def extract_audio(video_path):
     # Existing batch function
     audio_path = "temp_audio.mp3"
@@ -95,8 +397,40 @@ def extract_audio(video_path):
         return audio_path
     return None
 
-def chunk_and_transcribe_tiny(audio_path):
-    # Simplified version that works directly with WAV files
+def load_audio_samples(media_path):
+    """
+    Decode a file's audio track straight to a float32 16 kHz mono array through an ffmpeg pipe -
+    no moviepy clip, no temporary mp3. Returns None if the file has no decodable audio.
+    """
+    try:
+        samples = whisper.load_audio(media_path)
+    except Exception as e:
+        print(f"🔇 No audio decoded from {media_path}: {e}")
+        return None
+    return samples if samples.size else None
+
+def _transcribe_samples(model_name, samples):
+    """Transcribe a float32 16 kHz array in memory - no temp file, no ffmpeg decode"""
+    if samples.size == 0:
+        return ""
+    result = inference_runtime.run(model_name, model_registry.get(model_name).transcribe, samples, fp16=False)
+    return result["text"].strip()
+
+def chunk_and_transcribe_tiny(audio):
+    # Accepts an in-memory float32 array (live mode) or a file path (batch extract_audio)
+    if audio is None:
+        return []
+    if isinstance(audio, np.ndarray):
+        if not voice_gate.should_transcribe(audio):
+            return []
+        try:
+            transcript = _transcribe_samples("whisper_tiny", audio)
+            return [transcript] if transcript else []
+        except Exception as e:
+            print(f"Audio transcription error: {e}")
+            return []
+
+    audio_path = audio
     if not audio_path:
         return []
     try:
@@ -109,7 +443,7 @@ def chunk_and_transcribe_tiny(audio_path):
             return []
         
         # Try direct transcription without chunking for WAV files
-        result = whisper_tiny.transcribe(audio_path, fp16=False)
+        result = inference_runtime.run("whisper_tiny", model_registry.get("whisper_tiny").transcribe, audio_path, fp16=False)
         transcript = result["text"].strip()
         
         # Clean up file
@@ -130,8 +464,54 @@ def chunk_and_transcribe_tiny(audio_path):
             pass
         return []
 
-def transcribe_large(audio_path):
-    # Existing
+def transcribe_voiced_windows(samples, window_seconds=VAD_BATCH_WINDOW_SECONDS):
+    """
+    Whole-file batch audio: gate each fixed window separately (a ratio over the whole track would
+    drop sparse speech) and transcribe each run of consecutive forwarded windows as one segment
+    """
+    if samples is None or samples.size == 0:
+        return []
+    if not voice_gate.enabled:
+        return chunk_and_transcribe_tiny(samples)
+
+    window = max(1, int(window_seconds * voice_gate.rate))
+    segments = []
+    run_start = None
+    for start in range(0, samples.size, window):
+        if voice_gate.should_transcribe(samples[start:start + window]):
+            if run_start is None:
+                run_start = start
+        elif run_start is not None:
+            segments.append(samples[run_start:start])
+            run_start = None
+    if run_start is not None:
+        segments.append(samples[run_start:])
+
+    transcripts = []
+    for segment in segments:
+        try:
+            transcript = _transcribe_samples("whisper_tiny", segment)
+        except Exception as e:
+            print(f"Audio transcription error: {e}")
+            continue
+        if transcript:
+            transcripts.append(transcript)
+    return transcripts
+
+def transcribe_large(audio):
+    # Accepts an in-memory float32 array (live mode) or a file path
+    if audio is None:
+        return ""
+    if isinstance(audio, np.ndarray):
+        if not voice_gate.should_transcribe(audio):
+            return ""
+        try:
+            return _transcribe_samples("whisper_large", audio)
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            return ""
+
+    audio_path = audio
     if not audio_path:
         return ""
     try:
@@ -141,7 +521,7 @@ def transcribe_large(audio_path):
         if os.path.getsize(audio_path) == 0:
             return ""
         
-        result = whisper_large.transcribe(audio_path, fp16=False)
+        result = inference_runtime.run("whisper_large", model_registry.get("whisper_large").transcribe, audio_path, fp16=False)
         text = result["text"].strip()
         
         # Clean up file
@@ -159,4 +539,4 @@ def transcribe_large(audio_path):
                 os.remove(audio_path)
         except:
             pass
-        return ""
\ No newline at end of file
+        return ""
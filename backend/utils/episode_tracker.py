@@ -0,0 +1,189 @@
+import os
+from threading import Lock
+
+# Anomaly episode configuration
+EPISODE_GAP_SECONDS = float(os.getenv("EPISODE_GAP_SECONDS", "3"))  # Time without a suspected frame that closes an episode
+EPISODE_ANALYZE_AFTER_SECONDS = float(os.getenv("EPISODE_ANALYZE_AFTER_SECONDS", "4"))  # Tier 2 for episodes still open this long
+EPISODE_KEY_FRAMES = int(os.getenv("EPISODE_KEY_FRAMES", "3"))  # Frames sent to Tier 2 per analysis
+EPISODE_ESCALATION_DELTA = float(os.getenv("EPISODE_ESCALATION_DELTA", "0.15"))  # Score rise that re-runs Tier 2
+
+POSE_SCORE_BONUS = 0.5  # A pose anomaly outranks any scene probability difference when picking key frames
+
+
+class AnomalyEpisode:
+    """Consecutive suspected frames of one stream, summarized for reports and a single Tier 2 call"""
+
+    def __init__(self, episode_id, stream_id, timestamp, frame_count):
+        self.episode_id = episode_id
+        self.stream_id = stream_id
+        self.start_time = self.end_time = timestamp
+        self.start_frame = self.end_frame = frame_count
+        self.suspected_frames = 0
+        self.pose_frames = 0
+        self.peak_scene_probability = 0.0
+        self.peak_score = 0.0
+        self.peak_tier1 = None
+        self.key_frames = []  # (score, timestamp, frame_count, frame), onset first
+        self.tier2_calls = 0
+        self.analyzed_peak = None  # Peak score / pose state at the last Tier 2 call
+        self.analyzed_pose = False
+        self.closed = False
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+    def add(self, timestamp, frame_count, tier1_result, frame, max_key_frames):
+        """Extend the episode; frame is None for a reused (motion-gated) Tier 1 result"""
+        self.end_time = max(self.end_time, timestamp)
+        self.end_frame = max(self.end_frame, frame_count or 0)
+        if frame is None:
+            return
+
+        signals = tier1_result.get("signals") or {}
+        pose_anomaly = bool(signals.get("pose_anomaly", False))
+        scene_prob = float(signals.get("scene_probability", 0.0))
+        score = scene_prob + (POSE_SCORE_BONUS if pose_anomaly else 0.0)
+        self.suspected_frames += 1
+        self.pose_frames += pose_anomaly
+        self.peak_scene_probability = max(self.peak_scene_probability, scene_prob)
+        if self.peak_tier1 is None or score > self.peak_score:
+            self.peak_score = score
+            self.peak_tier1 = tier1_result
+
+        # The onset frame always stays; the other slots hold the highest-scoring frames
+        entry = (score, timestamp, frame_count, frame)
+        if len(self.key_frames) < max(1, max_key_frames):
+            self.key_frames.append(entry)
+            return
+        weakest = min(range(1, len(self.key_frames)), key=lambda i: self.key_frames[i][0], default=None)
+        if weakest is not None and score > self.key_frames[weakest][0]:
+            self.key_frames[weakest] = entry
+
+    def escalated(self, delta):
+        """True if the episode got worse since its last Tier 2 analysis"""
+        if self.analyzed_peak is None:
+            return False
+        return self.peak_score >= self.analyzed_peak + delta or (self.pose_frames > 0 and not self.analyzed_pose)
+
+    def mark_analyzed(self):
+        self.tier2_calls += 1
+        self.analyzed_peak = self.peak_score
+        self.analyzed_pose = self.pose_frames > 0
+
+    def frames(self):
+        """Key frames in time order, for one batched Tier 2 pass"""
+        return [frame for _, _, _, frame in sorted(self.key_frames, key=lambda entry: entry[1])]
+
+    def tier1_summary(self):
+        """
+        Episode-level Tier 1 result for Tier 2: the peak frame's result with details that describe
+        the whole episode (same "Pose anomaly / Scene probability" wording as a single frame)
+        """
+        summary = dict(self.peak_tier1 or {})
+        summary["signals"] = {**summary.get("signals", {}), "pose_anomaly": self.pose_frames > 0,
+                              "scene_probability": self.peak_scene_probability}
+        summary["details"] = (
+            f"Pose anomaly: {self.pose_frames > 0}, Scene probability: {self.peak_scene_probability:.2f} "
+            f"(peak of {self.suspected_frames} suspected frames over {self.duration:.1f}s, "
+            f"{self.start_time:.1f}s-{self.end_time:.1f}s; pose anomaly in {self.pose_frames}, "
+            f"{len(self.key_frames)} key frames)"
+        )
+        return summary
+
+    def to_dict(self):
+        return {
+            "episode_id": self.episode_id,
+            "start_time": round(self.start_time, 3),
+            "end_time": round(self.end_time, 3),
+            "duration": round(self.duration, 3),
+            "start_frame": self.start_frame,
+            "end_frame": self.end_frame,
+            "suspected_frames": self.suspected_frames,
+            "pose_frames": self.pose_frames,
+            "peak_scene_probability": round(self.peak_scene_probability, 3),
+            "peak_score": round(self.peak_score, 3),
+            "key_frames": [{"frame_count": frame_count, "timestamp": round(timestamp, 3), "score": round(score, 3)}
+                           for score, timestamp, frame_count, _ in sorted(self.key_frames, key=lambda entry: entry[1])],
+            "tier2_calls": self.tier2_calls,
+            "status": "closed" if self.closed else "open"
+        }
+
+
+class EpisodeTracker:
+    """
+    Merges a stream's consecutive suspected frames into anomaly episodes so Tier 2 runs once per
+    incident instead of once per frame. update() is called for every analysed frame and returns
+    (event, episode) pairs:
+      "opened"   - first suspected frame of a new episode (record the alert, save the frame)
+      "analyze"  - run Tier 2 on episode.frames() with episode.tier1_summary(): when the episode
+                   closes unanalysed, once it has been open analyze_after seconds, and again on escalation
+      "closed"   - no suspected frame for gap seconds (or flush at the end of the video)
+    """
+
+    def __init__(self, stream_id=None, gap_seconds=EPISODE_GAP_SECONDS, analyze_after_seconds=EPISODE_ANALYZE_AFTER_SECONDS,
+                 max_key_frames=EPISODE_KEY_FRAMES, escalation_delta=EPISODE_ESCALATION_DELTA):
+        self.stream_id = stream_id
+        self.gap_seconds = gap_seconds
+        self.analyze_after_seconds = analyze_after_seconds
+        self.max_key_frames = max(1, max_key_frames)
+        self.escalation_delta = escalation_delta
+        self.current: AnomalyEpisode = None
+        self._next_id = 1
+        self._lock = Lock()
+        self.stats = {"suspected_frames": 0, "episodes": 0, "tier2_requests": 0, "escalations": 0}
+
+    def update(self, timestamp, tier1_result, frame=None, frame_count=None):
+        """Feed one analysed frame; frame=None marks a reused (motion-gated) Tier 1 result"""
+        events = []
+        with self._lock:
+            episode = self.current
+            if episode is not None and timestamp - episode.end_time > self.gap_seconds:
+                events.extend(self._close())
+                episode = None
+
+            if tier1_result.get("status") != "Suspected Anomaly":
+                return events
+            if episode is None:
+                if frame is None:
+                    return events  # A reused result never opens an episode
+                episode = self.current = AnomalyEpisode(self._next_id, self.stream_id, timestamp, frame_count)
+                self._next_id += 1
+                self.stats["episodes"] += 1
+                events.append(("opened", episode))
+
+            episode.add(timestamp, frame_count, tier1_result, frame, self.max_key_frames)
+            if frame is not None:
+                self.stats["suspected_frames"] += 1
+            if episode.tier2_calls == 0 and episode.duration >= self.analyze_after_seconds:
+                events.append(self._analyze(episode))
+            elif episode.escalated(self.escalation_delta):
+                self.stats["escalations"] += 1
+                events.append(self._analyze(episode))
+        return events
+
+    def flush(self):
+        """Close the open episode (end of video / stream)"""
+        with self._lock:
+            return self._close() if self.current is not None else []
+
+    def _close(self):
+        episode, self.current = self.current, None
+        episode.closed = True
+        events = [self._analyze(episode)] if episode.tier2_calls == 0 else []
+        events.append(("closed", episode))
+        return events
+
+    def _analyze(self, episode):
+        episode.mark_analyzed()
+        self.stats["tier2_requests"] += 1
+        return "analyze", episode
+
+    def get_stats(self):
+        with self._lock:
+            requests = self.stats["tier2_requests"]
+            return {
+                **self.stats,
+                "frames_per_tier2_call": round(self.stats["suspected_frames"] / requests, 2) if requests else None,
+                "open_episode": self.current.to_dict() if self.current is not None else None
+            }
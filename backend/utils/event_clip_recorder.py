@@ -0,0 +1,188 @@
+import os
+import queue
+import time
+from collections import deque
+from threading import Thread, Lock
+
+import cv2
+import numpy as np
+
+# Event clip configuration
+CLIP_PRE_ROLL_SECONDS = float(os.getenv("CLIP_PRE_ROLL_SECONDS", "5"))
+CLIP_POST_ROLL_SECONDS = float(os.getenv("CLIP_POST_ROLL_SECONDS", "5"))
+CLIP_MAX_SECONDS = float(os.getenv("CLIP_MAX_SECONDS", "60"))  # Overlapping events extend a clip up to this length
+CLIP_JPEG_QUALITY = int(os.getenv("CLIP_JPEG_QUALITY", "80"))
+CLIP_DIR = os.getenv("CLIP_DIR", "recorded_videos")
+CONTINUOUS_RECORDING = os.getenv("CONTINUOUS_RECORDING", "0") == "1"  # Also record every frame of every session
+
+# Recordings directory served by app.py; clips are only viewable from the dashboards if CLIP_DIR is inside it
+RECORDINGS_DIR = "recorded_videos"
+RECORDINGS_URL = "/recorded_videos"
+
+
+def clip_url(path):
+    """URL of a clip under the recordings static mount, or None if the file is outside the mounted directory"""
+    if not path:
+        return None
+    try:
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(RECORDINGS_DIR))
+    except ValueError:  # Different drive on Windows
+        return None
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    return f"{RECORDINGS_URL}/{relative.replace(os.sep, '/')}"
+
+
+class _Clip:
+    """One event clip being assembled: pre-roll frames plus post-roll until end_seq"""
+
+    def __init__(self, path, frames, end_seq, max_frames):
+        self.path = path
+        self.frames = frames  # [(seq, jpeg bytes)]
+        self.end_seq = end_seq
+        self.max_frames = max_frames
+        self.events = 1
+
+
+class EventClipRecorder:
+    """
+    Event-triggered recording for live sessions. Every captured frame is JPEG-compressed
+    into an in-memory pre-roll buffer covering the last few seconds; when an anomaly fires,
+    the pre-roll plus a post-roll window is written to its own MP4 on a background thread.
+    Events that arrive while a clip is still open extend that clip instead of starting a new one.
+    """
+
+    def __init__(self, fps, session_name, pre_roll_seconds=CLIP_PRE_ROLL_SECONDS,
+                 post_roll_seconds=CLIP_POST_ROLL_SECONDS, max_seconds=CLIP_MAX_SECONDS,
+                 jpeg_quality=CLIP_JPEG_QUALITY, clip_dir=CLIP_DIR):
+        self.fps = fps if fps > 0 else 30
+        self.session_name = session_name
+        self.pre_roll_frames = max(1, int(pre_roll_seconds * self.fps))
+        self.post_roll_frames = max(1, int(post_roll_seconds * self.fps))
+        self.max_frames = max(self.pre_roll_frames + self.post_roll_frames, int(max_seconds * self.fps))
+        self.jpeg_quality = jpeg_quality
+        self.clip_dir = clip_dir
+        os.makedirs(clip_dir, exist_ok=True)
+
+        self._pre_roll = deque(maxlen=self.pre_roll_frames)  # [(seq, jpeg bytes)]
+        self._pre_roll_bytes = 0
+        self._clip = None
+        self._last_seq = -1
+        self._lock = Lock()
+        self._writes = queue.Queue()
+        self._thread = None
+        self.clips = []
+        self.stats = {"frames": 0, "events": 0, "clips_written": 0, "bytes_written": 0, "encode_ms": 0.0}
+
+    def start(self):
+        self._thread = Thread(target=self._write_loop, name="EventClipWriter", daemon=True)
+        self._thread.start()
+        print(f"🎞️ Event clips: {self.pre_roll_frames / self.fps:.0f}s pre-roll + "
+              f"{self.post_roll_frames / self.fps:.0f}s post-roll to {self.clip_dir}/")
+        return self
+
+    def push(self, seq, frame):
+        """Compress a captured frame into the pre-roll (and the open clip, if any)"""
+        start = time.perf_counter()
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return False
+        jpeg = encoded.tobytes()
+        encode_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.stats["frames"] += 1
+            self.stats["encode_ms"] += encode_ms
+            self._last_seq = seq
+            if len(self._pre_roll) == self._pre_roll.maxlen:
+                self._pre_roll_bytes -= len(self._pre_roll[0][1])
+            self._pre_roll.append((seq, jpeg))
+            self._pre_roll_bytes += len(jpeg)
+
+            clip = self._clip
+            if clip is not None:
+                clip.frames.append((seq, jpeg))
+                if seq >= clip.end_seq or len(clip.frames) >= clip.max_frames:
+                    self._finish_clip()
+        return True
+
+    def trigger(self, seq, label="anomaly"):
+        """
+        Start (or extend) a clip around frame `seq`. Returns the clip's path right away so the
+        anomaly record can link it; the file is complete once the post-roll has been captured.
+        """
+        with self._lock:
+            self.stats["events"] += 1
+            clip = self._clip
+            if clip is not None:
+                clip.end_seq = max(clip.end_seq, seq + self.post_roll_frames)
+                clip.events += 1
+                return clip.path
+
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            path = f"{self.clip_dir}/{self.session_name}_{label}_{timestamp}_{seq + 1}.mp4"
+            frames = [item for item in self._pre_roll if item[0] >= seq - self.pre_roll_frames]
+            self._clip = _Clip(path, frames, seq + self.post_roll_frames, self.max_frames)
+            self.clips.append(path)
+            if self._last_seq >= self._clip.end_seq:
+                # The recording stage is already past the post-roll window
+                self._finish_clip()
+            return path
+
+    def _finish_clip(self):
+        """Hand the open clip to the writer thread (caller holds the lock)"""
+        self._writes.put(self._clip)
+        self._clip = None
+
+    def _write_loop(self):
+        while True:
+            clip = self._writes.get()
+            if clip is None:
+                break
+            try:
+                self._write_clip(clip)
+            except Exception as e:
+                print(f"❌ Event clip write failed ({clip.path}): {e}")
+
+    def _write_clip(self, clip):
+        if not clip.frames:
+            return
+        writer = None
+        for _, jpeg in clip.frames:
+            frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if writer is None:
+                height, width = frame.shape[:2]
+                writer = cv2.VideoWriter(clip.path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
+            writer.write(frame)
+        writer.release()
+        size = os.path.getsize(clip.path) if os.path.exists(clip.path) else 0
+        with self._lock:
+            self.stats["clips_written"] += 1
+            self.stats["bytes_written"] += size
+        print(f"🎞️ Saved event clip {clip.path} ({len(clip.frames) / self.fps:.1f}s, {clip.events} event(s))")
+
+    def release(self, timeout=10.0):
+        """Flush the open clip with the post-roll captured so far, then stop the writer"""
+        if self._thread is None:
+            return
+        with self._lock:
+            if self._clip is not None:
+                self._finish_clip()
+        self._writes.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self):
+        with self._lock:
+            frames = self.stats["frames"]
+            return {
+                "frames": frames,
+                "events": self.stats["events"],
+                "clips": len(self.clips),
+                "clips_written": self.stats["clips_written"],
+                "clip_open": self._clip is not None,
+                "bytes_written": self.stats["bytes_written"],
+                "pre_roll_frames": len(self._pre_roll),
+                "pre_roll_kb": round(self._pre_roll_bytes / 1024, 1),
+                "avg_encode_ms": round(self.stats["encode_ms"] / frames, 2) if frames else 0.0
+            }
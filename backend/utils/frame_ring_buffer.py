@@ -0,0 +1,88 @@
+import os
+from threading import Condition
+
+import cv2
+import numpy as np
+
+# Frames kept in the live capture ring (~2 s at 30 FPS)
+FRAME_BUFFER_SIZE = int(os.getenv("FRAME_BUFFER_SIZE", "64"))
+
+
+class FrameRingBuffer:
+    """
+    Preallocated ring of captured frames shared by independent consumers. The capture thread
+    writes every frame into the next slot; consumers wait on a condition variable instead of
+    polling. A cursor-based reader (recording) gets every frame in order and only loses
+    frames if it falls a full ring behind; a latest-frame reader (analysis) always gets the
+    newest frame and skips whatever it had no time for.
+    """
+
+    def __init__(self, capacity=FRAME_BUFFER_SIZE):
+        self.capacity = max(2, capacity)
+        self._frames = None  # (capacity, H, W, C) uint8, allocated on the first frame
+        self._written = 0  # Sequence number of the next frame
+        self._condition = Condition()
+        self.closed = False
+        self.stats = {"captured": 0, "recorded": 0, "analyzed": 0, "dropped": 0}
+
+    def write(self, frame):
+        """Copy a captured frame into the ring and wake the consumers"""
+        with self._condition:
+            if self._frames is None:
+                self._frames = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+            elif frame.shape != self._frames.shape[1:]:
+                # Camera changed resolution mid-stream: keep the ring's geometry
+                frame = cv2.resize(frame, (self._frames.shape[2], self._frames.shape[1]))
+            np.copyto(self._frames[self._written % self.capacity], frame)
+            self._written += 1
+            self.stats["captured"] += 1
+            self._condition.notify_all()
+
+    def read_since(self, cursor, timeout=None):
+        """
+        Every frame with sequence number >= cursor, oldest first, as [(seq, frame copy)].
+        Waits up to `timeout` for new frames; frames already overwritten are counted as dropped.
+        Returns (frames, next_cursor).
+        """
+        with self._condition:
+            if self._written <= cursor and not self.closed:
+                self._condition.wait(timeout)
+            oldest = max(cursor, self._written - self.capacity)
+            if oldest > cursor:
+                self.stats["dropped"] += oldest - cursor
+            frames = [(seq, self._frames[seq % self.capacity].copy()) for seq in range(oldest, self._written)]
+            return frames, self._written
+
+    def wait_newer(self, after_seq=-1, timeout=None):
+        """Sequence number of the newest frame once it is > after_seq, or after_seq on timeout"""
+        with self._condition:
+            if self._written - 1 <= after_seq and not self.closed:
+                self._condition.wait(timeout)
+            return max(after_seq, self._written - 1)
+
+    def get(self, seq):
+        """Copy of frame `seq`, or None if it has already been overwritten"""
+        with self._condition:
+            if seq < 0 or seq >= self._written or seq < self._written - self.capacity:
+                return None
+            return self._frames[seq % self.capacity].copy()
+
+    def latest(self, after_seq=-1, timeout=None):
+        """Newest frame with sequence number > after_seq as (seq, frame copy), or (after_seq, None) on timeout"""
+        seq = self.wait_newer(after_seq, timeout)
+        return (seq, self.get(seq)) if seq > after_seq else (after_seq, None)
+
+    def count(self, name, n=1):
+        """Bump a consumer counter (recorded / analyzed)"""
+        with self._condition:
+            self.stats[name] += n
+
+    def close(self):
+        """Wake every waiting consumer; they exit once the remaining frames are read"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def get_stats(self):
+        with self._condition:
+            return {**self.stats, "capacity": self.capacity, "buffered": min(self._written, self.capacity)}
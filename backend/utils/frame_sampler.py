@@ -0,0 +1,86 @@
+import os
+import cv2
+
+# Strides at or above this many frames seek instead of grabbing through the gap.
+# OpenCV's FFmpeg backend seeks to the previous keyframe and decodes forward, so
+# seeking only pays off once the gap is comparable to a GOP.
+SEEK_STRIDE_THRESHOLD = int(os.getenv("FRAME_SEEK_THRESHOLD", "120"))
+
+
+class FrameSampler:
+    """
+    Iterates over every `stride`-th frame of a video as (frame_index, timestamp, frame).
+    Skipped frames are only grabbed (demuxed/decoded without the retrieve + BGR
+    conversion copy); large strides fall back to keyframe-aware seeking.
+    """
+
+    def __init__(self, source, stride=1, start=0, seek_threshold=SEEK_STRIDE_THRESHOLD):
+        self.owns_capture = not isinstance(source, cv2.VideoCapture)
+        self.cap = cv2.VideoCapture(source) if self.owns_capture else source
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30
+        self.stride = max(1, int(stride))
+        self.start = max(0, int(start))
+        self.seek_threshold = seek_threshold
+
+        # Statistics
+        self.grabbed_frames = 0
+        self.decoded_frames = 0
+        self.seeks = 0
+        self._seek_supported = True
+
+    def __iter__(self):
+        position = 0  # Index of the next frame the decoder will return
+        target = self.start
+
+        while self.cap.isOpened():
+            gap = target - position
+            if gap >= self.seek_threshold and self._seek_supported:
+                position = self._seek(target, position)
+
+            # Advance through the gap without retrieving pixels
+            while position < target:
+                if not self.cap.grab():
+                    return
+                self.grabbed_frames += 1
+                position += 1
+
+            if not self.cap.grab():
+                return
+            ret, frame = self.cap.retrieve()
+            position += 1
+            if not ret:
+                return
+            self.decoded_frames += 1
+
+            yield target, target / self.fps, frame
+
+            # Stride is re-read every step so callers can adapt it mid-stream
+            target += max(1, int(self.stride))
+
+    def _seek(self, target, position):
+        """Seek to target; disable seeking for sources that do not land where asked"""
+        if self.cap.set(cv2.CAP_PROP_POS_FRAMES, target):
+            landed = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if landed == target:
+                self.seeks += 1
+                return target
+
+        # Inaccurate or unsupported seek: rewind to where we were and grab instead
+        self._seek_supported = False
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        return position
+
+    def stats(self):
+        """Decode statistics for logging"""
+        return {
+            "decoded_frames": self.decoded_frames,
+            "grabbed_frames": self.grabbed_frames,
+            "seeks": self.seeks,
+            "stride": self.stride
+        }
+
+    def release(self):
+        """Release the capture if this sampler opened it"""
+        if self.owns_capture:
+            self.cap.release()
@@ -1,77 +1,262 @@
-from groq import Groq
 import json
-from dotenv import load_dotenv
 import os
+from concurrent.futures import Future
 
-load_dotenv()  # Load variables from .env file
+import numpy as np
 
-# Test Groq client initialization
-try:
-    groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-    print("✅ Groq client initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to initialize Groq client: {e}")
-    groq_client = None
+from utils.llm_client import llm_client, LLMError
+from utils.tier2_cache import tier2_cache, tier2_fingerprint
+from utils.local_tier2 import local_tier2_engine, LOCAL_TIER2_MODE
+from utils.tier1_signals import (Tier1Signals, Tier1Result, STATUS_NORMAL, STATUS_SUSPECTED,
+                                 REASON_LOW, REASON_THRESHOLD)
 
+# Tier 1 thresholds (scene probability needed with / without a pose anomaly, and the normal floor)
+TIER1_POSE_SCENE_THRESHOLD = 0.35
+TIER1_SCENE_THRESHOLD = 0.45
+TIER1_NORMAL_FLOOR = 0.20
+TIER1_VERBOSE = os.getenv("TIER1_VERBOSE", "0") == "1"  # Full per-frame Tier 1 breakdown on the console
 
+# Keys every Tier 2 LLM answer must contain; all but the summary are clamped to [0, 1]
+TIER2_REQUIRED_KEYS = ["visual_score", "audio_score", "text_alignment_score",
+                       "multimodal_agreement", "reasoning_summary", "threat_severity_index"]
+TIER2_SCORE_KEYS = ["visual_score", "audio_score", "text_alignment_score",
+                    "multimodal_agreement", "threat_severity_index"]
 
-def tier1_fusion(pose_summary, audio_summary, scene_summary):
-    print("\n" + "="*60)
-    print("🔍 TIER 1 ANALYSIS - Fast Detection Engine")
-    print("="*60)
+
+
+def fuse_tier1(signals):
+    """Tier 1 decision on one frame's numeric signals -> Tier1Result (no string work)"""
+    scene_prob = signals.scene_prob
+    # Optimized thresholds for Samsung demo - reduced false positives
+    scene_threshold = TIER1_POSE_SCENE_THRESHOLD if signals.pose_anomaly else TIER1_SCENE_THRESHOLD
     
-    # Extract scene anomaly probability for threshold check
+    # Quick decisions without AI reasoning - Samsung demo optimized
+    if not signals.pose_anomaly and scene_prob < TIER1_NORMAL_FLOOR:
+        result = Tier1Result(signals, STATUS_NORMAL, scene_threshold, REASON_LOW)
+    elif signals.pose_anomaly or scene_prob > scene_threshold:
+        result = Tier1Result(signals, STATUS_SUSPECTED, scene_threshold, REASON_THRESHOLD)
+    else:
+        result = Tier1Result(signals, STATUS_NORMAL, scene_threshold, REASON_THRESHOLD)
+    _log_tier1(result)
+    return result
+
+def fuse_tier1_batch(signals_list):
+    """fuse_tier1 over a batch of frames, with the thresholds applied as array operations"""
+    if not signals_list:
+        return []
+    pose = np.fromiter((s.pose_anomaly for s in signals_list), dtype=bool, count=len(signals_list))
+    scene = np.fromiter((s.scene_prob for s in signals_list), dtype=np.float64, count=len(signals_list))
+    thresholds = np.where(pose, TIER1_POSE_SCENE_THRESHOLD, TIER1_SCENE_THRESHOLD)
+    low = ~pose & (scene < TIER1_NORMAL_FLOOR)
+    suspected = ~low & (pose | (scene > thresholds))
+    
+    results = [
+        Tier1Result(signals, STATUS_SUSPECTED if is_suspected else STATUS_NORMAL, float(threshold),
+                    REASON_LOW if is_low else REASON_THRESHOLD)
+        for signals, is_suspected, is_low, threshold in zip(signals_list, suspected.tolist(), low.tolist(), thresholds.tolist())
+    ]
+    for result in results:
+        _log_tier1(result)
+    return results
+
+def _log_tier1(result):
+    """Tier 1 console output: one line per suspected frame, the full breakdown with TIER1_VERBOSE=1"""
+    signals = result.signals
+    if TIER1_VERBOSE:
+        print("\n" + "="*60)
+        print("🔍 TIER 1 ANALYSIS - Fast Detection Engine")
+        print("="*60)
+        print(f"🎬 Scene Probability: {signals.scene_prob:.3f}")
+        print(f"🤸 Pose Analysis: {'🚨 ANOMALY' if signals.pose_anomaly else '✅ NORMAL'}")
+        print(f"🎬 Scene Threshold: {result.scene_threshold} | Scene Score: {signals.scene_prob:.3f} | "
+              f"Result: {'🚨 ANOMALY' if signals.scene_prob > result.scene_threshold else '✅ NORMAL'}")
+        print(f"{'🚨 TIER 1 RESULT: SUSPECTED ANOMALY' if result.suspected else '✅ TIER 1 RESULT: NORMAL'}")
+        print("="*60 + "\n")
+    elif result.suspected:
+        print(f"🚨 TIER 1: SUSPECTED ANOMALY (pose {'DETECTED' if signals.pose_anomaly else 'NORMAL'}, "
+              f"scene {signals.scene_prob:.3f} / threshold {result.scene_threshold})")
+
+def tier1_fusion(pose_summary, audio_summary, scene_summary):
+    """
+    String form of fuse_tier1 for callers that only have component summaries: returns
+    (status, details). The per-frame pipelines build Tier1Signals and call fuse_tier1 directly.
+    """
     scene_prob = 0.0
     if "Scene anomaly probability:" in scene_summary:
         try:
-            prob_str = scene_summary.split("Scene anomaly probability:")[1].strip()
-            scene_prob = float(prob_str)
-        except:
+            scene_prob = float(scene_summary.split("Scene anomaly probability:")[1].strip())
+        except ValueError:
             scene_prob = 0.0
+    result = fuse_tier1(Tier1Signals("True" in pose_summary, scene_prob))
+    return result.status, result.details()
+
+def _tier2_evidence_lines(evidence):
+    visual_summary = " | ".join(evidence["captions"]) if evidence["captions"] else "No captions."
+    return (
+        f"- Tier 1 Simple Detection: {evidence['tier1_details']}\n"
+        f"- Audio Transcript: {evidence['audio_transcript'] or 'No audio detected'}\n"
+        f"- Visual Scene Description: {visual_summary}\n"
+        f"- Visual Anomaly Probability: {evidence['visual_anomaly_max']:.2f}\n"
+    )
+
+def build_tier2_prompt(evidence_list):
+    """Tier 2 LLM prompt for one frame's evidence, or for several coalesced frames of one stream"""
+    if len(evidence_list) == 1:
+        input_data = "INPUT DATA:\n" + _tier2_evidence_lines(evidence_list[0])
+    else:
+        input_data = (
+            f"INPUT DATA ({len(evidence_list)} consecutive suspected frames from the same camera, oldest first; "
+            f"assess them together as one incident):\n"
+        )
+        for index, evidence in enumerate(evidence_list, 1):
+            input_data += f"Frame {index}:\n" + _tier2_evidence_lines(evidence)
+    return (
+        f"You are an expert anomaly analyst. Provide detailed analysis and reasoning for this anomaly detection case. "
+        f"Return ONLY a valid JSON object with no additional text or formatting.\n\n"
+        f"{input_data}\n"
+        f"ANALYSIS REQUIREMENTS:\n"
+        f"Provide detailed reasoning that MUST include:\n"
+        f"1. POSE ANALYSIS: What does the pose data suggest? (normal posture, aggressive stance, fall position, etc.)\n"
+        f"2. SCENE ANALYSIS: What does the visual scene show? How confident are we in this assessment?\n"
+        f"3. AUDIO ANALYSIS: Any verbal indicators of distress, aggression, or normalcy?\n"
+        f"4. MULTIMODAL CORRELATION: How do all the indicators align? Do they support each other or contradict?\n"
+        f"5. ANOMALY TYPE: What specific type of anomaly is most likely? (fall, aggression, medical emergency, false positive)\n"
+        f"6. CONFIDENCE ASSESSMENT: How certain is this detection and why?\n"
+        f"7. THREAT LEVEL JUSTIFICATION: Why this specific threat severity score?\n\n"
+        f"Return JSON with these exact keys:\n"
+        f'{{"visual_score": <0-1 float>, "audio_score": <0-1 float>, "text_alignment_score": <0-1 float>, '
+        f'"multimodal_agreement": <0-1 float>, "reasoning_summary": "<comprehensive 4-6 sentence analysis covering ALL points above>", "threat_severity_index": <0-1 float>}}'
+    )
+
+def parse_tier2_output(output):
+    """Extract, validate and clamp the JSON object in an LLM answer"""
+    output = output.strip()
+    # Clean up the response to extract JSON
+    if "```json" in output:
+        output = output.split("```json")[1].split("```")[0].strip()
+    elif "```" in output:
+        output = output.split("```")[1].split("```")[0].strip()
     
-    # Debug logging for scene probability parsing
-    print(f"� Scene Analysis: {scene_summary}")
-    print(f"🎯 Parsed Probability: {scene_prob:.3f}")
+    # Remove any remaining markdown or extra formatting
+    output = output.strip()
+    if output.startswith('```'):
+        output = output[3:].strip()
+    if output.endswith('```'):
+        output = output[:-3].strip()
     
-    # Simple thresholds - no AI reasoning in Tier 1
-    pose_anomaly_detected = "True" in pose_summary
-    print(f"🤸 Pose Analysis: {'🚨 ANOMALY' if pose_anomaly_detected else '✅ NORMAL'}")
+    result = json.loads(output)
+    for key in TIER2_REQUIRED_KEYS:
+        if key not in result:
+            raise KeyError(f"Missing required key: {key}")
+    for score_key in TIER2_SCORE_KEYS:
+        if not (0 <= result[score_key] <= 1):
+            result[score_key] = max(0, min(1, result[score_key]))  # Clamp to 0-1
+    return result
+
+def _tier2_fallback(evidence, reasoning, title):
+    """Local scoring used when the LLM answer is unusable or the LLM is unavailable"""
+    if LOCAL_TIER2_MODE != "off":
+        result = local_tier2_engine.analyze(**evidence)
+        result["reasoning_summary"] = f"{reasoning}. {result['reasoning_summary']}"
+        result["fallback"] = True
+        print(f"⚠️  USING LOCAL TIER 2 ENGINE ({title})")
+        print("-"*70)
+        print(f"🎯 Local Threat: {result['threat_severity_index']:.1%} ({result['anomaly_type']})")
+        print(f"👁️  Visual Score: {result['visual_score']:.1%}")
+        print(f"🎤 Audio Score: {result['audio_score']:.1%}")
+        print("="*70 + "\n")
+        return result
     
-    # Optimized thresholds for Samsung demo - reduced false positives
-    if pose_anomaly_detected:
-        scene_threshold = 0.35  # Higher threshold when pose anomaly is detected
-    else:
-        scene_threshold = 0.45  # Higher threshold for scene-only anomalies - Samsung optimized
+    visual_anomaly_max = evidence["visual_anomaly_max"]
+    audio_transcript = evidence["audio_transcript"]
+    fallback_visual_score = min(1.0, visual_anomaly_max * 2)  # Scale up the visual score
+    fallback_audio_score = 0.3 if audio_transcript and len(audio_transcript.strip()) > 0 else 0.1
+    fallback_threat = (fallback_visual_score + fallback_audio_score) / 2
+    
+    print(f"⚠️  USING FALLBACK ANALYSIS ({title})")
+    print("-"*70)
+    print(f"🎯 Fallback Threat: {fallback_threat:.1%}")
+    print(f"👁️  Visual Score: {fallback_visual_score:.1%}")
+    print(f"🎤 Audio Score: {fallback_audio_score:.1%}")
+    print("="*70 + "\n")
     
-    moderate_scene_anomaly = scene_prob > scene_threshold
-    print(f"🎬 Scene Threshold: {scene_threshold} | Scene Score: {scene_prob:.3f} | Result: {'🚨 ANOMALY' if moderate_scene_anomaly else '✅ NORMAL'}")
+    return {
+        "visual_score": fallback_visual_score,
+        "audio_score": fallback_audio_score,
+        "text_alignment_score": 0.4,
+        "multimodal_agreement": 0.4,
+        "reasoning_summary": reasoning,
+        "threat_severity_index": fallback_threat,
+        "fallback": True
+    }
+
+def _finish_tier2(llm_future, evidence):
+    """Turn a finished LLM future into the Tier 2 fusion result (falling back on any failure)"""
+    visual_anomaly_max = evidence["visual_anomaly_max"]
+    audio_available = bool(evidence["audio_transcript"])
+    try:
+        output, merged = llm_future.result()
+    except Exception as e:
+        print(f"❌ Error in Tier 2 fusion: {type(e).__name__}: {str(e)[:200]}")
+        if not isinstance(e, LLMError):
+            print(f"🔑 LLM API key present: {'Yes' if llm_client.api_key else 'No'}")
+            import traceback
+            print(f"📋 Full traceback: {''.join(traceback.format_exception(type(e), e, e.__traceback__))}")
+        
+        # Determine fallback reasoning based on available data
+        if "rate_limit" in str(e).lower():
+            reasoning = f"Rate limit reached - using local analysis. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {audio_available}"
+        else:
+            reasoning = f"AI reasoning unavailable - using fallback. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {audio_available}"
+        return _tier2_fallback(evidence, reasoning, "LLM Unavailable")
     
-    # Quick decisions without AI reasoning - Samsung demo optimized
-    if not pose_anomaly_detected and scene_prob < 0.20:  # Skip more frames for better performance (Samsung optimized)
-        print("✅ TIER 1 RESULT: NORMAL - Low threat indicators")
-        print("="*60 + "\n")
-        return "Normal", f"Scene probability ({scene_prob:.2f}) and pose analysis indicate normal activity"
+    print("📨 Received LLM response, processing...")
+    print(f"📄 Response preview: {output[:100]}...")  # Show first 100 chars
+    try:
+        result = parse_tier2_output(output)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"❌ Tier 2 response parse error: {e}")
+        print(f"📄 Raw LLM output: {output}")
+        reasoning = f"JSON parsing failed - using fallback analysis. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {audio_available}"
+        return _tier2_fallback(evidence, reasoning, "JSON Parse Error")
     
-    # Simple threshold-based detection for Tier 1
-    if pose_anomaly_detected or moderate_scene_anomaly:
-        result = "Suspected Anomaly"
-        details = f"Pose anomaly: {pose_anomaly_detected}, Scene probability: {scene_prob:.2f}"
-        print(f"🚨 TIER 1 RESULT: SUSPECTED ANOMALY")
-        print(f"   └─ Pose: {'DETECTED' if pose_anomaly_detected else 'NORMAL'}")
-        print(f"   └─ Scene: {scene_prob:.3f} (threshold: {scene_threshold})")
-        print(f"   └─ 🧠 Triggering Tier 2 AI Analysis...")
-        print("="*60 + "\n")
-        return result, details
-    else:
-        result = "Normal"
-        details = f"Pose anomaly: {pose_anomaly_detected}, Scene probability: {scene_prob:.2f}"
-        print(f"✅ TIER 1 RESULT: NORMAL")
-        print(f"   └─ Pose: {'DETECTED' if pose_anomaly_detected else 'NORMAL'}")
-        print(f"   └─ Scene: {scene_prob:.3f} (threshold: {scene_threshold})")
-        print("="*60 + "\n")
-        return result, details
+    result["engine"] = "llm"
+    if merged > 1:
+        result["coalesced_requests"] = merged
+    if LOCAL_TIER2_MODE == "shadow":
+        result["shadow"] = local_tier2_engine.shadow(llm_result=result, **evidence)
+    
+    # Beautiful output formatting
+    threat_level = "🔴 HIGH" if result["threat_severity_index"] > 0.7 else "🟡 MEDIUM" if result["threat_severity_index"] > 0.4 else "🟢 LOW"
+    confidence = "🎯 HIGH" if result["multimodal_agreement"] > 0.7 else "⚠️ MEDIUM" if result["multimodal_agreement"] > 0.4 else "❓ LOW"
+    
+    print(f"✅ TIER 2 AI ANALYSIS COMPLETE{f' ({merged} coalesced requests)' if merged > 1 else ''}")
+    print("-"*70)
+    print(f"🎯 Threat Level: {threat_level} ({result['threat_severity_index']:.1%})")
+    print(f"🤝 AI Confidence: {confidence} ({result['multimodal_agreement']:.1%})")
+    print(f"👁️  Visual Score: {result['visual_score']:.1%}")
+    print(f"🎤 Audio Score: {result['audio_score']:.1%}")
+    print("-"*70)
+    print("🧠 AI Reasoning:")
+    print(f"   {result['reasoning_summary']}")
+    print("="*70 + "\n")
+    
+    return result
 
-def tier2_fusion(audio_transcript, captions, visual_anomaly_max, tier1_details):
+def _log_local_result(result):
+    print(f"✅ TIER 2 LOCAL ANALYSIS COMPLETE ({result['anomaly_type']})")
+    print("-"*70)
+    print(f"🎯 Threat Level: {result['threat_severity_index']:.1%}")
+    print(f"🧠 {result['reasoning_summary']}")
+    print("="*70 + "\n")
+    return result
+
+def submit_tier2_fusion(audio_transcript, captions, visual_anomaly_max, tier1_details, stream_id=None, tier1_signals=None):
+    """
+    Start Tier 2 fusion without blocking: returns a Future resolving to the fusion result.
+    Requests with the same stream_id that arrive within the LLM coalescing window share one LLM call.
+    tier1_details is the display text for the prompt; the local engine reads tier1_signals (Tier1Signals).
+    """
     print("\n" + "="*70)
     print("🧠 TIER 2 ANALYSIS - Deep AI Reasoning Engine")
     print("="*70)
@@ -82,177 +267,63 @@ def tier2_fusion(audio_transcript, captions, visual_anomaly_max, tier1_details):
     print(f"   📊 Tier 1: {tier1_details}")
     print("-"*70)
     
-    try:
-        visual_summary = " | ".join(captions) if captions else "No captions."
-        scene_summary = f"Highest visual anomaly probability: {visual_anomaly_max:.2f}"
-        prompt = (
-            f"You are an expert anomaly analyst. Provide detailed analysis and reasoning for this anomaly detection case. "
-            f"Return ONLY a valid JSON object with no additional text or formatting.\n\n"
-            f"INPUT DATA:\n"
-            f"- Tier 1 Simple Detection: {tier1_details}\n"
-            f"- Audio Transcript: {audio_transcript or 'No audio detected'}\n"
-            f"- Visual Scene Description: {visual_summary}\n"
-            f"- Visual Anomaly Probability: {visual_anomaly_max:.2f}\n\n"
-            f"ANALYSIS REQUIREMENTS:\n"
-            f"Provide detailed reasoning that MUST include:\n"
-            f"1. POSE ANALYSIS: What does the pose data suggest? (normal posture, aggressive stance, fall position, etc.)\n"
-            f"2. SCENE ANALYSIS: What does the visual scene show? How confident are we in this assessment?\n"
-            f"3. AUDIO ANALYSIS: Any verbal indicators of distress, aggression, or normalcy?\n"
-            f"4. MULTIMODAL CORRELATION: How do all the indicators align? Do they support each other or contradict?\n"
-            f"5. ANOMALY TYPE: What specific type of anomaly is most likely? (fall, aggression, medical emergency, false positive)\n"
-            f"6. CONFIDENCE ASSESSMENT: How certain is this detection and why?\n"
-            f"7. THREAT LEVEL JUSTIFICATION: Why this specific threat severity score?\n\n"
-            f"Return JSON with these exact keys:\n"
-            f'{{"visual_score": <0-1 float>, "audio_score": <0-1 float>, "text_alignment_score": <0-1 float>, '
-            f'"multimodal_agreement": <0-1 float>, "reasoning_summary": "<comprehensive 4-6 sentence analysis covering ALL points above>", "threat_severity_index": <0-1 float>}}'
-        )
-        
-        print("🤖 Sending data to Groq LLM (llama-3.3-70b-versatile)...")
-        print(f"🔑 API Key Status: {'Present' if os.getenv('GROQ_API_KEY') else 'Missing'}")
-        
-        if groq_client is None:
-            raise Exception("Groq client not initialized - check API key and connection")
-        
-        try:
-            response = groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.1  # Lower temperature for more consistent JSON output
-            )
-            print("📡 Groq API call successful")
-        except Exception as api_error:
-            print(f"📡 Groq API call failed: {type(api_error).__name__}: {api_error}")
-            raise api_error
-            
-        output = response.choices[0].message.content.strip()
-        print("📨 Received LLM response, processing...")
-        print(f"📄 Response preview: {output[:100]}...")  # Show first 100 chars
-        
-        # Clean up the response to extract JSON
-        if "```json" in output:
-            output = output.split("```json")[1].split("```")[0].strip()
-        elif "```" in output:
-            output = output.split("```")[1].split("```")[0].strip()
-        
-        # Remove any remaining markdown or extra formatting
-        output = output.strip()
-        if output.startswith('```'):
-            output = output[3:].strip()
-        if output.endswith('```'):
-            output = output[:-3].strip()
-        
-        # Try to parse JSON
-        result = json.loads(output)
-        
-        # Validate required keys
-        required_keys = ["visual_score", "audio_score", "text_alignment_score", 
-                        "multimodal_agreement", "reasoning_summary", "threat_severity_index"]
-        
-        for key in required_keys:
-            if key not in result:
-                raise KeyError(f"Missing required key: {key}")
-        
-        # Validate score ranges
-        for score_key in ["visual_score", "audio_score", "text_alignment_score", 
-                         "multimodal_agreement", "threat_severity_index"]:
-            if not (0 <= result[score_key] <= 1):
-                result[score_key] = max(0, min(1, result[score_key]))  # Clamp to 0-1
-        
-        # Beautiful output formatting
-        threat_level = "🔴 HIGH" if result["threat_severity_index"] > 0.7 else "🟡 MEDIUM" if result["threat_severity_index"] > 0.4 else "🟢 LOW"
-        confidence = "🎯 HIGH" if result["multimodal_agreement"] > 0.7 else "⚠️ MEDIUM" if result["multimodal_agreement"] > 0.4 else "❓ LOW"
-        
-        print("✅ TIER 2 AI ANALYSIS COMPLETE")
-        print("-"*70)
-        print(f"🎯 Threat Level: {threat_level} ({result['threat_severity_index']:.1%})")
-        print(f"🤝 AI Confidence: {confidence} ({result['multimodal_agreement']:.1%})")
-        print(f"👁️  Visual Score: {result['visual_score']:.1%}")
-        print(f"🎤 Audio Score: {result['audio_score']:.1%}")
-        print("-"*70)
-        print("🧠 AI Reasoning:")
-        print(f"   {result['reasoning_summary']}")
-        print("="*70 + "\n")
-        
+    evidence = {
+        "audio_transcript": audio_transcript,
+        "captions": captions,
+        "visual_anomaly_max": visual_anomaly_max,
+        "tier1_details": tier1_details,
+        "tier1_signals": tier1_signals
+    }
+    result = Future()
+    
+    if LOCAL_TIER2_MODE == "primary":
+        result.set_result(_log_local_result(local_tier2_engine.analyze(**evidence)))
         return result
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error in Tier 2: {e}")
-        print(f"📄 Raw LLM output: {output}")
-        print(f"🔍 Debug - Output length: {len(output) if 'output' in locals() else 'undefined'}")
-        
-        # Enhanced fallback with actual data-based scoring
-        fallback_visual_score = min(1.0, visual_anomaly_max * 2)  # Scale up the visual score
-        fallback_audio_score = 0.3 if audio_transcript and len(audio_transcript.strip()) > 0 else 0.1
-        fallback_threat = (fallback_visual_score + fallback_audio_score) / 2
-        
-        print("⚠️  USING FALLBACK ANALYSIS (JSON Parse Error)")
-        print("-"*70)
-        
-        reasoning = f"JSON parsing failed - using fallback analysis. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {bool(audio_transcript)}"
-        
-        result = {
-            "visual_score": fallback_visual_score,
-            "audio_score": fallback_audio_score,
-            "text_alignment_score": 0.4,
-            "multimodal_agreement": 0.4,
-            "reasoning_summary": reasoning,
-            "threat_severity_index": fallback_threat
-        }
-        
-        print(f"🎯 Fallback Threat: {fallback_threat:.1%}")
-        print(f"👁️  Visual Score: {fallback_visual_score:.1%}")
-        print(f"🎤 Audio Score: {fallback_audio_score:.1%}")
+    
+    # Repeat evidence (same incident, consecutive frames) is answered from the cache
+    key = tier2_fingerprint(audio_transcript, captions, visual_anomaly_max, tier1_details, tier1_signals=tier1_signals)
+    cached = tier2_cache.get(key)
+    if cached is not None:
+        cached["cache_hit"] = True
+        print(f"♻️ Tier 2 cache hit ({key}) - reusing previous AI analysis")
         print("="*70 + "\n")
-        
+        result.set_result(cached)
         return result
-        
+    in_flight = tier2_cache.begin(key)
+    if in_flight is not None:
+        print(f"♻️ Identical Tier 2 evidence already sent to the LLM ({key}) - sharing its answer")
+        in_flight.add_done_callback(lambda f: result.set_result({**f.result(), "cache_hit": True}))
+        return result
+    
+    # Only the request that owns the key asks the breaker, so joiners never take the half-open trial
+    if not llm_client.breaker.allow():
+        print("⚡ LLM circuit open - answering from the local Tier 2 engine")
+        fusion_result = _tier2_fallback(evidence, "LLM circuit open - skipped remote call", "Circuit Open")
+        tier2_cache.complete(key, fusion_result, cacheable=False)
+        result.set_result(fusion_result)
+        return result
+    
+    print(f"🤖 Sending data to LLM ({llm_client.model}){f' for stream {stream_id}' if stream_id else ''}...")
+    
+    def on_llm(llm_future):
+        try:
+            fusion_result = _finish_tier2(llm_future, evidence)
+        except Exception as e:
+            fusion_result = _tier2_fallback(evidence, f"Tier 2 fusion error: {e}", "Tier 2 Error")
+        tier2_cache.complete(key, fusion_result, cacheable=not fusion_result.get("fallback"))
+        result.set_result(fusion_result)
+    
+    try:
+        llm_future = llm_client.submit_coalesced(stream_id, evidence, build_tier2_prompt)
     except Exception as e:
-        print(f"❌ Error in Tier 2 fusion: {type(e).__name__}: {e}")
-        print(f"🔑 Groq API key present: {'Yes' if os.getenv('GROQ_API_KEY') else 'No'}")
-        
-        # Check for rate limiting specifically
-        if "rate_limit_exceeded" in str(e) or "Rate limit reached" in str(e):
-            print("⚠️  RATE LIMIT EXCEEDED - Groq API daily token limit reached!")
-            print("💡 Solutions:")
-            print("   1. Wait for rate limit reset (usually daily)")
-            print("   2. Upgrade to Groq Pro tier for higher limits")
-            print("   3. Using fallback analysis for now...")
-        elif "Error code: 429" in str(e):
-            print("⚠️  GROQ API RATE LIMITED - Too many requests")
-            print("💡 Using fallback analysis until rate limit resets...")
-        
-        if hasattr(e, 'response'):
-            print(f"📡 API Response: {e.response}")
-        import traceback
-        print(f"📋 Full traceback: {traceback.format_exc()}")
-        
-        # Enhanced fallback with actual data-based scoring
-        fallback_visual_score = min(1.0, visual_anomaly_max * 2)  # Scale up the visual score
-        fallback_audio_score = 0.3 if audio_transcript and len(audio_transcript.strip()) > 0 else 0.1
-        fallback_threat = (fallback_visual_score + fallback_audio_score) / 2
-        
-        print("⚠️  USING FALLBACK ANALYSIS (Groq API Unavailable)")
-        print("-"*70)
-        
-        # Determine fallback reasoning based on available data
-        if "rate_limit" in str(e).lower():
-            reasoning = f"Rate limit reached - using local analysis. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {bool(audio_transcript)}"
-        else:
-            reasoning = f"AI reasoning unavailable - using fallback. Visual anomaly: {visual_anomaly_max:.2f}, Audio available: {bool(audio_transcript)}"
-        
-        result = {
-            "visual_score": fallback_visual_score,
-            "audio_score": fallback_audio_score,
-            "text_alignment_score": 0.4,
-            "multimodal_agreement": 0.4,
-            "reasoning_summary": reasoning,
-            "threat_severity_index": fallback_threat
-        }
-        
-        print(f"🎯 Fallback Threat: {fallback_threat:.1%}")
-        print(f"👁️  Visual Score: {fallback_visual_score:.1%}")
-        print(f"🎤 Audio Score: {fallback_audio_score:.1%}")
-        print("💡 Note: Upgrade Groq API tier for full AI reasoning")
-        print("="*70 + "\n")
-        
-        return result
\ No newline at end of file
+        # Nothing was sent: release the in-flight key so joined requests don't wait forever
+        fusion_result = _tier2_fallback(evidence, f"Tier 2 submit error: {e}", "Tier 2 Error")
+        tier2_cache.complete(key, fusion_result, cacheable=False)
+        result.set_result(fusion_result)
+        return result
+    llm_future.add_done_callback(on_llm)
+    return result
+
+def tier2_fusion(audio_transcript, captions, visual_anomaly_max, tier1_details, stream_id=None, tier1_signals=None):
+    """Blocking Tier 2 fusion; see submit_tier2_fusion"""
+    return submit_tier2_fusion(audio_transcript, captions, visual_anomaly_max, tier1_details, stream_id, tier1_signals).result()
@@ -0,0 +1,131 @@
+import os
+import time
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+import torch
+
+# Thread configuration
+# INFERENCE_THREADS sets the default intra-op thread count for every model and
+# INFERENCE_THREADS_<MODEL> (e.g. INFERENCE_THREADS_WHISPER_LARGE=2) overrides it per model.
+# torch's intra-op pool is process wide, so calls that need different counts are serialized:
+# a call only changes the count once every call running under the previous count has finished.
+DEFAULT_THREADS = int(os.getenv("INFERENCE_THREADS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+INTEROP_THREADS = int(os.getenv("INFERENCE_INTEROP_THREADS", "1"))
+
+# CPU precision variants: fp32 (default), bf16 or int8 (dynamic quantization of Linear layers)
+SUPPORTED_PRECISIONS = ("fp32", "bf16", "int8")
+
+try:
+    # Only allowed before torch starts any inter-op parallel work
+    torch.set_num_interop_threads(INTEROP_THREADS)
+except RuntimeError as e:
+    print(f"⚠️ Could not set inter-op threads to {INTEROP_THREADS}: {e}")
+
+
+def threads_for(model_name):
+    """Intra-op thread count configured for a model"""
+    override = os.getenv(f"INFERENCE_THREADS_{model_name.upper()}")
+    return max(1, int(override)) if override else DEFAULT_THREADS
+
+
+def precision_for(model_name):
+    """CPU precision configured for a model via INFERENCE_PRECISION_<MODEL>"""
+    precision = os.getenv(f"INFERENCE_PRECISION_{model_name.upper()}", "fp32").lower()
+    if precision not in SUPPORTED_PRECISIONS:
+        print(f"⚠️ Unknown precision '{precision}' for {model_name}, using fp32")
+        return "fp32"
+    return precision
+
+
+def apply_precision(model, precision):
+    """Return a bf16 or dynamic-int8 CPU variant of a torch model (fp32 returns it unchanged)"""
+    if precision == "bf16":
+        return model.to(torch.bfloat16)
+    if precision == "int8":
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def match_input_dtype(inputs, model):
+    """Cast floating point processor outputs (pixel_values) to the model's parameter dtype"""
+    dtype = next(model.parameters()).dtype
+    if dtype == torch.float32:
+        return inputs
+    for key, value in inputs.items():
+        if torch.is_tensor(value) and value.is_floating_point():
+            inputs[key] = value.to(dtype)
+    return inputs
+
+
+class InferenceRuntime:
+    """
+    Single entry point for model forward calls: runs them under torch.inference_mode,
+    pins the intra-op thread count per model and keeps per-model latency statistics.
+    Calls sharing a thread count run concurrently; a call with a different count waits
+    until the running ones finish, so the count in the stats is the one actually used.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = Lock()
+        self._threads_ready = Condition()
+        self._active_threads = None  # Intra-op count applied for the calls in flight
+        self._active_calls = 0
+        self._waiting = 0  # Calls waiting for a different count; new calls queue behind them
+
+    def _acquire_threads(self, threads):
+        with self._threads_ready:
+            while self._active_calls and (self._active_threads != threads or self._waiting):
+                self._waiting += 1
+                self._threads_ready.wait()
+                self._waiting -= 1
+            if self._active_calls == 0 and torch.get_num_threads() != threads:
+                torch.set_num_threads(threads)
+            self._active_threads = threads
+            self._active_calls += 1
+
+    def _release_threads(self):
+        with self._threads_ready:
+            self._active_calls -= 1
+            if self._active_calls == 0:
+                self._threads_ready.notify_all()
+
+    @contextmanager
+    def session(self, model_name):
+        threads = threads_for(model_name)
+        self._acquire_threads(threads)
+
+        start = time.perf_counter()
+        try:
+            with torch.inference_mode():
+                yield
+        finally:
+            self._release_threads()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats = self._stats.setdefault(model_name, {"calls": 0, "total_ms": 0.0, "threads": threads})
+                stats["calls"] += 1
+                stats["total_ms"] += elapsed_ms
+                stats["threads"] = threads
+
+    def run(self, model_name, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) inside an inference session for model_name"""
+        with self.session(model_name):
+            return fn(*args, **kwargs)
+
+    def stats(self):
+        """Per-model call counts and average latency"""
+        with self._lock:
+            return {
+                name: {
+                    "calls": s["calls"],
+                    "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0,
+                    "threads": s["threads"]
+                }
+                for name, s in self._stats.items()
+            }
+
+
+# Global runtime shared by all pipelines
+inference_runtime = InferenceRuntime()
@@ -0,0 +1,136 @@
+import numpy as np
+
+# MediaPipe pose landmark indices used by the movement tests
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+NUM_LANDMARKS = 33
+
+WRISTS = np.array([LEFT_WRIST, RIGHT_WRIST])
+SHOULDERS = np.array([LEFT_SHOULDER, RIGHT_SHOULDER])
+
+# Thresholds (normalized image coordinates) - same values as the original per-landmark checks
+WRIST_SPEED_THRESHOLD = 0.15   # Rapid arm movement (punching)
+HEAD_MOVEMENT_THRESHOLD = 0.08  # Bending, falling
+TORSO_CHANGE_THRESHOLD = 0.05   # Shoulder-hip distance change
+ARM_EXTENSION_X = 0.2           # Wrist this far sideways from the shoulder
+ARM_RAISE_Y = 0.1               # Wrist this far above the shoulder
+FALL_RATIO_STREAMING = 0.4      # bbox height/width below this is a fall/crawl (live)
+FALL_RATIO_BATCH = 0.5          # Same test for offline process_pose
+
+# One structured record per analysed pose
+POSE_FEATURE_DTYPE = np.dtype([
+    ("left_wrist_speed", np.float32),
+    ("right_wrist_speed", np.float32),
+    ("head_movement", np.float32),
+    ("torso_change", np.float32),
+    ("bbox_ratio", np.float32),
+    ("arm_extended", np.bool_),
+    ("arm_raised", np.bool_),
+    ("has_previous", np.bool_),
+])
+
+
+def landmarks_to_array(landmarks):
+    """Convert MediaPipe NormalizedLandmarks once into a (33, 3) float32 array of x, y, z"""
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def bbox_ratios(poses, width, height):
+    """Height/width of the landmark bounding box in pixels for one (33, 3) pose or a (N, 33, 3) stack"""
+    extent = np.ptp(poses[..., :2], axis=-2) * np.array([width, height], dtype=np.float32)
+    return extent[..., 1] / (extent[..., 0] + 1e-6)
+
+
+def compute_features(current, previous, width, height):
+    """
+    Movement features between consecutive poses, vectorized over a leading batch axis.
+    `current` is (33, 3) or (N, 33, 3); `previous` has the same shape, or is None for
+    the first pose of a stream (speeds and deltas are then zero).
+    """
+    current = np.asarray(current, dtype=np.float32)
+    features = np.zeros(current.shape[:-2], dtype=POSE_FEATURE_DTYPE)
+    features["bbox_ratio"] = bbox_ratios(current, width, height)
+
+    xy = current[..., :2]
+    wrist_offset = xy[..., WRISTS, :] - xy[..., SHOULDERS, :]
+    features["arm_extended"] = np.any(np.abs(wrist_offset[..., 0]) > ARM_EXTENSION_X, axis=-1)
+    features["arm_raised"] = np.any(wrist_offset[..., 1] < -ARM_RAISE_Y, axis=-1)
+
+    if previous is None:
+        return features
+
+    prev_xy = np.asarray(previous, dtype=np.float32)[..., :2]
+    speeds = np.linalg.norm(xy[..., [LEFT_WRIST, RIGHT_WRIST, NOSE], :] - prev_xy[..., [LEFT_WRIST, RIGHT_WRIST, NOSE], :], axis=-1)
+    torso = np.linalg.norm(xy[..., LEFT_SHOULDER, :] - xy[..., LEFT_HIP, :], axis=-1)
+    prev_torso = np.linalg.norm(prev_xy[..., LEFT_SHOULDER, :] - prev_xy[..., LEFT_HIP, :], axis=-1)
+
+    features["left_wrist_speed"] = speeds[..., 0]
+    features["right_wrist_speed"] = speeds[..., 1]
+    features["head_movement"] = speeds[..., 2]
+    features["torso_change"] = np.abs(torso - prev_torso)
+    features["has_previous"] = True
+    return features
+
+
+def movement_flags(features):
+    """Boolean masks for each aggressive-movement test (needs a previous pose)"""
+    moving = features["has_previous"]
+    return {
+        "rapid_arm": moving & ((features["left_wrist_speed"] > WRIST_SPEED_THRESHOLD) |
+                               (features["right_wrist_speed"] > WRIST_SPEED_THRESHOLD)),
+        "head_movement": moving & (features["head_movement"] > HEAD_MOVEMENT_THRESHOLD),
+        "torso_bending": moving & (features["torso_change"] > TORSO_CHANGE_THRESHOLD),
+        "raised_arm": moving & features["arm_extended"] & features["arm_raised"],
+    }
+
+
+def is_aggressive(features):
+    """True where any movement test fires"""
+    flags = movement_flags(features)
+    return flags["rapid_arm"] | flags["head_movement"] | flags["torso_bending"] | flags["raised_arm"]
+
+
+def is_fall(features, ratio_threshold=FALL_RATIO_STREAMING):
+    """True where the body bounding box is wider than tall (fall/crawl)"""
+    return features["bbox_ratio"] < ratio_threshold
+
+
+class LandmarkEngine:
+    """
+    Per-stream pose history: a small preallocated ring buffer of (33, 3) poses.
+    push() stores the new pose and returns its feature record against the previous one.
+    """
+
+    def __init__(self, history=4):
+        self._buffer = np.zeros((max(2, history), NUM_LANDMARKS, 3), dtype=np.float32)
+        self._next = 0
+        self._count = 0
+        self.last_features = None
+
+    def previous(self):
+        """Most recent stored pose, or None"""
+        if self._count == 0:
+            return None
+        return self._buffer[(self._next - 1) % len(self._buffer)]
+
+    def history(self):
+        """Stored poses, oldest first, as a (n, 33, 3) array"""
+        n = min(self._count, len(self._buffer))
+        order = np.arange(self._next - n, self._next) % len(self._buffer)
+        return self._buffer[order]
+
+    def push(self, pose, width, height):
+        features = compute_features(pose, self.previous(), width, height)
+        self._buffer[self._next] = pose
+        self._next = (self._next + 1) % len(self._buffer)
+        self._count += 1
+        self.last_features = features
+        return features
+
+    def reset(self):
+        self._next = 0
+        self._count = 0
+        self.last_features = None
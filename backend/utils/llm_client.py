@@ -0,0 +1,307 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import Future
+from threading import Thread, Lock
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# LLM endpoint (OpenAI-compatible chat completions; Groq by default, the stub server in benchmarks)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "0.5"))  # Doubles per retry, with jitter
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "8"))  # Pooled keep-alive connections
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # Requests in flight at once
+LLM_MAX_PENDING = int(os.getenv("LLM_MAX_PENDING", "32"))  # Beyond this, requests fail fast
+LLM_COALESCE_MS = float(os.getenv("LLM_COALESCE_MS", "300"))  # 0 disables coalescing
+LLM_COALESCE_MAX = int(os.getenv("LLM_COALESCE_MAX", "8"))  # Requests merged into one prompt at most
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))  # Consecutive failures that open the circuit
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "60"))  # Open time before a trial call
+
+
+class LLMError(Exception):
+    """LLM request failure; `retryable` marks timeouts, transport errors, 429 and 5xx"""
+
+    def __init__(self, message, status=None, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency: after `failure_threshold` consecutive failures the
+    circuit opens and allow() answers False for `reset_seconds`; then a single trial call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=LLM_BREAKER_FAILURES, reset_seconds=LLM_BREAKER_RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = Lock()
+        self.stats = {"opened": 0, "short_circuited": 0}
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            # A trial that never reports back (e.g. rejected before sending) gets retried after another period
+            if time.time() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._opened_at = time.time()
+                return True
+            self.stats["short_circuited"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print("🔌 LLM circuit closed - remote calls resumed")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+                self.state = "open"
+                self._opened_at = time.time()
+                self.stats["opened"] += 1
+                print(f"⚡ LLM circuit open after {self._failures} failure(s) - retrying in {self.reset_seconds:.0f}s")
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "state": self.state, "consecutive_failures": self._failures}
+
+
+class AsyncLLMClient:
+    """
+    Chat-completions client on a private asyncio loop (one daemon thread) with a pooled
+    httpx.AsyncClient, per-attempt timeouts, retries with exponential backoff and a cap on
+    concurrent requests. Worker threads get concurrent.futures.Future objects back, so a
+    Tier 2 worker can hand off the LLM call and move on to the next job.
+
+    Coalescing: requests submitted with the same key (e.g. a stream id) within the
+    coalescing window are merged into a single prompt by the caller's build_prompt, and
+    every waiter receives the one response.
+    """
+
+    def __init__(self, base_url=LLM_BASE_URL, api_key=None, model=LLM_MODEL,
+                 timeout=LLM_TIMEOUT_SECONDS, connect_timeout=LLM_CONNECT_TIMEOUT_SECONDS,
+                 max_retries=LLM_MAX_RETRIES, backoff=LLM_BACKOFF_SECONDS,
+                 max_connections=LLM_MAX_CONNECTIONS, max_concurrency=LLM_MAX_CONCURRENCY,
+                 max_pending=LLM_MAX_PENDING, coalesce_ms=LLM_COALESCE_MS, coalesce_max=LLM_COALESCE_MAX):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key if api_key is not None else os.getenv("GROQ_API_KEY")
+        self.model = model
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max(1, max_pending)
+        self.coalesce_window = max(0.0, coalesce_ms / 1000)
+        self.coalesce_max = max(1, coalesce_max)
+        self.breaker = CircuitBreaker()
+
+        self._loop = None
+        self._http = None
+        self._semaphore = None
+        self._batches = {}  # coalescing key -> {"payloads", "futures", "build_prompt"}; loop thread only
+        self._start_lock = Lock()
+        self._lock = Lock()
+        self._in_flight = 0
+        self.stats = {"requests": 0, "llm_calls": 0, "coalesced": 0, "retries": 0, "failed": 0,
+                      "rejected": 0, "latency_ms": 0.0}
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            ready = Future()
+            Thread(target=self._run_loop, args=(ready,), name="LLMClientLoop", daemon=True).start()
+            ready.result()
+
+    def _run_loop(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        self._http = httpx.AsyncClient(base_url=self.base_url, headers=headers, timeout=self.timeout, limits=limits)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = loop
+        print(f"🔌 LLM client ready: {self.base_url} ({self.model}), {self.max_concurrency} concurrent, "
+              f"coalescing {self.coalesce_window * 1000:.0f} ms")
+        ready.set_result(True)
+        loop.run_forever()
+
+    def _admit(self, count=1):
+        """Reserve backlog room for a request, or a failed future if the backlog is full"""
+        with self._lock:
+            self.stats["requests"] += count
+            if self._in_flight >= self.max_pending:
+                self.stats["rejected"] += count
+                future = Future()
+                future.set_exception(LLMError(f"LLM backlog full ({self.max_pending} pending)"))
+                return future
+            self._in_flight += count
+        return None
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    def submit(self, prompt, temperature=0.1):
+        """Send one prompt; returns a Future resolving to the response text (or raising LLMError)"""
+        rejected = self._admit()
+        if rejected:
+            return rejected
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._chat(prompt, temperature), self._loop)
+        future.add_done_callback(self._release)
+        return future
+
+    def submit_coalesced(self, key, payload, build_prompt, temperature=0.1):
+        """
+        Queue `payload` under `key`. Once the coalescing window closes (or the batch is full),
+        build_prompt(payloads) turns every payload queued under the key into one prompt.
+        Returns a Future resolving to (response text, number of requests merged).
+        """
+        if key is None or self.coalesce_window <= 0:
+            future = Future()
+            inner = self.submit(build_prompt([payload]), temperature)
+            inner.add_done_callback(lambda f: _chain(f, future, lambda text: (text, 1)))
+            return future
+
+        rejected = self._admit()
+        if rejected:
+            return rejected
+        self._ensure_started()
+        future = Future()
+        future.add_done_callback(self._release)
+        self._loop.call_soon_threadsafe(self._enqueue, key, payload, build_prompt, temperature, future)
+        return future
+
+    def complete(self, prompt, temperature=0.1):
+        """Blocking helper for callers without their own pipelining"""
+        return self.submit(prompt, temperature).result()
+
+    def _enqueue(self, key, payload, build_prompt, temperature, future):
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = {"payloads": [], "futures": [], "build_prompt": build_prompt, "temperature": temperature}
+            self._batches[key] = batch
+            batch["timer"] = self._loop.call_later(self.coalesce_window, self._flush, key)
+        batch["payloads"].append(payload)
+        batch["futures"].append(future)
+        if len(batch["payloads"]) >= self.coalesce_max:
+            batch["timer"].cancel()
+            self._flush(key)
+
+    def _flush(self, key):
+        batch = self._batches.pop(key, None)
+        if batch is not None:
+            self._loop.create_task(self._send_batch(batch))
+
+    async def _send_batch(self, batch):
+        futures = batch["futures"]
+        with self._lock:
+            self.stats["coalesced"] += len(futures) - 1
+        try:
+            prompt = batch["build_prompt"](batch["payloads"])
+            text = await self._chat(prompt, batch["temperature"])
+            for future in futures:
+                future.set_result((text, len(futures)))
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+
+    async def _chat(self, prompt, temperature):
+        if not self.api_key:
+            self.breaker.record_failure()
+            raise LLMError("LLM API key missing - set GROQ_API_KEY")
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature
+        }
+        async with self._semaphore:
+            start = time.perf_counter()
+            attempt = 0
+            while True:
+                try:
+                    text = await self._post(payload)
+                    with self._lock:
+                        self.stats["llm_calls"] += 1
+                        self.stats["latency_ms"] += (time.perf_counter() - start) * 1000
+                    self.breaker.record_success()
+                    return text
+                except LLMError as e:
+                    if not e.retryable or attempt >= self.max_retries:
+                        with self._lock:
+                            self.stats["failed"] += 1
+                        self.breaker.record_failure()
+                        raise
+                    delay = e.retry_after if e.retry_after else self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+                    attempt += 1
+                    with self._lock:
+                        self.stats["retries"] += 1
+                    print(f"🔁 LLM retry {attempt}/{self.max_retries} in {delay:.1f}s ({e})")
+                    await asyncio.sleep(min(delay, LLM_BACKOFF_MAX_SECONDS))
+
+    async def _post(self, payload):
+        try:
+            response = await self._http.post("/chat/completions", json=payload)
+        except httpx.TimeoutException as e:
+            raise LLMError(f"LLM request timed out: {type(e).__name__}", retryable=True)
+        except httpx.TransportError as e:
+            raise LLMError(f"LLM transport error: {type(e).__name__}: {e}", retryable=True)
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("retry-after")
+            raise LLMError(
+                f"Error code: {response.status_code} - {response.text[:300]}", status=response.status_code,
+                retryable=True, retry_after=float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+            )
+        if response.status_code >= 400:
+            raise LLMError(f"Error code: {response.status_code} - {response.text[:300]}", status=response.status_code)
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError) as e:
+            raise LLMError(f"Malformed LLM response: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            calls = self.stats["llm_calls"]
+            return {
+                **{key: value for key, value in self.stats.items() if key != "latency_ms"},
+                "in_flight": self._in_flight,
+                "avg_latency_ms": round(self.stats["latency_ms"] / calls, 1) if calls else 0.0,
+                "base_url": self.base_url,
+                "model": self.model,
+                "circuit": self.breaker.get_stats()
+            }
+
+
+def _chain(source, target, transform):
+    """Copy a finished future's outcome into another future through transform"""
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(transform(source.result()))
+
+
+# Global client shared by every Tier 2 stage
+llm_client = AsyncLLMClient()
@@ -0,0 +1,160 @@
+import os
+import re
+import time
+from threading import Lock
+
+# Local Tier 2 engine configuration
+LOCAL_TIER2_MODE = os.getenv("LOCAL_TIER2_MODE", "fallback")  # primary | fallback | shadow | off
+LOCAL_TIER2_MODES = ("primary", "fallback", "shadow", "off")
+if LOCAL_TIER2_MODE not in LOCAL_TIER2_MODES:
+    print(f"⚠️ Unknown LOCAL_TIER2_MODE '{LOCAL_TIER2_MODE}', using fallback")
+    LOCAL_TIER2_MODE = "fallback"
+# Threat weights for the visual, audio, pose and Tier 1 scene components
+DEFAULT_WEIGHTS = (0.35, 0.25, 0.25, 0.15)
+
+
+def _parse_weights(raw):
+    try:
+        return tuple(float(w) for w in raw.split(","))
+    except ValueError:
+        print(f"⚠️ Invalid LOCAL_TIER2_WEIGHTS '{raw}', using defaults")
+        return DEFAULT_WEIGHTS
+
+
+LOCAL_TIER2_WEIGHTS = _parse_weights(os.getenv("LOCAL_TIER2_WEIGHTS", "0.35,0.25,0.25,0.15"))
+
+# Caption keywords per anomaly type, with the visual threat each one implies
+CAPTION_KEYWORDS = {
+    "fall": (0.8, ("lying", "fallen", "falling", "fell", "on the floor", "on the ground", "collapsed", "laying")),
+    "aggression": (0.9, ("fight", "fighting", "punch", "punching", "hitting", "attack", "kicking", "knife", "gun", "weapon", "struggle")),
+    "medical emergency": (0.85, ("unconscious", "bleeding", "blood", "seizure", "passed out", "injured", "stretcher")),
+}
+NORMAL_CAPTION_KEYWORDS = ("sitting", "standing", "walking", "smiling", "talking", "cooking", "reading", "playing")
+DISTRESS_KEYWORDS = ("help", "ambulance", "call 911", "emergency", "hurts", "hurt", "pain", "stop", "fire", "police", "ouch", "ow")
+
+
+def _mentions(text, keyword):
+    """Whole-word keyword match, so 'gun' does not fire on 'begun'"""
+    return re.search(rf"\b{re.escape(keyword)}\b", text) is not None
+
+
+def _clamp(value):
+    return max(0.0, min(1.0, value))
+
+
+def threat_level(score):
+    return "high" if score > 0.7 else "medium" if score > 0.4 else "low"
+
+
+class LocalTier2Engine:
+    """
+    Offline Tier 2 reasoning: a weighted score over the Tier 1 and Tier 2 components (CLIP-L
+    visual probability, caption keywords, transcript distress words, pose flag, Tier 1 scene
+    probability). Pure Python on a handful of strings, so it answers in well under a millisecond
+    and produces the same result keys as the LLM path.
+    """
+
+    def __init__(self, weights=LOCAL_TIER2_WEIGHTS):
+        if len(weights) != 4:
+            print(f"⚠️ LOCAL_TIER2_WEIGHTS needs 4 values, got {len(weights)}; using defaults")
+            weights = DEFAULT_WEIGHTS
+        total = sum(weights) or 1.0
+        self.weights = tuple(w / total for w in weights)
+        self._lock = Lock()
+        self.stats = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "shadow_compared": 0,
+                      "shadow_level_agreement": 0, "shadow_abs_error": 0.0}
+
+    def _caption_signal(self, captions):
+        text = " ".join(captions or []).lower()
+        anomaly_type, caption_threat = None, 0.0
+        for name, (threat, keywords) in CAPTION_KEYWORDS.items():
+            if threat > caption_threat and any(_mentions(text, keyword) for keyword in keywords):
+                anomaly_type, caption_threat = name, threat
+        normal_cues = anomaly_type is None and any(_mentions(text, keyword) for keyword in NORMAL_CAPTION_KEYWORDS)
+        return anomaly_type, caption_threat, normal_cues
+
+    def _audio_signal(self, audio_transcript):
+        words = (audio_transcript or "").lower()
+        if not words.strip():
+            return 0.1, []
+        hits = [keyword for keyword in DISTRESS_KEYWORDS if _mentions(words, keyword)]
+        return (0.9 if len(hits) > 1 else 0.7 if hits else 0.2), hits
+
+    def analyze(self, audio_transcript, captions, visual_anomaly_max, tier1_details, tier1_signals=None):
+        """tier1_details is display text only; the pose flag and scene probability come from tier1_signals"""
+        start = time.perf_counter()
+        pose_anomaly = bool(tier1_signals and tier1_signals.pose_anomaly)
+        scene_prob = tier1_signals.scene_prob if tier1_signals else 0.0
+
+        anomaly_type, caption_threat, normal_cues = self._caption_signal(captions)
+        audio_score, distress_words = self._audio_signal(audio_transcript)
+        visual_score = _clamp(0.6 * _clamp(visual_anomaly_max * 2) + 0.4 * caption_threat - (0.15 if normal_cues else 0.0))
+        pose_score = 1.0 if pose_anomaly else 0.0
+
+        w_visual, w_audio, w_pose, w_scene = self.weights
+        threat = _clamp(w_visual * visual_score + w_audio * audio_score + w_pose * pose_score + w_scene * _clamp(scene_prob * 2))
+
+        # Agreement: how many of the independent modalities point the same way as the verdict
+        votes = [visual_score > 0.5, audio_score > 0.5, pose_anomaly]
+        agreeing = sum(votes) if threat > 0.4 else len(votes) - sum(votes)
+        multimodal_agreement = round(agreeing / len(votes), 2)
+        if anomaly_type is None:
+            anomaly_type = "fall" if pose_anomaly else "false positive" if threat <= 0.4 else "unclear anomaly"
+        text_alignment = _clamp(0.5 + (0.3 if caption_threat and (pose_anomaly or scene_prob > 0.35) else 0.0)
+                                + (0.2 if distress_words else 0.0) - (0.3 if normal_cues and pose_anomaly else 0.0))
+
+        reasoning = (
+            f"Local analysis: pose {'shows an anomalous posture' if pose_anomaly else 'looks normal'} and the Tier 1 scene "
+            f"probability is {scene_prob:.2f}. The scene is described as '{' | '.join(captions) if captions else 'unknown'}' "
+            f"with visual anomaly probability {visual_anomaly_max:.2f}. "
+            f"{'Audio contains distress words: ' + ', '.join(distress_words) + '.' if distress_words else 'Audio has no distress indicators.'} "
+            f"{sum(votes)} of {len(votes)} modalities indicate an anomaly; most likely type: {anomaly_type}. "
+            f"Threat {threat:.2f} ({threat_level(threat)}) from weighted visual, audio, pose and scene scores."
+        )
+        result = {
+            "visual_score": round(visual_score, 3),
+            "audio_score": round(audio_score, 3),
+            "text_alignment_score": round(text_alignment, 3),
+            "multimodal_agreement": multimodal_agreement,
+            "reasoning_summary": reasoning,
+            "threat_severity_index": round(threat, 3),
+            "anomaly_type": anomaly_type,
+            "engine": "local"
+        }
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["total_ms"] += elapsed_ms
+            self.stats["max_ms"] = max(self.stats["max_ms"], elapsed_ms)
+        return result
+
+    def shadow(self, audio_transcript, captions, visual_anomaly_max, tier1_details, llm_result, tier1_signals=None):
+        """Score the same evidence locally and compare with the LLM verdict"""
+        local = self.analyze(audio_transcript, captions, visual_anomaly_max, tier1_details, tier1_signals)
+        error = abs(local["threat_severity_index"] - llm_result["threat_severity_index"])
+        same_level = threat_level(local["threat_severity_index"]) == threat_level(llm_result["threat_severity_index"])
+        with self._lock:
+            self.stats["shadow_compared"] += 1
+            self.stats["shadow_level_agreement"] += same_level
+            self.stats["shadow_abs_error"] += error
+        return {"threat_severity_index": local["threat_severity_index"], "anomaly_type": local["anomaly_type"],
+                "abs_error": round(error, 3), "same_level": same_level}
+
+    def get_stats(self):
+        with self._lock:
+            calls = self.stats["calls"]
+            compared = self.stats["shadow_compared"]
+            return {
+                "calls": calls,
+                "avg_ms": round(self.stats["total_ms"] / calls, 3) if calls else 0.0,
+                "max_ms": round(self.stats["max_ms"], 3),
+                "shadow_compared": compared,
+                "shadow_level_agreement": round(self.stats["shadow_level_agreement"] / compared, 3) if compared else None,
+                "shadow_mean_abs_error": round(self.stats["shadow_abs_error"] / compared, 3) if compared else None,
+                "weights": list(self.weights)
+            }
+
+
+# Global engine shared by every Tier 2 stage
+local_tier2_engine = LocalTier2Engine()
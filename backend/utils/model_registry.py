@@ -0,0 +1,138 @@
+import gc
+import os
+import time
+from threading import Lock
+
+
+def _rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _tensor_bytes(obj):
+    """Parameter + buffer bytes of any torch modules inside obj (a module or a tuple of objects)"""
+    if isinstance(obj, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in obj)
+    if hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+        try:
+            return sum(t.numel() * t.element_size() for t in list(obj.parameters()) + list(obj.buffers()))
+        except Exception:
+            return 0
+    return 0
+
+
+class ModelRegistry:
+    """
+    Central registry that loads each model the first time it is used.
+    Tracks load state, load time and memory, and supports explicit warm-up and unload.
+    """
+
+    def __init__(self):
+        self._specs = {}   # name -> {"loader", "unloader", "on_load", "description"}
+        self._models = {}  # name -> loaded object
+        self._info = {}    # name -> load statistics
+        self._lock = Lock()
+        self._load_locks = {}
+
+    def register(self, name, loader, description="", unloader=None, on_load=None):
+        """
+        Register a model loader. `loader()` returns the model object, `unloader(obj)`
+        releases native resources and `on_load(obj)` runs once after every load.
+        """
+        with self._lock:
+            self._specs[name] = {
+                "loader": loader,
+                "unloader": unloader,
+                "on_load": on_load,
+                "description": description
+            }
+            self._load_locks.setdefault(name, Lock())
+
+    def get(self, name):
+        """Return the model, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._specs:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._load_locks[name]:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            spec = self._specs[name]
+            print(f"📦 Loading {name} ({spec['description']})...")
+            rss_before = _rss_bytes()
+            start = time.time()
+            model = spec["loader"]()
+            load_seconds = time.time() - start
+            rss_after = _rss_bytes()
+
+            param_bytes = _tensor_bytes(model)
+            if param_bytes:
+                memory_bytes = param_bytes
+            elif rss_before is not None and rss_after is not None:
+                memory_bytes = max(0, rss_after - rss_before)
+            else:
+                memory_bytes = None
+
+            self._models[name] = model
+            self._info[name] = {
+                "load_seconds": round(load_seconds, 2),
+                "memory_mb": round(memory_bytes / (1024 * 1024), 1) if memory_bytes is not None else None,
+                "loaded_at": time.time()
+            }
+            print(f"   ✅ {name} loaded in {load_seconds:.1f}s")
+
+            if spec["on_load"]:
+                spec["on_load"](model)
+            return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def warm_up(self, names=None):
+        """Load the given models (all registered models if None); returns the names loaded"""
+        names = list(self._specs) if names is None else names
+        for name in names:
+            self.get(name)
+        return names
+
+    def unload(self, name):
+        """Drop a loaded model so its memory can be reclaimed; returns True if it was loaded"""
+        with self._load_locks.get(name, self._lock):
+            model = self._models.pop(name, None)
+            if model is None:
+                return False
+            self._info.pop(name, None)
+            unloader = self._specs[name]["unloader"]
+            if unloader:
+                try:
+                    unloader(model)
+                except Exception as e:
+                    print(f"⚠️ Error unloading {name}: {e}")
+            del model
+        gc.collect()
+        print(f"🗑️ Unloaded {name}")
+        return True
+
+    def status(self):
+        """Load state and memory of every registered model"""
+        return {
+            name: {
+                "description": spec["description"],
+                "loaded": name in self._models,
+                **self._info.get(name, {})
+            }
+            for name, spec in self._specs.items()
+        }
+
+
+# Global registry shared by all pipelines
+model_registry = ModelRegistry()
@@ -0,0 +1,102 @@
+import os
+import time
+from threading import Lock
+
+import cv2
+import numpy as np
+
+# Motion gate configuration
+MOTION_GATE_ENABLED = os.getenv("MOTION_GATE_ENABLED", "1") == "1"
+MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "0.02"))  # Share of changed pixels that counts as motion
+MOTION_PIXEL_DELTA = int(os.getenv("MOTION_PIXEL_DELTA", "25"))  # Grayscale change that counts a pixel as changed
+MOTION_HEARTBEAT_SECONDS = float(os.getenv("MOTION_HEARTBEAT_SECONDS", "5"))  # Full Tier 1 at least this often
+MOTION_GATE_WIDTH = 64  # Frames are compared at this width
+
+
+class MotionGate:
+    """
+    Cheap pre-filter in front of Tier 1. Each frame is downscaled to a small blurred grayscale
+    image and differenced against the last frame that got full analysis; if too few pixels
+    changed and the heartbeat interval has not passed, the caller reuses its previous Tier 1
+    result instead of running MediaPipe and CLIP again.
+    """
+
+    def __init__(self, threshold=MOTION_THRESHOLD, pixel_delta=MOTION_PIXEL_DELTA,
+                 heartbeat_seconds=MOTION_HEARTBEAT_SECONDS, enabled=MOTION_GATE_ENABLED):
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.heartbeat_seconds = heartbeat_seconds
+        self.enabled = enabled
+        self._reference = None
+        self._last_full_time = None
+        self._full_latency_ms = None  # Smoothed cost of one full Tier 1 run
+        self._lock = Lock()
+        self.last_score = 0.0
+        self.stats = {"frames": 0, "analyzed": 0, "skipped": 0, "gate_ms": 0.0, "latency_saved_ms": 0.0}
+
+    def _signature(self, frame):
+        height, width = frame.shape[:2]
+        small = cv2.resize(frame, (MOTION_GATE_WIDTH, max(1, MOTION_GATE_WIDTH * height // width)),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (3, 3), 0)
+
+    def should_analyze(self, frame, timestamp, force=False):
+        """
+        True if the frame needs full Tier 1 analysis: first frame, motion above the threshold,
+        heartbeat due, or `force` (e.g. new speech in the transcript).
+        """
+        start = time.perf_counter()
+        signature = self._signature(frame)
+
+        with self._lock:
+            self.stats["frames"] += 1
+            if self._reference is None or self._reference.shape != signature.shape:
+                self.last_score = 1.0
+            else:
+                diff = cv2.absdiff(signature, self._reference)
+                self.last_score = float(np.count_nonzero(diff > self.pixel_delta)) / diff.size
+
+            analyze = (
+                not self.enabled
+                or force
+                or self.last_score >= self.threshold
+                or self._last_full_time is None
+                or timestamp - self._last_full_time >= self.heartbeat_seconds
+            )
+            if analyze:
+                self._reference = signature
+                self._last_full_time = timestamp
+                self.stats["analyzed"] += 1
+            else:
+                self.stats["skipped"] += 1
+                if self._full_latency_ms is not None:
+                    self.stats["latency_saved_ms"] += self._full_latency_ms
+
+            gate_ms = (time.perf_counter() - start) * 1000
+            self.stats["gate_ms"] += gate_ms
+            if not analyze:
+                self.stats["latency_saved_ms"] -= gate_ms
+        return analyze
+
+    def record_analysis(self, latency_ms):
+        """Report the cost of a full Tier 1 run, used to estimate the latency saved by skips"""
+        with self._lock:
+            if self._full_latency_ms is None:
+                self._full_latency_ms = latency_ms
+            else:
+                self._full_latency_ms = 0.8 * self._full_latency_ms + 0.2 * latency_ms
+
+    def get_stats(self):
+        with self._lock:
+            frames = self.stats["frames"]
+            return {
+                "frames": frames,
+                "analyzed": self.stats["analyzed"],
+                "skipped": self.stats["skipped"],
+                "skip_ratio": round(self.stats["skipped"] / frames, 3) if frames else 0.0,
+                "last_motion_score": round(self.last_score, 4),
+                "avg_gate_ms": round(self.stats["gate_ms"] / frames, 3) if frames else 0.0,
+                "latency_saved_ms": round(self.stats["latency_saved_ms"], 1),
+                "enabled": self.enabled
+            }
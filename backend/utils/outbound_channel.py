@@ -0,0 +1,112 @@
+import asyncio
+import os
+from collections import deque
+from threading import Lock
+
+# Upper bound on queued outbound messages per WebSocket
+OUTBOUND_MAX_PENDING = int(os.getenv("OUTBOUND_MAX_PENDING", "100"))
+
+# Status messages where only the latest one matters; a newer one replaces any still queued
+COALESCE_TYPES = ("tier1_update", "progress")
+
+
+class OutboundChannel:
+    """
+    Thread-to-event-loop bridge for one WebSocket. Worker threads call send() from any
+    thread; a single drain coroutine on the server loop owns the socket and sends in order.
+    Coalescable status updates are collapsed when the client falls behind, and the queue
+    is bounded so a lagging dashboard cannot grow memory without limit.
+    """
+
+    def __init__(self, websocket, loop, max_pending=OUTBOUND_MAX_PENDING):
+        self.websocket = websocket
+        self.loop = loop
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._lock = Lock()
+        self._wakeup = None
+        self._task = None
+        self._closing = False
+        self.closed = False
+        self.stats = {"queued": 0, "sent": 0, "coalesced": 0, "dropped": 0}
+
+    def start(self):
+        """Start the drain coroutine; must be called from the server event loop"""
+        self._wakeup = asyncio.Event()
+        self._task = self.loop.create_task(self._drain())
+        return self
+
+    def send(self, message):
+        """Queue a JSON message for delivery; safe to call from any thread"""
+        if self.closed or self._closing:
+            return False
+
+        with self._lock:
+            message_type = message.get("type")
+            if message_type in COALESCE_TYPES:
+                for queued in self._pending:
+                    if queued.get("type") == message_type:
+                        self._pending.remove(queued)
+                        self.stats["coalesced"] += 1
+                        break
+
+            if len(self._pending) >= self.max_pending:
+                self._drop_one()
+
+            self._pending.append(message)
+            self.stats["queued"] += 1
+
+        self._notify()
+        return True
+
+    def _drop_one(self):
+        """Make room: prefer dropping a status update over an event"""
+        for queued in self._pending:
+            if queued.get("type") in COALESCE_TYPES:
+                self._pending.remove(queued)
+                break
+        else:
+            self._pending.popleft()
+        self.stats["dropped"] += 1
+
+    def _notify(self):
+        try:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Server loop already closed
+            self.closed = True
+
+    async def _drain(self):
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    message = self._pending.popleft()
+                try:
+                    await self.websocket.send_json(message)
+                    self.stats["sent"] += 1
+                except Exception as e:
+                    print(f"📡 WebSocket send failed, closing outbound channel: {e}")
+                    self.closed = True
+                    break
+
+            if self._closing:
+                self.closed = True
+
+    def close(self):
+        """Stop accepting messages; anything already queued is still delivered"""
+        self._closing = True
+        if self._wakeup is not None:
+            self._notify()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "pending": len(self._pending)}
@@ -1,11 +1,18 @@
 
 import os
 import sys
+import time
+from threading import Lock
 import cv2
 import mediapipe as mp
 from mediapipe.tasks import python as mp_tasks
 from mediapipe.tasks.python import vision as mp_vision
-import numpy as np
+from utils.frame_sampler import FrameSampler
+from utils.landmark_engine import (
+    LandmarkEngine, FALL_RATIO_BATCH, compute_features, is_aggressive, is_fall,
+    landmarks_to_array, movement_flags
+)
+from utils.model_registry import model_registry
 
 # Suppress TensorFlow and MediaPipe verbose logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress TF info/warning logs
@@ -23,215 +30,342 @@ class SuppressStderr:
         sys.stderr.close()
         sys.stderr = self._original_stderr
 
-print("🎯 Loading MediaPipe Pose Detection...")
-print("   └─ 📦 Loading pose_landmarker_heavy.task...")
-
-# Get the absolute path to the model file
-import os
-MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pose_landmarker_heavy.task")
+# Pose model variants (MediaPipe pose_landmarker_{lite,full,heavy}.task in the backend directory)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+POSE_MODEL_VARIANTS = ("lite", "full", "heavy")  # Cheapest to most accurate
+POSE_MODEL_PATHS = {variant: os.path.join(MODEL_DIR, f"pose_landmarker_{variant}.task") for variant in POSE_MODEL_VARIANTS}
 BaseOptions = mp_tasks.BaseOptions
 PoseLandmarker = mp_vision.PoseLandmarker
 PoseLandmarkerOptions = mp_vision.PoseLandmarkerOptions
 VisionRunningMode = mp_vision.RunningMode
 
-# Load model with stderr suppression
-with SuppressStderr():
-    options = PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=MODEL_PATH),
-        running_mode=VisionRunningMode.VIDEO
+# Pose model selection
+POSE_MODEL = os.getenv("POSE_MODEL", "heavy")  # Variant used when there is no load pressure
+POSE_MODEL_POLICY = os.getenv("POSE_MODEL_POLICY", "adaptive")  # adaptive | fixed
+TIER1_LATENCY_BUDGET_MS = float(os.getenv("TIER1_LATENCY_BUDGET_MS", "250"))
+POSE_UPGRADE_HOLD_MS = int(os.getenv("POSE_UPGRADE_HOLD_MS", "3000"))  # Heavy model after a suspected event
+
+def resolve_pose_variant(variant):
+    """Requested variant if its model file is present, otherwise the closest one that is"""
+    if variant not in POSE_MODEL_VARIANTS:
+        print(f"⚠️ Unknown pose model '{variant}', using heavy")
+        variant = "heavy"
+    rank = POSE_MODEL_VARIANTS.index(variant)
+    # Nearest variant first; on a tie prefer the more accurate one
+    by_distance = sorted(POSE_MODEL_VARIANTS, key=lambda v: (abs(POSE_MODEL_VARIANTS.index(v) - rank), -POSE_MODEL_VARIANTS.index(v)))
+    for candidate in by_distance:
+        if os.path.exists(POSE_MODEL_PATHS[candidate]):
+            return candidate
+    return variant
+
+def _load_landmarker(variant="heavy"):
+    # Load model with stderr suppression
+    with SuppressStderr():
+        options = PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=POSE_MODEL_PATHS[variant]),
+            running_mode=VisionRunningMode.VIDEO
+        )
+        return PoseLandmarker.create_from_options(options)
+
+# Landmarkers of the default stream are created on first use and closed on unload;
+# every other stream's PoseTracker owns landmarkers of its own
+POSE_REGISTRY_NAMES = {"heavy": "pose_landmarker", "full": "pose_landmarker_full", "lite": "pose_landmarker_lite"}
+for _variant, _name in POSE_REGISTRY_NAMES.items():
+    model_registry.register(
+        _name,
+        lambda variant=_variant: _load_landmarker(variant),
+        description=f"MediaPipe pose_landmarker_{_variant} - Tier 1 pose (default stream)",
+        unloader=lambda landmarker: landmarker.close()
     )
-    landmarker = PoseLandmarker.create_from_options(options)
 
-print("      ✅ MediaPipe Pose Landmarker loaded")
-print("🎯 Pose Detection Ready!\n")
+# Minimum time between two pose anomalies of one stream
+POSE_COOLDOWN_MS = int(os.getenv("POSE_COOLDOWN_MS", "1000"))
+# Upper bound on concurrently open per-stream trackers
+POSE_MAX_TRACKERS = int(os.getenv("POSE_MAX_TRACKERS", "8"))
+# Released landmarkers kept open (per variant) for reuse by the next stream
+POSE_IDLE_LANDMARKERS = int(os.getenv("POSE_IDLE_LANDMARKERS", "2"))
 
-# Global timestamp counter for streaming
-_streaming_timestamp = 0
-_previous_landmarks = None
-_previous_arm_positions = None
-_last_anomaly_time = 0  # Cooldown mechanism
-_anomaly_cooldown_ms = 1000  # Original working cooldown
+def _log_pose_features(features):
+    print(f"🏃 Pose Debug: wrist_speed=L{features['left_wrist_speed']:.3f}/R{features['right_wrist_speed']:.3f}, "
+          f"head_mv={features['head_movement']:.3f}, torso_change={features['torso_change']:.3f}")
+    flags = movement_flags(features)
+    if flags["rapid_arm"]:
+        print("🚨 Pose anomaly: Rapid arm movement detected")
+    elif flags["head_movement"]:
+        print("🚨 Pose anomaly: Significant head movement detected")
+    elif flags["torso_bending"]:
+        print("🚨 Pose anomaly: Torso bending/postural change detected")
+    elif flags["raised_arm"]:
+        print("🚨 Pose anomaly: Extended/raised arm position detected")
 
 def detect_aggressive_movements(landmarks, previous_landmarks=None):
     """Detect movements including aggressive actions, falls, and significant postural changes like bending"""
     if not landmarks or not previous_landmarks:
         return False
-    
-    # Key landmarks for arms (MediaPipe pose landmarks)
-    # 11: Left shoulder, 12: Right shoulder
-    # 13: Left elbow, 14: Right elbow  
-    # 15: Left wrist, 16: Right wrist
-    # 23: Left hip, 24: Right hip
-    # 0: Nose (head position)
-    
-    current_arms = {
-        'left_shoulder': (landmarks[11].x, landmarks[11].y),
-        'right_shoulder': (landmarks[12].x, landmarks[12].y),
-        'left_elbow': (landmarks[13].x, landmarks[13].y),
-        'right_elbow': (landmarks[14].x, landmarks[14].y),
-        'left_wrist': (landmarks[15].x, landmarks[15].y),
-        'right_wrist': (landmarks[16].x, landmarks[16].y),
-        'left_hip': (landmarks[23].x, landmarks[23].y),
-        'right_hip': (landmarks[24].x, landmarks[24].y),
-        'nose': (landmarks[0].x, landmarks[0].y)
-    }
-    
-    prev_arms = {
-        'left_shoulder': (previous_landmarks[11].x, previous_landmarks[11].y),
-        'right_shoulder': (previous_landmarks[12].x, previous_landmarks[12].y),
-        'left_elbow': (previous_landmarks[13].x, previous_landmarks[13].y),
-        'right_elbow': (previous_landmarks[14].x, previous_landmarks[14].y),
-        'left_wrist': (previous_landmarks[15].x, previous_landmarks[15].y),
-        'right_wrist': (previous_landmarks[16].x, previous_landmarks[16].y),
-        'left_hip': (previous_landmarks[23].x, previous_landmarks[23].y),
-        'right_hip': (previous_landmarks[24].x, previous_landmarks[24].y),
-        'nose': (previous_landmarks[0].x, previous_landmarks[0].y)
-    }
-    
-    # Calculate movement speeds for arms
-    left_wrist_speed = np.sqrt((current_arms['left_wrist'][0] - prev_arms['left_wrist'][0])**2 + 
-                              (current_arms['left_wrist'][1] - prev_arms['left_wrist'][1])**2)
-    right_wrist_speed = np.sqrt((current_arms['right_wrist'][0] - prev_arms['right_wrist'][0])**2 + 
-                               (current_arms['right_wrist'][1] - prev_arms['right_wrist'][1])**2)
-    
-    # Calculate postural changes (head and torso movement)
-    head_movement = np.sqrt((current_arms['nose'][0] - prev_arms['nose'][0])**2 + 
-                           (current_arms['nose'][1] - prev_arms['nose'][1])**2)
-    
-    # Calculate torso bending (shoulder to hip distance change)
-    current_torso_length = np.sqrt((current_arms['left_shoulder'][0] - current_arms['left_hip'][0])**2 + 
-                                  (current_arms['left_shoulder'][1] - current_arms['left_hip'][1])**2)
-    prev_torso_length = np.sqrt((prev_arms['left_shoulder'][0] - prev_arms['left_hip'][0])**2 + 
-                               (prev_arms['left_shoulder'][1] - prev_arms['left_hip'][1])**2)
-    torso_length_change = abs(current_torso_length - prev_torso_length)
-    
-    print(f"🏃 Pose Debug: wrist_speed=L{left_wrist_speed:.3f}/R{right_wrist_speed:.3f}, head_mv={head_movement:.3f}, torso_change={torso_length_change:.3f}")
-    
-    # Check for rapid arm movements (potential punching) - original working threshold
-    if left_wrist_speed > 0.15 or right_wrist_speed > 0.15:  # Original working threshold
-        print("🚨 Pose anomaly: Rapid arm movement detected")
-        return True
-    
-    # Check for significant head movement (bending, falling)
-    if head_movement > 0.08:  # Sensitive to head position changes
-        print("🚨 Pose anomaly: Significant head movement detected")
-        return True
-    
-    # Check for torso bending (significant change in shoulder-hip distance)
-    if torso_length_change > 0.05:  # Detect bending/straightening
-        print("🚨 Pose anomaly: Torso bending/postural change detected")
-        return True
-    
-    # Check for extended arm positions (potential aggressive gestures)
-    left_arm_extended = (current_arms['left_wrist'][0] < current_arms['left_shoulder'][0] - 0.2 or 
-                        current_arms['left_wrist'][0] > current_arms['left_shoulder'][0] + 0.2)
-    right_arm_extended = (current_arms['right_wrist'][0] < current_arms['right_shoulder'][0] - 0.2 or 
-                         current_arms['right_wrist'][0] > current_arms['right_shoulder'][0] + 0.2)
-    
-    if left_arm_extended or right_arm_extended:
-        # Check if arms are raised (potential fighting stance)
-        left_raised = current_arms['left_wrist'][1] < current_arms['left_shoulder'][1] - 0.1
-        right_raised = current_arms['right_wrist'][1] < current_arms['right_shoulder'][1] - 0.1
-        
-        if left_raised or right_raised:
-            print("🚨 Pose anomaly: Extended/raised arm position detected")
-            return True
-    
-    return False
+    features = compute_features(landmarks_to_array(landmarks), landmarks_to_array(previous_landmarks), 1, 1)
+    _log_pose_features(features)
+    return bool(is_aggressive(features))
+
+class PoseModelPolicy:
+    """
+    Load-aware pose model choice for one stream. Runs the base variant normally, drops to
+    lite while the smoothed Tier 1 latency is over budget, and uses heavy for a hold period
+    after a suspected event so the frames that matter get the most accurate landmarks.
+    """
+
+    def __init__(self, mode=POSE_MODEL_POLICY, base=POSE_MODEL, budget_ms=TIER1_LATENCY_BUDGET_MS,
+                 hold_ms=POSE_UPGRADE_HOLD_MS):
+        self.mode = mode
+        self.base = resolve_pose_variant(base)
+        self.lite = resolve_pose_variant("lite")
+        self.heavy = resolve_pose_variant("heavy")
+        self.budget_ms = budget_ms
+        self.hold_ms = hold_ms
+        self.latency_ms = None  # Exponentially smoothed Tier 1 latency
+        self.degraded = False
+        self._upgrade_until = -1
+
+    def choose(self, timestamp_ms):
+        if self.mode == "fixed":
+            return self.base
+        if timestamp_ms < self._upgrade_until:
+            return self.heavy
+        return self.lite if self.degraded else self.base
+
+    def record_latency(self, latency_ms):
+        self.latency_ms = latency_ms if self.latency_ms is None else 0.7 * self.latency_ms + 0.3 * latency_ms
+        # Hysteresis so the model does not flap around the budget
+        if self.latency_ms > self.budget_ms:
+            self.degraded = True
+        elif self.latency_ms < 0.7 * self.budget_ms:
+            self.degraded = False
+
+    def note_suspected(self, timestamp_ms):
+        self._upgrade_until = timestamp_ms + self.hold_ms
 
+    def get_stats(self):
+        return {
+            "mode": self.mode,
+            "base": self.base,
+            "degraded": self.degraded,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "budget_ms": self.budget_ms
+        }
 
+class PoseTracker:
+    """
+    Pose state of one video stream: its VIDEO-mode landmarkers (one per model variant in use),
+    its own monotonically increasing timestamps, its motion history (LandmarkEngine), its
+    anomaly cooldown and its model policy. Streams never share a tracker, so several cameras
+    or videos can be analysed at once.
+    """
 
-def process_pose_frame(frame):
-    # Process a single frame (simplified)
-    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-    # Placeholder: Integrate with landmarker logic
-    return 0  # Update with actual anomaly count
+    def __init__(self, stream_id, cooldown_ms=POSE_COOLDOWN_MS, use_registry=False, pool=None, policy=None):
+        self.stream_id = stream_id
+        self.cooldown_ms = cooldown_ms
+        self.use_registry = use_registry  # Borrow registry-managed landmarkers instead of owning them
+        self.pool = pool
+        self.policy = policy or PoseModelPolicy()
+        self.engine = LandmarkEngine()
+        self._landmarkers = {}  # variant -> (landmarker, offset into its timestamp timeline)
+        self._lock = Lock()
+        self._clock_start = time.monotonic()
+        self._last_timestamp_ms = -1
+        self._last_anomaly_time = None
+        self.last_model = None  # Variant that analysed the latest frame (None if pose was skipped)
+        self.stats = {"frames": 0, "detections": 0, "anomalies": 0, "cooldown_skips": 0,
+                      "models": {variant: 0 for variant in POSE_MODEL_VARIANTS}}
+
+    def _get_landmarker(self, variant):
+        if self.use_registry:
+            return model_registry.get(POSE_REGISTRY_NAMES[variant]), 0
+        entry = self._landmarkers.get(variant)
+        if entry is None:
+            entry = self.pool._checkout(variant) if self.pool else (_load_landmarker(variant), 0)
+            self._landmarkers[variant] = entry
+        return entry
+
+    def _next_timestamp(self, timestamp_ms):
+        # MediaPipe VIDEO mode needs strictly increasing timestamps per landmarker
+        if timestamp_ms is None:
+            timestamp_ms = (time.monotonic() - self._clock_start) * 1000
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        self.stats["frames"] += 1
+        self.last_model = None
+        return timestamp_ms
+
+    def detect(self, frame, timestamp_ms=None):
+        """
+        Run the landmarker on one BGR frame at its real stream time (media time for files,
+        wall clock if None). Returns the pose feature record, or None if no person was found.
+        """
+        with self._lock:
+            return self._detect(frame, self._next_timestamp(timestamp_ms))
+
+    def _detect(self, frame, timestamp_ms):
+        variant = self.policy.choose(timestamp_ms)
+        landmarker, timestamp_base = self._get_landmarker(variant)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        result = landmarker.detect_for_video(mp_image, timestamp_base + timestamp_ms)
+        self.last_model = variant
+        self.stats["models"][variant] += 1
+        if not result.pose_landmarks:
+            return None
+        self.stats["detections"] += 1
+
+        # Convert once; features are computed against the previous pose in the engine's ring buffer
+        return self.engine.push(landmarks_to_array(result.pose_landmarks[0]), mp_image.width, mp_image.height)
+
+    def process(self, frame, timestamp_ms=None):
+        """Streaming anomaly test: 1 for a fall/crawl or aggressive movement, 0 otherwise"""
+        with self._lock:
+            timestamp_ms = self._next_timestamp(timestamp_ms)
+
+            # Cooldown check - don't detect anomalies too frequently
+            if self._last_anomaly_time is not None and timestamp_ms - self._last_anomaly_time < self.cooldown_ms:
+                self.stats["cooldown_skips"] += 1
+                return 0
+
+            features = self._detect(frame, timestamp_ms)
+            if features is None:
+                return 0
+            if features["has_previous"]:
+                _log_pose_features(features)
+
+            # Fall/crawl pattern or aggressive movement (punching, fighting)
+            anomaly_detected = int(is_fall(features) or is_aggressive(features))
+            if anomaly_detected:
+                self._last_anomaly_time = timestamp_ms
+                self.stats["anomalies"] += 1
+            return anomaly_detected
+
+    def record_tier1(self, latency_ms, suspected=False):
+        """Feed the model policy with this stream's Tier 1 latency and outcome"""
+        with self._lock:
+            self.policy.record_latency(latency_ms)
+            if suspected:
+                self.policy.note_suspected(self._last_timestamp_ms)
+
+    def reset(self):
+        """Forget motion history and cooldown (e.g. when a looped source restarts)"""
+        with self._lock:
+            self.engine.reset()
+            self._last_anomaly_time = None
+
+    def close(self):
+        """Hand the landmarkers back to the pool (or close them) together with their last timestamps"""
+        with self._lock:
+            for variant, (landmarker, timestamp_base) in self._landmarkers.items():
+                if self.pool:
+                    self.pool._checkin(variant, landmarker, timestamp_base + self._last_timestamp_ms)
+                else:
+                    landmarker.close()
+            self._landmarkers.clear()
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            "stream_id": self.stream_id,
+            "last_timestamp_ms": self._last_timestamp_ms,
+            "last_model": self.last_model,
+            "policy": self.policy.get_stats()
+        }
+
+class PoseTrackerPool:
+    """
+    Per-stream PoseTrackers, created on demand. Each tracker has its own lock and landmarkers,
+    so trackers of different streams run in parallel threads; the default stream borrows the
+    registry's pose landmarkers so existing warm-up keeps working.
+    Released landmarkers are kept idle per variant and handed to the next stream instead of
+    rebuilding the model; the new stream continues on the landmarker's timestamp timeline.
+    """
+
+    DEFAULT_STREAM = "default"
+
+    def __init__(self, max_trackers=POSE_MAX_TRACKERS, max_idle=POSE_IDLE_LANDMARKERS):
+        self.max_trackers = max_trackers
+        self.max_idle = max_idle
+        self._trackers = {}
+        self._idle = {variant: [] for variant in POSE_MODEL_VARIANTS}  # (landmarker, last timestamp used on it)
+        self._lock = Lock()
+        self.stats = {"landmarkers_created": 0, "landmarkers_reused": 0}
+
+    def acquire(self, stream_id=DEFAULT_STREAM):
+        """Return the tracker of a stream, creating it on first use"""
+        with self._lock:
+            tracker = self._trackers.get(stream_id)
+            if tracker is None:
+                if len(self._trackers) >= self.max_trackers:
+                    raise RuntimeError(f"Pose tracker limit reached ({self.max_trackers}); release a stream first")
+                tracker = PoseTracker(stream_id, use_registry=stream_id == self.DEFAULT_STREAM, pool=self)
+                self._trackers[stream_id] = tracker
+                print(f"🏃 Pose tracker opened for stream '{stream_id}' (base model: {tracker.policy.base})")
+            return tracker
+
+    def release(self, stream_id):
+        """Drop a stream's tracker; its landmarkers go back to the idle pool"""
+        with self._lock:
+            tracker = self._trackers.pop(stream_id, None)
+        if tracker is not None:
+            tracker.close()
+            print(f"🏃 Pose tracker closed for stream '{stream_id}'")
+
+    def _checkout(self, variant):
+        with self._lock:
+            if self._idle[variant]:
+                landmarker, last_timestamp_ms = self._idle[variant].pop()
+                self.stats["landmarkers_reused"] += 1
+                return landmarker, last_timestamp_ms + 1
+            self.stats["landmarkers_created"] += 1
+        print(f"📦 Loading pose_landmarker_{variant}...")
+        return _load_landmarker(variant), 0
+
+    def _checkin(self, variant, landmarker, last_timestamp_ms):
+        with self._lock:
+            if len(self._idle[variant]) < self.max_idle:
+                self._idle[variant].append((landmarker, last_timestamp_ms))
+                return
+        landmarker.close()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "streams": {stream_id: tracker.get_stats() for stream_id, tracker in self._trackers.items()},
+                "idle_landmarkers": {variant: len(idle) for variant, idle in self._idle.items()},
+                **self.stats
+            }
+
+# Global pool shared by live, upload and batch processing
+pose_tracker_pool = PoseTrackerPool()
 
 def process_pose(video_path):
     cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
     frame_interval = int(fps) if fps > 0 else 1
-    frame_count = 0
     sampled_frames = 0
     pose_anomalies = []
     timestamps = []  # in seconds
 
-    BaseOptions = mp_tasks.BaseOptions
-    PoseLandmarker = mp_vision.PoseLandmarker
-    PoseLandmarkerOptions = mp_vision.PoseLandmarkerOptions
-    VisionRunningMode = mp_vision.RunningMode
-    options = PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=MODEL_PATH),
-        running_mode=VisionRunningMode.VIDEO
-    )
+    # Pooled landmarker instead of building pose_landmarker_heavy on every call
+    stream_id = f"pose:{video_path}"
+    tracker = pose_tracker_pool.acquire(stream_id)
+    try:
+        for frame_count, _, frame in FrameSampler(cap, stride=frame_interval):
+            timestamp_ms = int(1000 * frame_count / fps) if fps > 0 else frame_count
+            features = tracker.detect(frame, timestamp_ms)
+            if features is not None and is_fall(features, FALL_RATIO_BATCH):  # Threshold for fall/crawl
+                pose_anomalies.append(sampled_frames)
+                timestamps.append(timestamp_ms / 1000.0)
+
+            sampled_frames += 1
+    finally:
+        pose_tracker_pool.release(stream_id)
+        cap.release()
 
-    with PoseLandmarker.create_from_options(options) as landmarker:
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            if frame_count % frame_interval == 0:
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                timestamp_ms = int(1000 * frame_count / fps) if fps > 0 else frame_count
-                result = landmarker.detect_for_video(mp_image, timestamp_ms)
-
-                if result.pose_landmarks:
-                    landmarks = result.pose_landmarks[0]
-                    xs = [lm.x * mp_image.width for lm in landmarks]
-                    ys = [lm.y * mp_image.height for lm in landmarks]
-                    min_x, max_x = min(xs), max(xs)
-                    min_y, max_y = min(ys), max(ys)
-                    width = max_x - min_x + 1e-6
-                    height = max_y - min_y
-                    ratio = height / width
-                    if ratio < 0.5:  # Threshold for fall/crawl
-                        pose_anomalies.append(sampled_frames)
-                        timestamps.append(timestamp_ms / 1000.0)
-
-                sampled_frames += 1
-            frame_count += 1
-
-    cap.release()
     return len(pose_anomalies), sampled_frames, timestamps, fps
 
-def process_pose_frame(frame):
-    global _streaming_timestamp, _previous_landmarks, _last_anomaly_time
-    # Process a single frame (simplified)
-    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-    _streaming_timestamp += 33  # Increment by ~33ms (30 FPS)
-    
-    # Cooldown check - don't detect anomalies too frequently
-    if _streaming_timestamp - _last_anomaly_time < _anomaly_cooldown_ms:
-        return 0  # Still in cooldown period
-    
-    result = landmarker.detect_for_video(mp_image, _streaming_timestamp)  # Use incremental timestamp
-    
-    anomaly_detected = 0
-    
-    if result.pose_landmarks:
-        landmarks = result.pose_landmarks[0]
-        
-        # Check for fall/crawl patterns
-        xs = [lm.x * mp_image.width for lm in landmarks]
-        ys = [lm.y * mp_image.height for lm in landmarks]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-        width = max_x - min_x + 1e-6
-        height = max_y - min_y
-        ratio = height / width
-        
-        if ratio < 0.4:  # Slightly more restrictive threshold for fall/crawl detection
-            anomaly_detected = 1
-        
-        # Check for aggressive movements (punching, fighting)
-        if _previous_landmarks and detect_aggressive_movements(landmarks, _previous_landmarks):
-            anomaly_detected = 1
-        
-        # If anomaly detected, update the last anomaly time
-        if anomaly_detected:
-            _last_anomaly_time = _streaming_timestamp
-        
-        # Store current landmarks for next frame comparison
-        _previous_landmarks = landmarks
-    
-    return anomaly_detected  # Return 1 for anomaly, 0 for normal
\ No newline at end of file
+def process_pose_frame(frame, tracker=None, timestamp_ms=None):
+    """Pose anomaly (1/0) for one frame of a stream; uses the default stream's tracker if none is given"""
+    tracker = tracker or pose_tracker_pool.acquire()
+    return tracker.process(frame, timestamp_ms)
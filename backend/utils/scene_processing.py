@@ -2,68 +2,157 @@ import os
 import cv2
 from transformers import AutoProcessor, CLIPModel, BlipProcessor, BlipForConditionalGeneration
 from PIL import Image
+from threading import Lock
 import torch
+from utils.frame_sampler import FrameSampler
+from utils.model_registry import model_registry
+from utils.inference_runtime import inference_runtime, precision_for, apply_precision, match_input_dtype
 
 # Suppress TensorFlow and transformers verbose logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 os.environ['TRANSFORMERS_VERBOSITY'] = 'error'
 
-print("🎨 Loading OpenAI CLIP Vision Models...")
-print("   ├─ 📦 Loading CLIP-ViT-Base-Patch32...")
-clip_processor = AutoProcessor.from_pretrained("openai/clip-vit-base-patch32")
-clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-print("   │  ✅ CLIP Base model loaded")
+# Comprehensive text prompts including aggressive behaviors
+# Normal activities: indices 0, 1, 2
+# Anomaly activities: indices 3, 4, 5, 6
+SCENE_PROMPTS = [
+    "person sitting normally in chair or standing upright",
+    "person working at desk or normal daily activity",
+    "person walking or moving normally",
+    "person fallen on floor unconscious or injured",
+    "person crawling on ground in distress",
+    "person punching or fighting aggressively",
+    "person making threatening gestures or violent movements"
+]
+NUM_NORMAL_PROMPTS = 3
 
-print("   ├─ 📦 Loading CLIP-ViT-Large-Patch14...")
-clip_large_processor = AutoProcessor.from_pretrained("openai/clip-vit-large-patch14")
-clip_large_model = CLIPModel.from_pretrained("openai/clip-vit-large-patch14")
-print("   │  ✅ CLIP Large model loaded")
+class PromptEmbeddingRegistry:
+    """
+    Caches normalized CLIP text embeddings per model so the text tower only runs
+    when a prompt set is first seen (or changed) instead of on every frame.
+    """
 
-print("   └─ 📦 Loading BLIP Image Captioning...")
-blip_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-blip_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-print("      ✅ BLIP model loaded")
-print("🎨 All Vision Models Ready!\n")
+    def __init__(self):
+        self._cache = {}  # model name -> (model id, prompt tuple, text embeddings, logit scale)
+        self._lock = Lock()
+
+    def get_model(self, name):
+        """Return the (processor, model) pair registered under a name"""
+        return model_registry.get(name)
+
+    def get(self, name, prompts=SCENE_PROMPTS):
+        """Return (text_embeds, logit_scale) for a model, re-encoding only if the prompts or model changed"""
+        processor, model = self.get_model(name)
+        prompt_key = tuple(prompts)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == id(model) and cached[1] == prompt_key:
+            return cached[2], cached[3]
+
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == id(model) and cached[1] == prompt_key:
+                return cached[2], cached[3]
+
+            inputs = processor(text=list(prompt_key), return_tensors="pt", padding=True)
+            with inference_runtime.session(name):
+                text_embeds = model.get_text_features(**inputs).float()
+                text_embeds = text_embeds / text_embeds.norm(dim=-1, keepdim=True)
+                logit_scale = model.logit_scale.exp().float()
+            self._cache[name] = (id(model), prompt_key, text_embeds, logit_scale)
+            return text_embeds, logit_scale
+
+    def warm_up(self, names=("clip_base", "clip_large"), prompts=SCENE_PROMPTS):
+        """Encode the prompt set for the given models (loading them if needed)"""
+        for name in names:
+            self.get(name, prompts)
+
+    def status(self):
+        """Report which prompt sets are currently cached"""
+        return {
+            name: {"prompts": len(entry[1]), "embedding_dim": int(entry[2].shape[-1])}
+            for name, entry in self._cache.items()
+        }
+
+prompt_registry = PromptEmbeddingRegistry()
+
+def _load_clip(model_id, precision="fp32"):
+    processor = AutoProcessor.from_pretrained(model_id)
+    model = CLIPModel.from_pretrained(model_id)
+    model.eval()
+    return processor, apply_precision(model, precision)
+
+def _load_blip(precision="fp32"):
+    processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
+    model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
+    model.eval()
+    return processor, apply_precision(model, precision)
+
+# Models load on first use; prompt embeddings are encoded as soon as a CLIP model is loaded
+model_registry.register(
+    "clip_base",
+    lambda: _load_clip("openai/clip-vit-base-patch32", precision_for("clip_base")),
+    description="CLIP ViT-B/32 - Tier 1 scene scoring",
+    on_load=lambda _: prompt_registry.warm_up(["clip_base"])
+)
+model_registry.register(
+    "clip_large",
+    lambda: _load_clip("openai/clip-vit-large-patch14", precision_for("clip_large")),
+    description="CLIP ViT-L/14 - Tier 2 scene scoring",
+    on_load=lambda _: prompt_registry.warm_up(["clip_large"])
+)
+model_registry.register(
+    "blip",
+    lambda: _load_blip(precision_for("blip")),
+    description="BLIP base - Tier 2 image captioning"
+)
+
+def clip_scene_probs(model_name, images, prompts=SCENE_PROMPTS):
+    """
+    Score one or more PIL images against the cached prompt embeddings.
+    Returns a (num_images, num_prompts) softmax tensor, equivalent to CLIPModel's logits_per_image.
+    """
+    processor, model = model_registry.get(model_name)
+    text_embeds, logit_scale = prompt_registry.get(model_name, prompts)
+    inputs = match_input_dtype(processor(images=images, return_tensors="pt"), model)
+    with inference_runtime.session(model_name):
+        image_embeds = model.get_image_features(**inputs).float()
+        image_embeds = image_embeds / image_embeds.norm(dim=-1, keepdim=True)
+        logits_per_image = logit_scale * image_embeds @ text_embeds.t()
+        return logits_per_image.softmax(dim=1)
+
+def caption_image(image):
+    """BLIP caption for one PIL image"""
+    blip_processor, blip_model = model_registry.get("blip")
+    inputs = match_input_dtype(blip_processor(images=image, return_tensors="pt"), blip_model)
+    generated_ids = inference_runtime.run("blip", blip_model.generate, **inputs)
+    return blip_processor.decode(generated_ids[0], skip_special_tokens=True)
+
+def split_scene_probs(probs):
+    """Return (normal_prob, anomaly_prob) as floats from one row of scene prompt probabilities"""
+    normal_prob = probs[:NUM_NORMAL_PROMPTS].max().item()  # Max of normal activities
+    anomaly_prob = probs[NUM_NORMAL_PROMPTS:].max().item()  # Max of anomaly activities
+    return normal_prob, anomaly_prob
+
+def _tier1_anomaly_prob(probs):
+    normal_prob, anomaly_prob = split_scene_probs(probs)
+    # Count the anomaly only if it exceeds normal by reasonable margin
+    return anomaly_prob if anomaly_prob > normal_prob * 1.3 else 0.0  # Original working threshold
+
+def process_scene_tier1_frames(frames):
+    """Tier 1 anomaly probability for a batch of BGR frames, one CLIP forward pass, results in input order"""
+    if not frames:
+        return []
+    images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
+    return [_tier1_anomaly_prob(row) for row in clip_scene_probs("clip_base", images)]
 
 def process_scene_tier1(video_path):
     cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
     frame_interval = int(fps) if fps > 0 else 1
-    frame_count = 0
     anomaly_probs = []
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if frame_count % frame_interval == 0:
-            image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            # Comprehensive text prompts including aggressive behaviors
-            texts = [
-                "person sitting normally in chair or standing upright",
-                "person working at desk or normal daily activity", 
-                "person walking or moving normally",
-                "person fallen on floor unconscious or injured",
-                "person crawling on ground in distress",
-                "person punching or fighting aggressively",
-                "person making threatening gestures or violent movements"
-            ]
-            inputs = clip_processor(text=texts, images=image, return_tensors="pt", padding=True)
-            outputs = clip_model(**inputs)
-            logits_per_image = outputs.logits_per_image
-            probs = logits_per_image.softmax(dim=1)[0]
-            
-            # Normal activities: indices 0, 1, 2
-            # Anomaly activities: indices 3, 4, 5, 6
-            normal_prob = max(probs[0], probs[1], probs[2])  # Max of normal activities
-            anomaly_prob = max(probs[3], probs[4], probs[5], probs[6])  # Max of anomaly activities
-            
-            # Add to anomaly_probs if anomaly exceeds normal by reasonable margin
-            if anomaly_prob > normal_prob * 1.3:  # Original working threshold
-                anomaly_probs.append(anomaly_prob.item())
-            else:
-                anomaly_probs.append(0.0)
-        frame_count += 1
+    for _, _, frame in FrameSampler(cap, stride=frame_interval):
+        anomaly_probs.extend(process_scene_tier1_frames([frame]))
 
     cap.release()
     return max(anomaly_probs) if anomaly_probs else 0.0
@@ -72,114 +161,83 @@ def process_scene_tier2(video_path):
     cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
     frame_interval = int(fps) if fps > 0 else 1
-    frame_count = 0
     captions = []
     anomaly_probs = []
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if frame_count % frame_interval == 0:
-            image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            # BLIP Captioning
-            inputs = blip_processor(images=image, return_tensors="pt")
-            generated_ids = blip_model.generate(**inputs)
-            caption = blip_processor.decode(generated_ids[0], skip_special_tokens=True)
-            captions.append(caption)
-            
-            # CLIP ViT-L/14 for anomaly prob with comprehensive prompts
-            texts = [
-                "person sitting normally in chair or standing upright",
-                "person working at desk or normal daily activity", 
-                "person walking or moving normally",
-                "person fallen on floor unconscious or injured",
-                "person crawling on ground in distress",
-                "person punching or fighting aggressively",
-                "person making threatening gestures or violent movements"
-            ]
-            inputs = clip_large_processor(text=texts, images=image, return_tensors="pt", padding=True)
-            outputs = clip_large_model(**inputs)
-            logits_per_image = outputs.logits_per_image
-            probs = logits_per_image.softmax(dim=1)[0]
-            
-            # Normal activities: indices 0, 1, 2
-            # Anomaly activities: indices 3, 4, 5, 6
-            normal_prob = max(probs[0], probs[1], probs[2])  # Max of normal activities
-            anomaly_prob = max(probs[3], probs[4], probs[5], probs[6])  # Max of anomaly activities
-            
-            # Add to anomaly_probs if anomaly exceeds normal by reasonable margin
-            if anomaly_prob > normal_prob * 1.3:  # Original working threshold
-                anomaly_probs.append(anomaly_prob.item())
-            else:
-                anomaly_probs.append(0.0)
-        frame_count += 1
+    for _, _, frame in FrameSampler(cap, stride=frame_interval):
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        # BLIP Captioning
+        captions.append(caption_image(image))
+        
+        # CLIP ViT-L/14 for anomaly prob against the cached prompt embeddings
+        probs = clip_scene_probs("clip_large", image)[0]
+        normal_prob, anomaly_prob = split_scene_probs(probs)
+        
+        # Add to anomaly_probs if anomaly exceeds normal by reasonable margin
+        if anomaly_prob > normal_prob * 1.3:  # Original working threshold
+            anomaly_probs.append(anomaly_prob)
+        else:
+            anomaly_probs.append(0.0)
 
     cap.release()
     return captions, max(anomaly_probs) if anomaly_probs else 0.0
 
-# Existing code...
-def process_scene_frame(image_array):
-    image = Image.fromarray(image_array)
-    # Comprehensive text prompts including aggressive behaviors
-    texts = [
-        "person sitting normally in chair or standing upright",
-        "person working at desk or normal daily activity", 
-        "person walking or moving normally",
-        "person fallen on floor unconscious or injured",
-        "person crawling on ground in distress",
-        "person punching or fighting aggressively",
-        "person making threatening gestures or violent movements"
-    ]
-    inputs = clip_processor(text=texts, images=image, return_tensors="pt", padding=True)
-    outputs = clip_model(**inputs)
-    logits_per_image = outputs.logits_per_image
-    probs = logits_per_image.softmax(dim=1)[0]
-    
-    # Normal activities: indices 0, 1, 2
-    # Anomaly activities: indices 3, 4, 5, 6
-    normal_prob = max(probs[0], probs[1], probs[2])  # Max of normal activities
-    anomaly_prob = max(probs[3], probs[4], probs[5], probs[6])  # Max of anomaly activities
+def _scene_frame_result(probs):
+    """Apply the Tier 1 ratio threshold to one row of scene prompt probabilities"""
+    normal_prob, anomaly_prob = split_scene_probs(probs)
     
     # Return the anomaly probability based on relative strength
     # Calculate anomaly ratio: how strong is anomaly signal relative to normal
-    anomaly_ratio = anomaly_prob.item() / (normal_prob.item() + 1e-6)  # Add small epsilon to avoid division by zero
+    anomaly_ratio = anomaly_prob / (normal_prob + 1e-6)  # Add small epsilon to avoid division by zero
     
     # Return anomaly probability if the ratio indicates potential concern
     # Samsung Demo: Higher threshold for better precision and speed
-    result = anomaly_prob.item() if anomaly_ratio > 0.30 else 0.0  # If anomaly is >30% of normal strength (Samsung optimized)
+    result = anomaly_prob if anomaly_ratio > 0.30 else 0.0  # If anomaly is >30% of normal strength (Samsung optimized)
     
     # Debug logging to see what's happening
     print(f"🎬 Scene Debug: normal_prob={normal_prob:.3f}, anomaly_prob={anomaly_prob:.3f}, ratio={anomaly_ratio:.3f}, threshold=0.30, result={result:.3f}")
     
     return result
 
+# Existing code...
+def process_scene_frame(image_array):
+    image = Image.fromarray(image_array)
+    probs = clip_scene_probs("clip_base", image)[0]
+    return _scene_frame_result(probs)
+
+def process_scene_frames(image_arrays):
+    """Batched process_scene_frame: one CLIP image forward pass for all frames, results in input order"""
+    if not image_arrays:
+        return []
+    images = [Image.fromarray(image_array) for image_array in image_arrays]
+    probs = clip_scene_probs("clip_base", images)
+    return [_scene_frame_result(row) for row in probs]
+
 def process_scene_tier2_frame(image_array):
     image = Image.fromarray(image_array)
-    inputs = blip_processor(images=image, return_tensors="pt")
-    generated_ids = blip_model.generate(**inputs)
-    caption = blip_processor.decode(generated_ids[0], skip_special_tokens=True)
+    caption = caption_image(image)
     
-    # Comprehensive text prompts for tier 2 analysis including aggressive behaviors
-    texts = [
-        "person sitting normally in chair or standing upright",
-        "person working at desk or normal daily activity", 
-        "person walking or moving normally",
-        "person fallen on floor unconscious or injured",
-        "person crawling on ground in distress",
-        "person punching or fighting aggressively",
-        "person making threatening gestures or violent movements"
-    ]
-    inputs = clip_large_processor(text=texts, images=image, return_tensors="pt", padding=True)
-    outputs = clip_large_model(**inputs)
-    logits_per_image = outputs.logits_per_image
-    probs = logits_per_image.softmax(dim=1)[0]
-    
-    # Normal activities: indices 0, 1, 2
-    # Anomaly activities: indices 3, 4, 5, 6
-    normal_prob = max(probs[0], probs[1], probs[2])  # Max of normal activities
-    anomaly_prob = max(probs[3], probs[4], probs[5], probs[6])  # Max of anomaly activities
+    # CLIP ViT-L/14 against the cached tier 2 prompt embeddings
+    probs = clip_scene_probs("clip_large", image)[0]
+    normal_prob, anomaly_prob = split_scene_probs(probs)
     
     # Return anomaly probability if it exceeds normal by reasonable margin
-    anomaly_max = anomaly_prob.item() if anomaly_prob > normal_prob * 1.3 else 0.0
-    return [caption], anomaly_max
\ No newline at end of file
+    anomaly_max = anomaly_prob if anomaly_prob > normal_prob * 1.3 else 0.0
+    return [caption], anomaly_max
+
+
+def process_scene_tier2_frames(image_arrays):
+    """
+    Batched process_scene_tier2_frame for an episode's key frames: one CLIP ViT-L/14 pass over all
+    frames and one caption per frame. Returns (captions, highest anomaly probability).
+    """
+    if not image_arrays:
+        return [], 0.0
+    images = [Image.fromarray(image_array) for image_array in image_arrays]
+    captions = [caption_image(image) for image in images]
+    anomaly_max = 0.0
+    for row in clip_scene_probs("clip_large", images):
+        normal_prob, anomaly_prob = split_scene_probs(row)
+        if anomaly_prob > normal_prob * 1.3:
+            anomaly_max = max(anomaly_max, anomaly_prob)
+    return captions, anomaly_max
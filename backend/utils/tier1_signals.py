@@ -0,0 +1,109 @@
+# Typed Tier 1 data: fusion works on these numbers directly; the English summaries and the
+# JSON dict sent to the dashboards, reports and Tier 2 are generated only by Tier1Result.to_dict()
+
+STATUS_NORMAL = "Normal"
+STATUS_SUSPECTED = "Suspected Anomaly"
+
+# Why fusion reached its status; selects the details wording
+REASON_LOW = "low"  # No pose anomaly and scene probability under the normal floor
+REASON_THRESHOLD = "threshold"  # Pose / scene threshold decision
+
+
+class Tier1Signals:
+    """Numeric outputs of the Tier 1 components for one frame"""
+
+    __slots__ = ("pose_anomaly", "scene_prob", "audio_transcripts", "audio_available", "audio_status", "pose_model")
+
+    def __init__(self, pose_anomaly, scene_prob, audio_transcripts=(), audio_available=False,
+                 audio_status="none", pose_model=None):
+        self.pose_anomaly = bool(pose_anomaly)
+        self.scene_prob = float(scene_prob)
+        self.audio_transcripts = list(audio_transcripts)
+        self.audio_available = audio_available
+        self.audio_status = audio_status  # "ok" | "none" (no speech) | "unavailable" | "failed"
+        self.pose_model = pose_model
+
+    @property
+    def transcript_text(self):
+        return " | ".join(self.audio_transcripts)
+
+    @classmethod
+    def from_result(cls, tier1_result):
+        """Signals of a Tier 1 result dict (as produced by Tier1Result.to_dict)"""
+        signals = tier1_result.get("signals") or {}
+        audio = tier1_result.get("tier1_components", {}).get("audio_analysis", {})
+        return cls(signals.get("pose_anomaly", False), signals.get("scene_probability", 0.0),
+                   audio.get("transcripts", ()), audio.get("available", False))
+
+    def audio_summary(self):
+        if self.audio_status == "ok":
+            return "Audio transcripts: " + self.transcript_text
+        if self.audio_status == "failed":
+            return "Audio processing failed."
+        if self.audio_status == "unavailable":
+            return "No audio available."
+        return "No audio."
+
+
+class Tier1Result:
+    """Fused Tier 1 verdict for one frame"""
+
+    __slots__ = ("signals", "status", "initial_status", "scene_threshold", "reason")
+
+    def __init__(self, signals, status, scene_threshold, reason, initial_status=None):
+        self.signals = signals
+        self.status = status
+        self.initial_status = initial_status or status
+        self.scene_threshold = scene_threshold
+        self.reason = reason
+
+    @property
+    def suspected(self):
+        return self.status == STATUS_SUSPECTED
+
+    def details(self):
+        scene_prob = self.signals.scene_prob
+        if self.reason == REASON_LOW:
+            details = f"Scene probability ({scene_prob:.2f}) and pose analysis indicate normal activity"
+        else:
+            details = f"Pose anomaly: {self.signals.pose_anomaly}, Scene probability: {scene_prob:.2f}"
+        if self.status != self.initial_status:
+            details += f" [Smoothed from {self.initial_status} to {self.status}]"
+        return details
+
+    def to_dict(self):
+        """Result dict for WebSocket messages, reports and Tier 2 (same shape as before, plus "signals")"""
+        signals = self.signals
+        pose_summary = f"Pose anomaly detected: {signals.pose_anomaly}"
+        scene_summary = f"Scene anomaly probability: {signals.scene_prob:.2f}"
+        return {
+            "status": self.status,
+            "details": self.details(),
+            "signals": {
+                "pose_anomaly": signals.pose_anomaly,
+                "scene_probability": signals.scene_prob,
+                "scene_threshold": self.scene_threshold
+            },
+            "tier1_components": {
+                "pose_analysis": {
+                    "anomaly_detected": signals.pose_anomaly,
+                    "summary": pose_summary,
+                    "model": signals.pose_model  # Pose model variant used for this frame (None if pose was skipped)
+                },
+                "audio_analysis": {
+                    "transcripts": signals.audio_transcripts,
+                    "available": signals.audio_available,
+                    "summary": signals.audio_summary(),
+                    "transcript_text": signals.transcript_text
+                },
+                "scene_analysis": {
+                    "anomaly_probability": signals.scene_prob,
+                    "summary": scene_summary
+                },
+                "fusion_logic": {
+                    "initial_status": self.initial_status,
+                    "final_status": self.status,
+                    "smoothing_applied": self.status != self.initial_status
+                }
+            }
+        }
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+
+# Tier 2 result cache configuration
+TIER2_CACHE_ENABLED = os.getenv("TIER2_CACHE_ENABLED", "1") == "1"
+TIER2_CACHE_SIZE = int(os.getenv("TIER2_CACHE_SIZE", "256"))  # In-memory entries (LRU)
+TIER2_CACHE_TTL_SECONDS = float(os.getenv("TIER2_CACHE_TTL_SECONDS", "300"))
+TIER2_CACHE_SCORE_STEP = float(os.getenv("TIER2_CACHE_SCORE_STEP", "0.05"))  # Score quantization
+TIER2_CACHE_PATH = os.getenv("TIER2_CACHE_PATH", "")  # SQLite file; empty keeps the cache in memory only
+TIER2_CACHE_PERSIST_TTL_SECONDS = float(os.getenv("TIER2_CACHE_PERSIST_TTL_SECONDS", "0"))  # 0 = never expire
+
+_DECIMAL = re.compile(r"\d+\.\d+")
+
+
+def _quantize(value, step=TIER2_CACHE_SCORE_STEP):
+    return f"{round(float(value) / step) * step:.2f}" if step > 0 else f"{float(value):.2f}"
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_text(text):
+    return " ".join(re.sub(r"[^\w' ]", " ", (text or "").lower()).split())
+
+
+def tier2_fingerprint(audio_transcript, captions, visual_anomaly_max, tier1_details, step=TIER2_CACHE_SCORE_STEP,
+                      tier1_signals=None):
+    """
+    Cache key for one set of Tier 2 evidence: the quantized visual score plus hashes of the
+    normalized captions and transcript, so near-identical frames of one incident map to the same key.
+    Tier 1 enters as its numeric signals (pose flag, quantized scene probability) when tier1_signals
+    is given; the details text is display only and carries per-episode times and frame counts.
+    Without signals the details are hashed with their scores quantized.
+    """
+    caption_text = "\n".join(sorted(_normalize_text(caption) for caption in captions or []))
+    if tier1_signals is not None:
+        tier1_part = f"p{int(tier1_signals.pose_anomaly)}s{_quantize(tier1_signals.scene_prob, step)}"
+    else:
+        details = _DECIMAL.sub(lambda m: _quantize(m.group(), step), tier1_details or "")
+        tier1_part = f"d{_digest(_normalize_text(details))}"
+    return "|".join((
+        f"v{_quantize(visual_anomaly_max, step)}",
+        f"c{_digest(caption_text)}",
+        f"t{_digest(_normalize_text(audio_transcript))}",
+        tier1_part
+    ))
+
+
+class Tier2Cache:
+    """
+    LRU + TTL cache of Tier 2 fusion results keyed on tier2_fingerprint. Identical evidence
+    that is already waiting on the LLM joins that request instead of sending another one.
+    With a SQLite path, results are also written to disk so batch re-runs over the same
+    videos are served without any LLM call.
+    """
+
+    def __init__(self, max_entries=TIER2_CACHE_SIZE, ttl_seconds=TIER2_CACHE_TTL_SECONDS,
+                 path=TIER2_CACHE_PATH, persist_ttl_seconds=TIER2_CACHE_PERSIST_TTL_SECONDS,
+                 enabled=TIER2_CACHE_ENABLED):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.persist_ttl_seconds = persist_ttl_seconds
+        self.enabled = enabled
+        self.path = path
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._pending = {}  # key -> Future of the request in flight
+        self._lock = Lock()
+        self._db = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "joined": 0, "stored": 0, "evicted": 0, "expired": 0}
+        if enabled and path:
+            self._open_db(path)
+
+    def _open_db(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS tier2_cache (key TEXT PRIMARY KEY, result TEXT NOT NULL, stored_at REAL NOT NULL)")
+        self._db.commit()
+        print(f"🗄️ Tier 2 cache persisted to {path}")
+
+    def persist_to(self, path):
+        """Start persisting to a SQLite file if no path was configured"""
+        if self.enabled and self._db is None:
+            with self._lock:
+                self.path = path
+                self._open_db(path)
+
+    def get(self, key):
+        """Copy of a fresh cached result, or None (counted as a miss)"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if self.ttl_seconds <= 0 or now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return dict(result)
+                del self._entries[key]
+                self.stats["expired"] += 1
+
+            result = self._load(key, now)
+            if result is not None:
+                self._remember(key, result, now)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return dict(result)
+            self.stats["misses"] += 1
+            return None
+
+    def begin(self, key):
+        """
+        Claim a key before calling the LLM. Returns None if the caller now owns the request
+        (and must call complete), or the Future of an identical request already in flight.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.stats["joined"] += 1
+                return pending
+            self._pending[key] = Future()
+            return None
+
+    def complete(self, key, result, cacheable=True):
+        """Store the owner's result (unless it is a fallback) and hand a copy to every joined request"""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if cacheable:
+                self._remember(key, dict(result), now)
+                self.stats["stored"] += 1
+                self._persist(key, result, now)
+        if pending is not None:
+            pending.set_result(dict(result))
+
+    def _remember(self, key, result, now):
+        self._entries[key] = (now, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def _load(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT result, stored_at FROM tier2_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self.persist_ttl_seconds > 0 and now - row[1] > self.persist_ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def _persist(self, key, result, now):
+        if self._db is None:
+            return
+        try:
+            self._db.execute("INSERT OR REPLACE INTO tier2_cache (key, result, stored_at) VALUES (?, ?, ?)",
+                             (key, json.dumps(result), now))
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Tier 2 cache write failed: {e}")
+
+    def clear(self, persisted=False):
+        with self._lock:
+            self._entries.clear()
+            if persisted and self._db is not None:
+                self._db.execute("DELETE FROM tier2_cache")
+                self._db.commit()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            persisted = self._db.execute("SELECT COUNT(*) FROM tier2_cache").fetchone()[0] if self._db is not None else None
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "in_flight": len(self._pending),
+                "persisted_entries": persisted,
+                "enabled": self.enabled
+            }
+
+
+# Global cache shared by every Tier 2 stage
+tier2_cache = Tier2Cache()
@@ -0,0 +1,137 @@
+import os
+import queue
+import time
+from threading import Thread, Lock
+
+import cv2
+
+# Recording stage configuration
+RECORDING_QUEUE_SIZE = int(os.getenv("RECORDING_QUEUE_SIZE", "60"))  # Frames waiting for the encoder
+RECORDING_SEGMENT_SECONDS = float(os.getenv("RECORDING_SEGMENT_SECONDS", "0"))  # 0 = one file per session
+RECORDING_SCALE = float(os.getenv("RECORDING_SCALE", "1.0"))  # e.g. 0.5 records at half resolution
+RECORDING_FPS = float(os.getenv("RECORDING_FPS", "0"))  # 0 = source frame rate
+
+
+class VideoRecorder:
+    """
+    MP4 recording as its own pipeline stage: frames are queued (bounded) and encoded on a
+    dedicated thread, so mp4v encoding never runs on the analysis path. Supports splitting
+    into fixed-length segments and a lower-resolution / lower-fps recording profile.
+    """
+
+    def __init__(self, base_path, fps, frame_size, segment_seconds=RECORDING_SEGMENT_SECONDS,
+                 scale=RECORDING_SCALE, record_fps=RECORDING_FPS, max_pending=RECORDING_QUEUE_SIZE):
+        self.base_path = base_path  # e.g. recorded_videos/session_20240101_120000 (no extension)
+        self.source_fps = fps if fps > 0 else 30
+        self.fps = min(record_fps, self.source_fps) if record_fps > 0 else self.source_fps
+        width, height = frame_size
+        scale = min(max(scale, 0.1), 1.0)
+        # Even dimensions keep every codec happy
+        self.frame_size = (max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2))
+        self.frames_per_segment = int(segment_seconds * self.fps) if segment_seconds > 0 else 0
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._writer = None
+        self._segment_index = 0
+        self._segment_frames = 0
+        self._source_frames = 0
+        self._thread = None
+        self._lock = Lock()
+        self.current_file = None
+        self.files = []
+        self.stats = {"queued": 0, "encoded": 0, "decimated": 0, "dropped": 0, "encode_ms": 0.0}
+
+    def start(self):
+        self._open_segment()
+        self._thread = Thread(target=self._encode_loop, name="VideoRecorder", daemon=True)
+        self._thread.start()
+        segmenting = f", {self.frames_per_segment / self.fps:.0f}s segments" if self.frames_per_segment else ""
+        print(f"💾 Recording {self.frame_size[0]}x{self.frame_size[1]} @ {self.fps:.0f} FPS to {self.current_file}{segmenting}")
+        return self
+
+    def _segment_path(self):
+        if not self.frames_per_segment:
+            return f"{self.base_path}.mp4"
+        return f"{self.base_path}_part{self._segment_index:03d}.mp4"
+
+    def _open_segment(self):
+        if self._writer is not None:
+            self._writer.release()
+        path = self._segment_path()
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, self.frame_size)
+        self._segment_frames = 0
+        self._segment_index += 1
+        self.current_file = path
+        self.files.append(path)
+
+    def write(self, frame, timeout=0.1):
+        """
+        Queue a source frame for recording; returns False if it was not recorded. Frames are
+        decimated here to the recording fps, and dropped only if the encoder is a full queue behind.
+        """
+        self._source_frames += 1
+        if self.fps < self.source_fps:
+            # Keep a frame whenever the recording clock advances past the next output frame
+            if int(self._source_frames * self.fps / self.source_fps) == int((self._source_frames - 1) * self.fps / self.source_fps):
+                with self._lock:
+                    self.stats["decimated"] += 1
+                return False
+        try:
+            self._queue.put(frame, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+            return False
+        with self._lock:
+            self.stats["queued"] += 1
+        return True
+
+    def _encode_loop(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            start = time.perf_counter()
+            if (frame.shape[1], frame.shape[0]) != self.frame_size:
+                frame = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
+            if self.frames_per_segment and self._segment_frames >= self.frames_per_segment:
+                self._open_segment()
+            self._writer.write(frame)
+            self._segment_frames += 1
+            with self._lock:
+                self.stats["encoded"] += 1
+                self.stats["encode_ms"] += (time.perf_counter() - start) * 1000
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def isOpened(self):
+        return self._writer is not None and self._writer.isOpened()
+
+    def release(self, timeout=5.0):
+        """Encode what is already queued, then close the current file"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            print("⚠️ Recorder queue still full on release; remaining frames are discarded")
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self):
+        with self._lock:
+            encoded = self.stats["encoded"]
+            return {
+                **{key: value for key, value in self.stats.items() if key != "encode_ms"},
+                "pending": self._queue.qsize(),
+                "avg_encode_ms": round(self.stats["encode_ms"] / encoded, 2) if encoded else 0.0,
+                "fps": self.fps,
+                "frame_size": list(self.frame_size),
+                "files": list(self.files)
+            }